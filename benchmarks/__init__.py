@@ -0,0 +1,8 @@
+"""Benchmarks of taxonomy4good operations on synthetic taxonomies.
+
+Run them with ``python -m benchmarks`` from the root of the repository.
+"""
+
+from .generator import generate_frame, generate_taxonomy, write_taxonomy
+from .scenarios import SCENARIOS, Scenario, measure, run_scenarios
+from .results import save_results, load_results, compare_results
@@ -0,0 +1,74 @@
+"""Run the taxonomy4good benchmarks and save the results as JSON
+
+    python -m benchmarks --sizes 1000 10000 100000 --output results.json
+    python -m benchmarks compare baseline.json results.json
+    python -m benchmarks loadtest --requests 5000 --concurrency 32
+"""
+
+from .scenarios import run_scenarios, SCENARIOS
+from .results import save_results, load_results, compare_results
+from .loadtest import run_loadtest
+import argparse
+import sys
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Benchmark taxonomy4good on synthetic taxonomies")
+    subparsers = parser.add_subparsers(dest="command")
+
+    run = subparsers.add_parser("run", help="run the scenarios (default)")
+    run.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000])
+    run.add_argument("--depth", type=int, default=4)
+    run.add_argument("--fanout", type=float, default=10)
+    run.add_argument("--skew", type=float, default=0.0)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--scenarios", nargs="+", choices=[s.name for s in SCENARIOS])
+    run.add_argument("--no-memory", action="store_true", help="do not measure peak memory")
+    run.add_argument("--no-limits", action="store_true",
+                     help="run slow scenarios on large taxonomies as well")
+    run.add_argument("--output", help="path of the JSON results file")
+
+    compare = subparsers.add_parser("compare", help="compare two results files")
+    compare.add_argument("baseline")
+    compare.add_argument("candidate")
+    compare.add_argument("--threshold", type=float, default=1.2,
+                         help="ratio above which a scenario is reported as a regression")
+
+    loadtest = subparsers.add_parser("loadtest", help="load test the query service on localhost")
+    loadtest.add_argument("--taxonomy", default="eu_taxonomy", help="builtin taxonomy name or taxonomy file")
+    loadtest.add_argument("--requests", type=int, default=5000)
+    loadtest.add_argument("--concurrency", type=int, default=32)
+    loadtest.add_argument("--cache-sizes", type=int, nargs="+", default=[0, 1024])
+    loadtest.add_argument("--seed", type=int, default=0)
+    loadtest.add_argument("--output", help="path of the JSON results file")
+
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in ("run", "compare", "loadtest", "-h", "--help"):
+        argv = ["run"] + list(argv)
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        regressions = compare_results(load_results(args.baseline), load_results(args.candidate),
+                                      threshold=args.threshold, log=print)
+        return 1 if regressions else 0
+
+    if args.command == "loadtest":
+        results = run_loadtest(taxonomy=args.taxonomy, n_requests=args.requests, concurrency=args.concurrency,
+                               cache_sizes=args.cache_sizes, seed=args.seed, log=print)
+        if args.output:
+            save_results(results, args.output)
+        return 0
+
+    results = run_scenarios(sizes=args.sizes, depth=args.depth, fanout=args.fanout,
+                            skew=args.skew, seed=args.seed, repeat=args.repeat,
+                            memory=not args.no_memory, names=args.scenarios,
+                            no_limits=args.no_limits, log=print)
+    if args.output:
+        save_results(results, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
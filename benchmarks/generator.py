@@ -0,0 +1,133 @@
+"""Generator of synthetic taxonomies used by the benchmarks"""
+
+from taxonomy4good.sustainabilityTaxonomy import from_file
+import pandas as pd
+import numpy as np
+import tempfile
+import os
+
+WORDS = ["climate", "energy", "water", "carbon", "waste", "biodiversity", "governance",
+         "safety", "health", "emissions", "pollution", "community", "diversity", "labour",
+         "supply", "chain", "renewable", "forestry", "ocean", "transport", "housing",
+         "education", "poverty", "equality", "innovation", "finance", "risk", "impact"]
+
+
+def level_sizes(n_nodes, depth, fanout):
+    """Split n_nodes between depth levels, following the growth of a tree having
+    the given fan-out (every level has at least as many items as the previous one)
+
+    :param n_nodes: total number of items (root excluded)
+    :type n_nodes: int
+    :param depth: number of levels under the root
+    :type depth: int
+    :param fanout: average number of children per item
+    :type fanout: float
+    :returns: number of items in each level
+    :rtype: list of int
+    """
+
+    growth = np.power(float(fanout), np.arange(1, depth + 1))
+    sizes = np.maximum(np.floor(growth / growth.sum() * n_nodes).astype(np.int64), 1)
+    sizes = np.maximum.accumulate(sizes)
+
+    # give the remaining items to the deepest level
+    sizes[-1] += n_nodes - sizes.sum()
+    if sizes[-1] < 1:
+        raise ValueError(f"{n_nodes} items is not enough for {depth} levels")
+
+    return sizes.tolist()
+
+
+def generate_frame(n_nodes=1000, depth=4, fanout=10, skew=0.0, seed=0):
+    """Generate a synthetic taxonomy in the tabular format read by from_file
+
+    Items of a level pick their parent among the items of the previous level. With
+    ``skew=0`` parents are picked uniformly, higher values follow a Zipf-like
+    distribution so that a few items get most of the children.
+
+    :param n_nodes: number of items (root excluded)
+    :type n_nodes: int
+    :param depth: number of levels under the root
+    :type depth: int
+    :param fanout: average number of children per item
+    :type fanout: float
+    :param skew: skew of the number of children per item (0: uniform)
+    :type skew: float
+    :param seed: seed of the random generator
+    :type seed: int
+    :returns: taxonomy items (id, name, parent, children, weight, level, grouping, score)
+    :rtype: pd.DataFrame
+    """
+
+    rng = np.random.default_rng(seed)
+    sizes = level_sizes(n_nodes, depth, fanout)
+
+    parents = []
+    levels = []
+    first_id = 1
+    previous_ids = None
+    for level, size in enumerate(sizes, start=1):
+        if previous_ids is None:
+            parents.append(np.full(size, -1, dtype=np.int64))
+        else:
+            # Zipf-like preference for the first items of the previous level
+            p = np.power(np.arange(1, len(previous_ids) + 1, dtype=np.float64), -skew)
+            chosen = rng.choice(previous_ids, size=size, p=p / p.sum())
+            parents.append(np.sort(chosen))
+        levels.append(np.full(size, level, dtype=np.int64))
+        previous_ids = np.arange(first_id, first_id + size)
+        first_id += size
+
+    parents = np.concatenate(parents)
+    levels = np.concatenate(levels)
+    ids = np.arange(1, len(parents) + 1)
+
+    # children are listed in id order, as in the builtin taxonomies
+    children = pd.Series(ids[parents > 0]).groupby(parents[parents > 0]).agg(
+        lambda c: "[" + ",".join(map(str, c)) + "]")
+
+    words = rng.integers(0, len(WORDS), size=(len(ids), 2))
+    names = [f"{WORDS[a]} {WORDS[b]} {i}" for i, (a, b) in zip(ids, words)]
+
+    has_children = np.isin(ids, children.index)
+    scores = np.where(has_children, 0, rng.integers(0, 100, size=len(ids)))
+
+    return pd.DataFrame({"id": ids,
+                         "name": names,
+                         "parent": np.where(parents > 0, parents, np.nan),
+                         "children": children.reindex(ids).to_numpy(),
+                         "weight": np.round(rng.uniform(0.1, 1, size=len(ids)), 3),
+                         "level": levels,
+                         "grouping": np.nan,
+                         "score": scores})
+
+
+def write_taxonomy(frame, filepath, filetype="json"):
+    """Save a generated taxonomy to a file that from_file can read
+
+    :param frame: generated taxonomy
+    :type frame: pd.DataFrame
+    :param filepath: full path of the resulting file
+    :type filepath: str
+    :param filetype: the type of the file (excel or json)
+    :type filetype: str
+    """
+
+    if filetype == "excel":
+        frame.to_excel(filepath, index=False)
+    else:
+        frame.to_json(filepath, orient="records")
+
+
+def generate_taxonomy(n_nodes=1000, depth=4, fanout=10, skew=0.0, seed=0):
+    """Generate a synthetic SustainabilityTaxonomy (see :func:`generate_frame`)
+
+    :returns: the generated taxonomy
+    :rtype: SustainabilityTaxonomy
+    """
+
+    frame = generate_frame(n_nodes, depth, fanout, skew, seed)
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "synthetic.json")
+        write_taxonomy(frame, filepath)
+        return from_file(filepath, version_name=f"Synthetic {n_nodes}", filetype="json")
@@ -0,0 +1,130 @@
+"""Load test of the taxonomy4good query service, entirely on localhost
+
+    python -m benchmarks loadtest --requests 5000 --concurrency 32
+"""
+
+from taxonomy4good.server import TaxonomyServer
+from taxonomy4good.cli import load_taxonomy
+import numpy as np
+import asyncio
+import json
+import time
+
+
+def request_mix(taxonomy, n_requests, seed=0, distinct=200):
+    """Batched requests on a taxonomy, drawn from a pool of distinct requests so
+    that the cache and request coalescing see repeated requests, as dashboards do
+
+    :returns: (path suffix, JSON body) of every request
+    :rtype: list of (str, bytes)
+    """
+
+    rng = np.random.default_rng(seed)
+    items = list(taxonomy.get_items())
+    ids = [item.id for item in items]
+    words = sorted({word for item in items for word in str(item.name).lower().split() if len(word) > 3})
+    leaves = [item.id for item in items if item.children is None]
+
+    pool = []
+    for i in range(distinct):
+        kind = i % 4
+        if kind == 0:
+            pool.append(("lookup", {"ids": rng.choice(ids, size=20).tolist()}))
+        elif kind == 1:
+            pool.append(("search", {"terms": rng.choice(words, size=3).tolist(),
+                                    "mode": "fuzzy" if i % 8 == 1 else "name", "k": 5}))
+        elif kind == 2:
+            pool.append(("levels", {"levels": [int(rng.integers(1, 3))]}))
+        else:
+            pool.append(("score", {"scores": [{str(leaf): float(rng.random()) for leaf in
+                                               rng.choice(leaves, size=min(10, len(leaves)), replace=False)}
+                                              for _ in range(8)]}))
+
+    # skewed popularity: a few requests are much more frequent than the others
+    picks = np.minimum(rng.zipf(1.3, size=n_requests) - 1, distinct - 1)
+    return [(pool[pick][0], json.dumps(pool[pick][1]).encode("utf-8")) for pick in picks]
+
+
+async def _client(host, port, name, requests, latencies):
+    """send requests one after the other on a keep-alive connection"""
+
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for endpoint, body in requests:
+            started = time.perf_counter()
+            writer.write(f"POST /{name}/{endpoint} HTTP/1.1\r\nHost: {host}\r\n"
+                         f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1")
+                         + body)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                header, _, value = line.decode("latin-1").partition(":")
+                if header.strip().lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            if status != 200:
+                raise RuntimeError(f"{endpoint} request failed with status {status}")
+            latencies.append(time.perf_counter() - started)
+    finally:
+        writer.close()
+
+
+async def _load_test(server, name, requests, concurrency, host):
+    listener = await server.start(host, 0)
+    port = listener.sockets[0].getsockname()[1]
+    latencies = []
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*[_client(host, port, name, requests[i::concurrency], latencies)
+                               for i in range(concurrency)])
+        elapsed = time.perf_counter() - started
+    finally:
+        listener.close()
+        await listener.wait_closed()
+    return elapsed, np.array(latencies)
+
+
+def run_loadtest(taxonomy="eu_taxonomy", n_requests=5000, concurrency=32, cache_sizes=(0, 1024),
+                 seed=0, host="127.0.0.1", log=None):
+    """Start the query service on a free local port and send it batched requests
+    from concurrent keep-alive clients, once per cache size
+
+    :param taxonomy: builtin taxonomy name, taxonomy file or snapshot to serve
+    :type taxonomy: str
+    :param n_requests: number of requests
+    :type n_requests: int
+    :param concurrency: number of concurrent clients
+    :type concurrency: int
+    :param cache_sizes: cache sizes of the service (0: no response cache)
+    :type cache_sizes: tuple of int
+    :param seed: seed of the request mix
+    :type seed: int
+    :param host: local address of the service
+    :type host: str
+    :param log: function called with a line of text per run (e.g. print)
+    :type log: callable
+    :returns: one record per cache size
+    :rtype: list of dict
+    """
+
+    loaded = load_taxonomy(taxonomy)
+    requests = request_mix(loaded, n_requests, seed)
+
+    results = []
+    for cache_size in cache_sizes:
+        server = TaxonomyServer({"taxonomy": loaded}, builtin=False, cache_size=cache_size)
+        elapsed, latencies = asyncio.run(_load_test(server, "taxonomy", requests, concurrency, host))
+        record = {"taxonomy": taxonomy, "requests": n_requests, "concurrency": concurrency,
+                  "cache_size": cache_size, "seconds": elapsed, "throughput": n_requests / elapsed,
+                  "p50_ms": float(np.percentile(latencies, 50) * 1000),
+                  "p99_ms": float(np.percentile(latencies, 99) * 1000),
+                  "coalesced": server.coalesced}
+        results.append(record)
+        if log is not None:
+            log(f"cache={cache_size:<6} {record['throughput']:9.0f} req/s   p50 {record['p50_ms']:7.2f} ms"
+                f"   p99 {record['p99_ms']:7.2f} ms   coalesced {record['coalesced']}")
+    return results
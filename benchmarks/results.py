@@ -0,0 +1,90 @@
+"""Machine-readable benchmark results"""
+
+import datetime
+import platform
+import json
+import os
+
+RESULTS_FORMAT = 1
+
+
+def package_version():
+    """Version of the benchmarked taxonomy4good (installed metadata, then setup.py)"""
+
+    try:
+        from importlib.metadata import version
+        return version("taxonomy4good")
+    except Exception:
+        setup_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "setup.py")
+        if os.path.exists(setup_path):
+            with open(setup_path) as f:
+                for line in f:
+                    line = line.strip()
+                    if line.startswith("version="):
+                        return line.split("=", 1)[1].strip(" ,\"'")
+        return "unknown"
+
+
+def save_results(results, filepath):
+    """Save benchmark records to a JSON file along with the environment they ran in
+
+    :param results: records returned by run_scenarios
+    :type results: list of dict
+    :param filepath: full path of the resulting file
+    :type filepath: str
+    """
+
+    document = {"format": RESULTS_FORMAT,
+                "taxonomy4good_version": package_version(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "results": results}
+
+    with open(filepath, "w") as f:
+        json.dump(document, f, indent=4)
+
+
+def load_results(filepath):
+    """Load a JSON file written by save_results"""
+
+    with open(filepath) as f:
+        return json.load(f)
+
+
+def compare_results(baseline, candidate, threshold=1.2, log=None):
+    """Compare the timings of two benchmark runs
+
+    :param baseline: results document of the reference run
+    :type baseline: dict
+    :param candidate: results document of the new run
+    :type candidate: dict
+    :param threshold: time ratio (candidate / baseline) above which a scenario is a regression
+    :type threshold: float
+    :param log: function called with one line per compared scenario (e.g. print)
+    :type log: callable
+    :returns: the regressions (scenario, n_nodes, baseline, candidate, ratio)
+    :rtype: list of dict
+    """
+
+    def key(record):
+        return record["scenario"], record["n_nodes"]
+
+    reference = {key(r): r for r in baseline["results"] if not r.get("skipped")}
+    regressions = []
+
+    for record in candidate["results"]:
+        if record.get("skipped") or key(record) not in reference:
+            continue
+        before = reference[key(record)]["seconds"]
+        after = record["seconds"]
+        ratio = after / before if before else float("inf")
+
+        if log is not None:
+            log(f"{record['scenario']:<24} n={record['n_nodes']:<9} {before:10.4f} s -> {after:10.4f} s"
+                f" (x{ratio:.2f})")
+        if ratio > threshold:
+            regressions.append({"scenario": record["scenario"], "n_nodes": record["n_nodes"],
+                                "baseline": before, "candidate": after, "ratio": ratio})
+
+    return regressions
@@ -0,0 +1,229 @@
+"""Timed and memory-measured benchmark scenarios"""
+
+from taxonomy4good.sustainabilityTaxonomy import from_file
+from .generator import generate_frame, write_taxonomy
+import numpy as np
+import contextlib
+import tracemalloc
+import tempfile
+import pickle
+import time
+import io
+import os
+
+
+class Scenario:
+    """A benchmarked operation.
+
+    :param name: name of the scenario
+    :type name: str
+    :param run: function called with the benchmark context (dict), its running
+                time (and peak memory) is what gets measured
+    :type run: callable
+    :param max_nodes: largest taxonomy the scenario is run on by default (None: no limit),
+                      used to skip operations that are too slow on big trees
+    :type max_nodes: int
+    """
+
+    def __init__(self, name, run, max_nodes=None):
+        self.name = name
+        self.run = run
+        self.max_nodes = max_nodes
+
+
+def _from_json(context):
+    return from_file(context["json_path"], filetype="json")
+
+
+def _from_excel(context):
+    return from_file(context["excel_path"], filetype="excel")
+
+
+def _from_excel_branch(context):
+    # one top-level branch of the file
+    return from_file(context["excel_path"], filetype="excel", subtree_root=context["taxonomy"].root.children[0].id)
+
+
+def _search_by_id(context):
+    return context["taxonomy"].search_by_id(context["sample_ids"])
+
+
+def _compute_scores(context):
+    return context["taxonomy"].compute_scores()
+
+
+def _get_level_scores(context):
+    return context["taxonomy"].get_level_scores(1)
+
+
+def _get_items_each_level(context):
+    return context["taxonomy"].get_items_each_level()
+
+
+def _search_items_by_name(context):
+    return context["taxonomy"].search_items_by_name(["climate", "water"])
+
+
+def _search_similar_names(context):
+    return context["taxonomy"].search_similar_names(["climate", "water"])
+
+
+def _print_hierarchy(context):
+    with contextlib.redirect_stdout(io.StringIO()):
+        context["taxonomy"].print_hierarchy()
+
+
+def _to_dataframe(context):
+    return context["taxonomy"].to_dataframe()
+
+
+def _items_to_dict(context):
+    return context["taxonomy"].items_to_dict()
+
+
+def _taxonomy_to_dict(context):
+    return context["taxonomy"].taxonomy_to_dict()
+
+
+def _to_csv(context):
+    context["taxonomy"].to_csv(os.path.join(context["directory"], "export"))
+
+
+def _to_excel(context):
+    context["taxonomy"].to_excel(os.path.join(context["directory"], "export"))
+
+
+def _items_to_json(context):
+    context["taxonomy"].items_to_json(os.path.join(context["directory"], "export_items"))
+
+
+def _taxonomy_to_json(context):
+    context["taxonomy"].taxonomy_to_json(os.path.join(context["directory"], "export_taxonomy"))
+
+
+def _top_k_refresh(context):
+    # leaderboard refresh: one score changed since the previous ranking
+    taxonomy = context["taxonomy"]
+    item = taxonomy.root.children[-1]
+    item.score = item.score + 1
+    return taxonomy.top_k(10, level=2)
+
+
+def _pickle_taxonomy(context):
+    # flattened by SustainabilityTaxonomy.__getstate__
+    return pickle.loads(pickle.dumps(context["taxonomy"], protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _pickle_linked_items(context):
+    # default pickling of the graph of items, for comparison
+    return pickle.loads(pickle.dumps(context["taxonomy"].root, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+SCENARIOS = [Scenario("from_file_json", _from_json),
+             Scenario("from_file_excel", _from_excel, max_nodes=100_000),
+             Scenario("from_file_excel_branch", _from_excel_branch, max_nodes=100_000),
+             Scenario("search_by_id", _search_by_id, max_nodes=100_000),
+             Scenario("compute_scores", _compute_scores),
+             Scenario("get_level_scores", _get_level_scores, max_nodes=100_000),
+             Scenario("get_items_each_level", _get_items_each_level, max_nodes=100_000),
+             Scenario("search_items_by_name", _search_items_by_name, max_nodes=100_000),
+             Scenario("search_similar_names", _search_similar_names, max_nodes=100_000),
+             Scenario("print_hierarchy", _print_hierarchy, max_nodes=10_000),
+             Scenario("to_dataframe", _to_dataframe, max_nodes=100_000),
+             Scenario("items_to_dict", _items_to_dict, max_nodes=100_000),
+             Scenario("taxonomy_to_dict", _taxonomy_to_dict),
+             Scenario("to_csv", _to_csv, max_nodes=100_000),
+             Scenario("to_excel", _to_excel, max_nodes=100_000),
+             Scenario("items_to_json", _items_to_json, max_nodes=100_000),
+             Scenario("taxonomy_to_json", _taxonomy_to_json),
+             Scenario("top_k_refresh", _top_k_refresh),
+             Scenario("pickle_taxonomy", _pickle_taxonomy),
+             Scenario("pickle_linked_items", _pickle_linked_items)]
+
+
+def measure(function, context, repeat=3, memory=True):
+    """Measure the running time (best of repeat) and the peak memory allocated by
+    a function. Memory is measured in a separate run, as tracing allocations
+    slows down the execution.
+
+    :returns: seconds and peak_memory_bytes (None if memory is False)
+    :rtype: dict
+    """
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(context)
+        timings.append(time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            function(context)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {"seconds": min(timings), "mean_seconds": float(np.mean(timings)),
+            "peak_memory_bytes": peak}
+
+
+def run_scenarios(sizes=(1000, 10_000), depth=4, fanout=10, skew=0.0, seed=0, repeat=3,
+                  memory=True, names=None, no_limits=False, log=None):
+    """Run the benchmark scenarios on synthetic taxonomies of the given sizes
+
+    :param sizes: number of items of the generated taxonomies
+    :type sizes: list of int
+    :param names: names of the scenarios to run (default: all of them)
+    :type names: list of str
+    :param no_limits: run every scenario, even on sizes above their max_nodes
+    :type no_limits: bool
+    :param log: function called with a message after every scenario (e.g. print)
+    :type log: callable
+    :returns: one record per (size, scenario)
+    :rtype: list of dict
+    """
+
+    scenarios = [s for s in SCENARIOS if names is None or s.name in names]
+    results = []
+
+    for n_nodes in sizes:
+        frame = generate_frame(n_nodes, depth, fanout, skew, seed)
+        with tempfile.TemporaryDirectory() as directory:
+            context = {"directory": directory,
+                       "json_path": os.path.join(directory, "synthetic.json"),
+                       "excel_path": os.path.join(directory, "synthetic.xlsx")}
+            write_taxonomy(frame, context["json_path"])
+            if any(s.name == "from_file_excel" and (no_limits or s.max_nodes is None
+                                                    or n_nodes <= s.max_nodes) for s in scenarios):
+                write_taxonomy(frame, context["excel_path"], filetype="excel")
+
+            context["taxonomy"] = _from_json(context)
+            rng = np.random.default_rng(seed)
+            context["sample_ids"] = rng.choice(frame["id"].to_numpy(), size=min(100, n_nodes),
+                                               replace=False).tolist()
+
+            for scenario in scenarios:
+                record = {"scenario": scenario.name, "n_nodes": n_nodes, "depth": depth,
+                          "fanout": fanout, "skew": skew, "repeat": repeat}
+                if not no_limits and scenario.max_nodes is not None and n_nodes > scenario.max_nodes:
+                    record.update({"skipped": True, "seconds": None, "mean_seconds": None,
+                                   "peak_memory_bytes": None})
+                else:
+                    record.update({"skipped": False})
+                    record.update(measure(scenario.run, context, repeat, memory))
+                results.append(record)
+
+                if log is not None:
+                    log(_format_record(record))
+
+    return results
+
+
+def _format_record(record):
+    if record["skipped"]:
+        return f"{record['scenario']:<24} n={record['n_nodes']:<9} skipped"
+    memory = record["peak_memory_bytes"]
+    memory = f"{memory / 2 ** 20:10.2f} MiB" if memory is not None else ""
+    return f"{record['scenario']:<24} n={record['n_nodes']:<9} {record['seconds']:10.4f} s {memory}"
@@ -41,5 +41,7 @@ setup(
     include_package_data=True,
     package_data={'taxonomy4good': [
         'taxonomies/*.xlsx'], 'images': ['*.svg', '*.png']},
-    install_requires=["numpy", "pandas", "xlrd==1.2.0", "requests", "openpyxl"]
+    install_requires=["numpy", "pandas", "xlrd==1.2.0", "requests", "openpyxl"],
+    extras_require={"parquet": ["pyarrow"]},
+    entry_points={"console_scripts": ["taxonomy4good=taxonomy4good.cli:main"]}
 )
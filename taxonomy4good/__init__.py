@@ -1,4 +1,10 @@
 from .sustainabilityItem import SustainabilityItem
-from .sustainabilityTaxonomy import SustainabilityTaxonomy, from_file
-from .errors import EmptyTaxonomyError, IDNotFoundError, FileTypeNotSupportedError
+from .sustainabilityTaxonomy import SustainabilityTaxonomy, from_file, from_files, from_dataframe
+from .taxonomySnapshot import TaxonomySnapshot, open_snapshot
+from .taxonomyDiff import TaxonomyDiff
+from .crosswalk import Crosswalk, build_crosswalk, read_crosswalk
+from .taxonomyForest import TaxonomyForest, builtin_forest
+from .scenarioEngine import ScenarioEngine, ScenarioResult
+from .errors import EmptyTaxonomyError, IDNotFoundError, FileTypeNotSupportedError, InvalidQueryError, \
+    FrozenTaxonomyError
 
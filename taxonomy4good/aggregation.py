@@ -0,0 +1,149 @@
+import numpy as np
+
+
+class Aggregation:
+    """Reduction of the scores of the children of an item into the score of the item.
+
+    Scores are rolled up level by level from the deepest one, every level being a
+    single segment reduction over the children of its items, stored contiguously
+    by parent (see :meth:`TaxonomyLayout.child_segments`).
+
+    :param name: name under which the aggregation is registered
+    :type name: str
+    :param reducer: binary numpy ufunc reduced over the children of every item with
+                    ``ufunc.reduceat`` (e.g. numpy.add, numpy.maximum), or function
+                    ``reducer(values, weights, starts)`` returning one value per segment
+                    of values starting at starts
+    :type reducer: numpy.ufunc | callable
+    :param weighted: multiply the scores by the weights of the children before
+                     reducing them (True), only those of the leaves ("leaves", the
+                     rule of the default sum) or none of them (False)
+    :type weighted: bool | str
+    """
+
+    def __init__(self, name, reducer, weighted=False):
+        if isinstance(reducer, np.ufunc):
+            if reducer.nin != 2 or reducer.nout != 1:
+                raise ValueError(f"{reducer.__name__} is not a binary ufunc")
+        elif not callable(reducer):
+            raise ValueError(f"{reducer} is neither a numpy ufunc nor a function")
+        if weighted not in (True, False, "leaves"):
+            raise ValueError(f"{weighted} is not a weighting rule, use True, False or 'leaves'")
+
+        self.name = name
+        self.reducer = reducer
+        self.weighted = weighted
+
+    def __repr__(self):
+        return f"Aggregation({self.name!r})"
+
+    def reduce(self, values, weights, is_leaf, starts):
+        """Reduce segments of children scores
+
+        :param values: scores of the children (raw for leaves, rolled up for the others)
+        :type values: numpy.array
+        :param weights: weights of the children
+        :type weights: numpy.array
+        :param is_leaf: mask of the children having no children
+        :type is_leaf: numpy.array (bool)
+        :param starts: start of the children of every item in values
+        :type starts: numpy.array (int)
+        :returns: one aggregated score per segment
+        :rtype: numpy.array (float)
+        """
+
+        if self.weighted == "leaves":
+            values = np.where(is_leaf, values * weights, values)
+        elif self.weighted:
+            values = values * weights
+
+        if isinstance(self.reducer, np.ufunc):
+            return self.reducer.reduceat(values, starts)
+        return np.asarray(self.reducer(values, weights, starts), dtype=np.float64)
+
+
+def _segment_counts(values, starts):
+    return np.diff(np.append(starts, len(values)))
+
+
+def _mean(values, weights, starts):
+    return np.add.reduceat(values, starts) / _segment_counts(values, starts)
+
+
+def _weighted_mean(values, weights, starts):
+    # weights are normalised per parent, items whose children weigh nothing score 0
+    totals = np.add.reduceat(weights, starts)
+    weighted = np.add.reduceat(values * weights, starts)
+    return np.divide(weighted, totals, out=np.zeros(len(starts)), where=totals != 0)
+
+
+BUILTIN_AGGREGATIONS = ["sum", "weighted_sum", "weighted_mean", "mean", "max", "min"]
+
+_AGGREGATIONS = {
+    "sum": Aggregation("sum", np.add, weighted="leaves"),
+    "weighted_sum": Aggregation("weighted_sum", np.add, weighted=True),
+    "weighted_mean": Aggregation("weighted_mean", _weighted_mean),
+    "mean": Aggregation("mean", _mean),
+    "max": Aggregation("max", np.maximum),
+    "min": Aggregation("min", np.minimum),
+}
+
+
+def register_aggregation(name, reducer, weighted=False):
+    """Register a custom aggregation, usable by name in the scoring methods
+    (compute_scores, get_level_scores, summary), e.g.
+    ``register_aggregation("product", numpy.multiply)``
+
+    :param name: name of the aggregation
+    :type name: str
+    :param reducer: binary numpy ufunc or segment reduction function, see :class:`Aggregation`
+    :type reducer: numpy.ufunc | callable
+    :param weighted: multiply the scores by the weights before reducing them (True,
+                     False or "leaves")
+    :type weighted: bool | str
+    :returns: the registered aggregation
+    :rtype: Aggregation
+    """
+
+    if name in BUILTIN_AGGREGATIONS:
+        raise ValueError(f"{name} is a builtin aggregation and cannot be replaced")
+
+    aggregation = Aggregation(name, reducer, weighted)
+    _AGGREGATIONS[name] = aggregation
+    return aggregation
+
+
+def unregister_aggregation(name):
+    """Remove a custom aggregation
+
+    :param name: name of the aggregation
+    :type name: str
+    """
+
+    if name in BUILTIN_AGGREGATIONS:
+        raise ValueError(f"{name} is a builtin aggregation and cannot be removed")
+    _AGGREGATIONS.pop(name, None)
+
+
+def get_aggregation(aggregation):
+    """Get a registered aggregation
+
+    :param aggregation: name of the aggregation (or an Aggregation, returned as is)
+    :type aggregation: str | Aggregation
+    :rtype: Aggregation
+    """
+
+    if isinstance(aggregation, Aggregation):
+        return aggregation
+    if aggregation not in _AGGREGATIONS:
+        raise ValueError(f"{aggregation} is not a registered aggregation, use one of {list(_AGGREGATIONS)}")
+    return _AGGREGATIONS[aggregation]
+
+
+def aggregations():
+    """Get the names of the registered aggregations
+
+    :rtype: list of str
+    """
+
+    return list(_AGGREGATIONS)
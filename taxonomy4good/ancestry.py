@@ -0,0 +1,136 @@
+import numpy as np
+
+
+class AncestryIndex:
+    """Index answering ancestor, depth and lowest common ancestor queries on a
+    :class:`TaxonomyLayout`.
+
+    Items are numbered in DFS pre-order: the entry time of an item is its position
+    and its exit time is the end of its subtree, so ``a`` is an ancestor of ``b``
+    when ``entry[a] < entry[b] < exit[a]``. Lowest common ancestors are answered
+    with a sparse table of range minimum queries over the depths in DFS order
+    (the pre-order variant of the Euler tour technique, using n entries instead
+    of 2n - 1): for ``entry[a] < entry[b]``, the shallowest item in
+    ``(entry[a], entry[b]]`` is a child of the lowest common ancestor.
+
+    All the queries are vectorized over arrays of ids.
+
+    :param layout: flat view of the taxonomy
+    :type layout: TaxonomyLayout
+    """
+
+    def __init__(self, layout):
+        self.layout = layout
+        self._table = None
+
+    def _sparse_table(self):
+        """table[k, i]: position of the shallowest item in [i, i + 2^k) (built on first use)"""
+
+        table = self._table
+        if table is None:
+            depths = self.layout.depths
+            n = len(depths)
+            levels = max(1, int(n).bit_length())
+            dtype = np.int32 if n < 2 ** 31 else np.int64
+
+            table = np.empty((levels, n), dtype=dtype)
+            table[0] = np.arange(n, dtype=dtype)
+            for k in range(1, levels):
+                half = 1 << (k - 1)
+                previous = table[k - 1]
+                left, right = previous[:n - half], previous[half:]
+                table[k, :n - half] = np.where(depths[left] <= depths[right], left, right)
+                # ranges going past the end are never queried, keep the row filled
+                table[k, n - half:] = previous[n - half:]
+            self._table = table
+
+        return table
+
+    def depth(self, ids):
+        """Get the depth of items (the root has depth 0)
+
+        :param ids: ids of the items
+        :type ids: int | list of int | numpy.array
+        :returns: depths of the items
+        :rtype: int | numpy.array
+        """
+
+        scalar, ids = _as_array(ids)
+        depths = self.layout.depths[self.layout.positions(ids)]
+        return int(depths[0]) if scalar else depths
+
+    def is_ancestor(self, ancestor_ids, descendant_ids):
+        """Check if items are (strict) ancestors of other items
+
+        :param ancestor_ids: ids of the candidate ancestors
+        :type ancestor_ids: int | list of int | numpy.array
+        :param descendant_ids: ids of the candidate descendants
+        :type descendant_ids: int | list of int | numpy.array
+        :returns: True where the first item sits above the second one
+        :rtype: bool | numpy.array (bool)
+        """
+
+        scalar, ancestor_ids = _as_array(ancestor_ids)
+        scalar_descendants, descendant_ids = _as_array(descendant_ids)
+        ancestors = self.layout.positions(ancestor_ids)
+        descendants = self.layout.positions(descendant_ids)
+
+        result = (ancestors < descendants) & (descendants < self.layout.ends[ancestors])
+        return bool(result[0]) if scalar and scalar_descendants else result
+
+    def lowest_common_ancestor(self, first_ids, second_ids):
+        """Get the lowest common ancestors of pairs of items (an item is its own
+        ancestor here, so the LCA of an item and one of its descendants is the item)
+
+        :param first_ids: ids of the first items of the pairs
+        :type first_ids: int | list of int | numpy.array
+        :param second_ids: ids of the second items of the pairs
+        :type second_ids: int | list of int | numpy.array
+        :returns: ids of the lowest common ancestors
+        :rtype: int | numpy.array (int)
+        """
+
+        scalar, first_ids = _as_array(first_ids)
+        scalar_second, second_ids = _as_array(second_ids)
+        first = self.layout.positions(first_ids)
+        second = self.layout.positions(second_ids)
+
+        low = np.minimum(first, second)
+        high = np.maximum(first, second)
+        same = low == high
+
+        # range minimum query over (low, high]
+        left = np.where(same, low, low + 1)
+        k = np.floor(np.log2(np.maximum(high - left + 1, 1))).astype(np.int64)
+        table = self._sparse_table()
+        a = table[k, left]
+        b = table[k, high - (1 << k) + 1]
+        shallowest = np.where(self.layout.depths[a] <= self.layout.depths[b], a, b)
+
+        lca = np.where(same, low, self.layout.parents[shallowest])
+        ids = self.layout.ids[lca]
+        return int(ids[0]) if scalar and scalar_second else ids
+
+    def path_to_root(self, id):
+        """Get the ids of the items from an item up to the root (both included)
+
+        :param id: id of the item
+        :type id: int
+        :returns: ids of the item, its parent, ..., the root
+        :rtype: list of int
+        """
+
+        position = self.layout.position(id)
+        path = []
+        while position >= 0:
+            path.append(int(self.layout.ids[position]))
+            position = self.layout.parents[position]
+        return path
+
+
+def _as_array(ids):
+    """(True if a single id was given, ids as an int64 array)"""
+
+    if np.ndim(ids) == 0:
+        return True, np.array([ids], dtype=np.int64)
+    return False, np.asarray(ids, dtype=np.int64)
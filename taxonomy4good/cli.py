@@ -0,0 +1,217 @@
+"""Command-line interface of taxonomy4good
+
+    taxonomy4good convert taxonomy.xlsx taxonomy.json --meta
+    taxonomy4good summary eu_taxonomy
+    taxonomy4good score eu_taxonomy companies.csv scores.csv --chunksize 10000
+    taxonomy4good serve clients.xlsx --port 8765
+"""
+
+from .sustainabilityTaxonomy import from_file, from_dataframe, BUILTIN_TAXONOMIES
+from .taxonomySnapshot import open_snapshot, SNAPSHOT_EXTENSION
+from .taxonomyLayout import build_layout
+from .validation import VALIDATION_MODES
+from .errors import FileTypeNotSupportedError, IDNotFoundError, EmptyTaxonomyError, TaxonomyValidationError
+import pandas as pd
+import numpy as np
+import argparse
+import sys
+import os
+
+# file extensions and the corresponding filetypes
+FILETYPES = {".xlsx": "excel", ".xls": "excel", ".json": "json", ".csv": "csv", ".parquet": "parquet"}
+
+
+def load_taxonomy(source, meta=False, validation="strict"):
+    """Load a builtin taxonomy, a taxonomy file (filetype given by its extension) or a snapshot
+
+    :param source: name of a builtin taxonomy or path of a file
+    :type source: str
+    :param meta: indicating if the file include meta-data
+    :type meta: bool
+    :param validation: strict, repair or off (see :func:`from_file`)
+    :type validation: str
+    :rtype: SustainabilityTaxonomy
+    """
+
+    if source in BUILTIN_TAXONOMIES:
+        return from_file(source, meta=meta, validation=validation)
+
+    extension = os.path.splitext(source)[1].lower()
+    if extension == f".{SNAPSHOT_EXTENSION}":
+        with open_snapshot(source) as snapshot:
+            return snapshot.to_taxonomy()
+    filetype = FILETYPES.get(extension)
+    if filetype == "csv":
+        return from_dataframe(pd.read_csv(source), meta=meta, validation=validation)
+    if filetype == "parquet":
+        return from_dataframe(pd.read_parquet(source), meta=meta, validation=validation)
+    if filetype is None:
+        raise FileTypeNotSupportedError(f"{extension} files are currently not supported")
+
+    return from_file(source, filetype=filetype, meta=meta, validation=validation)
+
+
+def taxonomy_frame(taxonomy):
+    """Get the items of a taxonomy in the tabular structure read by from_file: one row
+    per item except the root, ordered by id, children as a list literal and
+    meta_data keys as extra columns
+
+    :param taxonomy: taxonomy to convert
+    :type taxonomy: SustainabilityTaxonomy
+    :rtype: pd.DataFrame
+    """
+
+    items = sorted(build_layout(taxonomy.root).items[1:], key=lambda item: item.id)
+    rows = []
+    for item in items:
+        row = {"id": item.id, "name": item.name, "level": item.level, "grouping": item.grouping,
+               "parent": item.parent.id if item.parent is not taxonomy.root else None,
+               "score": item.score, "weight": item.weight,
+               "children": str([child.id for child in item.children]) if item.children else None}
+        for key, value in (item.meta_data or {}).items():
+            row.setdefault(key, value)
+        rows.append(row)
+
+    return pd.DataFrame(rows)
+
+
+def write_frame(frame, filepath):
+    """Save a DataFrame to a file whose type is given by its extension (xlsx, json, csv or parquet)"""
+
+    extension = os.path.splitext(filepath)[1].lower()
+    filetype = FILETYPES.get(extension)
+    if filetype == "excel":
+        frame.to_excel(filepath, index=False)
+    elif filetype == "json":
+        frame.to_json(filepath, orient="records")
+    elif filetype == "csv":
+        frame.to_csv(filepath, index=False)
+    elif filetype == "parquet":
+        frame.to_parquet(filepath, index=False)
+    else:
+        raise FileTypeNotSupportedError(f"{extension} files are currently not supported")
+
+
+def score_file(taxonomy, input_path, output_path, chunksize=10_000, level=1, id_column=None):
+    """Score the entities of a csv file against a taxonomy, chunk by chunk.
+
+    The input has one row per entity: an id column followed by one column per
+    item, named by item id, holding the scores of the entity (usually leaf
+    items, empty cells count as 0 and the items missing from the file keep
+    their stored score). The output has one row per entity with the root score
+    and the scores of the items of the requested level. Rows are read and
+    written chunksize at a time, so memory does not grow with the input.
+
+    :param taxonomy: taxonomy scoring the entities
+    :type taxonomy: SustainabilityTaxonomy
+    :param input_path: path of the csv file of scores
+    :type input_path: str
+    :param output_path: path of the resulting csv file
+    :type output_path: str
+    :param chunksize: number of rows scored at once
+    :type chunksize: int
+    :param level: level of the items whose scores are written along with the root score
+    :type level: int
+    :param id_column: column identifying the entities (default: first column)
+    :type id_column: str
+    :returns: number of scored entities
+    :rtype: int
+    """
+
+    engine = taxonomy.scenario_engine()
+    count = 0
+
+    with open(output_path, "w", newline="") as output:
+        for chunk in pd.read_csv(input_path, chunksize=chunksize):
+            entity_column = id_column if id_column is not None else chunk.columns[0]
+            entities = chunk.pop(entity_column)
+            try:
+                chunk.columns = [int(column) for column in chunk.columns]
+            except ValueError:
+                raise IDNotFoundError("score columns must be named by item id")
+
+            result = engine.evaluate_scores(chunk.fillna(0), level)
+            frame = pd.DataFrame({entity_column: entities.to_numpy(), "score": result.root_scores})
+            names = pd.Series(result.level_names)
+            duplicated = names.duplicated(keep=False).to_numpy()
+            for name, item_id, is_duplicated, scores in zip(names, result.level_ids, duplicated,
+                                                             result.level_scores.T):
+                frame[f"{name} [{item_id}]" if is_duplicated else name] = scores
+
+            frame.to_csv(output, header=count == 0, index=False)
+            count += len(frame)
+
+    return count
+
+
+def summarise(taxonomy):
+    """Print the summary of a taxonomy along with its number of items per level"""
+
+    taxonomy.summary()
+    if taxonomy.root is not None:
+        depths = build_layout(taxonomy.root, keep_items=False).depths
+        print(f"Items per level: {np.bincount(depths).tolist()}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="taxonomy4good",
+                                     description="Convert, summarise and score sustainability taxonomies")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert = subparsers.add_parser("convert", help="convert a taxonomy between xlsx, json, csv and parquet")
+    convert.add_argument("source", help="builtin taxonomy name or taxonomy file")
+    convert.add_argument("target", help="resulting file (type given by its extension)")
+    convert.add_argument("--meta", action="store_true", help="keep the meta-data columns")
+    convert.add_argument("--validation", choices=VALIDATION_MODES, default="strict",
+                         help="raise on structural issues (strict), fix them (repair) or skip the checks (off)")
+
+    summary = subparsers.add_parser("summary", help="print the summary of a taxonomy")
+    summary.add_argument("source", help="builtin taxonomy name, taxonomy file or snapshot")
+
+    score = subparsers.add_parser("score", help="score the entities of a csv file against a taxonomy")
+    score.add_argument("taxonomy", help="builtin taxonomy name, taxonomy file or snapshot")
+    score.add_argument("input", help="csv file with an entity column and one score column per item id")
+    score.add_argument("output", help="resulting csv file")
+    score.add_argument("--chunksize", type=int, default=10_000, help="number of rows scored at once")
+    score.add_argument("--level", type=int, default=1, help="level of the item scores to write")
+    score.add_argument("--id-column", help="column identifying the entities (default: first column)")
+
+    serve = subparsers.add_parser("serve", help="answer lookups on taxonomies loaded once over local HTTP")
+    serve.add_argument("sources", nargs="*", help="taxonomy files or snapshots, served under their file name")
+    serve.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    serve.add_argument("--port", type=int, default=8765, help="port to listen on")
+    serve.add_argument("--cache-size", type=int, default=1024, help="number of cached responses (0: no cache)")
+    serve.add_argument("--no-builtin", action="store_true", help="do not serve the builtin taxonomies")
+    serve.add_argument("--meta", action="store_true", help="load the meta-data of the taxonomies")
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "convert":
+            write_frame(taxonomy_frame(load_taxonomy(args.source, meta=args.meta, validation=args.validation)), args.target)
+        elif args.command == "summary":
+            summarise(load_taxonomy(args.source))
+        elif args.command == "serve":
+            from .server import serve as serve_taxonomies
+            taxonomies = {os.path.splitext(os.path.basename(source))[0]: load_taxonomy(source, meta=args.meta)
+                          for source in args.sources}
+            print(f"Serving on http://{args.host}:{args.port}")
+            try:
+                serve_taxonomies(taxonomies, args.host, args.port, builtin=not args.no_builtin,
+                                 cache_size=args.cache_size, meta=args.meta)
+            except KeyboardInterrupt:
+                pass
+        else:
+            count = score_file(load_taxonomy(args.taxonomy), args.input, args.output,
+                               chunksize=args.chunksize, level=args.level, id_column=args.id_column)
+            print(f"Scored {count} entities")
+    except (FileTypeNotSupportedError, IDNotFoundError, EmptyTaxonomyError, TaxonomyValidationError,
+            ImportError) as error:
+        print(f"taxonomy4good: error: {error}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
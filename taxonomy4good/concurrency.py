@@ -0,0 +1,95 @@
+from .errors import FrozenTaxonomyError
+from contextlib import contextmanager
+import functools
+import threading
+
+
+class ReadWriteLock:
+    """Lock letting many threads read at once while writers get exclusive access.
+    Waiting writers have priority over new readers, so a steady flow of reads
+    cannot starve them. The lock is reentrant: a thread already holding it (in
+    any mode) can read again, and a writer can write again, but a reader cannot
+    upgrade to writing.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = set()
+        self._writer = None
+        self._waiting_writers = 0
+
+    @contextmanager
+    def reading(self):
+        """Hold the lock for reading"""
+
+        me = threading.get_ident()
+        with self._condition:
+            nested = self._writer == me or me in self._readers
+            if not nested:
+                while self._writer is not None or self._waiting_writers:
+                    self._condition.wait()
+                self._readers.add(me)
+        try:
+            yield
+        finally:
+            if not nested:
+                with self._condition:
+                    self._readers.discard(me)
+                    if not self._readers:
+                        self._condition.notify_all()
+
+    @contextmanager
+    def writing(self):
+        """Hold the lock for writing"""
+
+        me = threading.get_ident()
+        with self._condition:
+            nested = self._writer == me
+            if not nested:
+                if me in self._readers:
+                    raise RuntimeError("a thread reading the taxonomy cannot modify it")
+                self._waiting_writers += 1
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+                self._waiting_writers -= 1
+                self._writer = me
+        try:
+            yield
+        finally:
+            if not nested:
+                with self._condition:
+                    self._writer = None
+                    self._condition.notify_all()
+
+
+def locked(mode):
+    """Decorator of the SustainabilityTaxonomy methods describing how they access
+    the taxonomy:
+
+    - ``read``: shared access when locking is enabled
+    - ``write``: exclusive access when locking is enabled, not allowed on frozen taxonomies
+    - ``scores``: rolls scores up into the items, exclusive access when locking is
+      enabled, no locking on frozen taxonomies (scores are precomputed)
+
+    :param mode: read, write or scores
+    :type mode: str
+    """
+
+    def decorator(function):
+        name = function.__name__
+
+        @functools.wraps(function)
+        def wrapper(self, *args, **kwargs):
+            if mode == "write" and self._frozen:
+                raise FrozenTaxonomyError(f"{name} cannot modify a frozen taxonomy")
+
+            lock = self._lock
+            if lock is None or self._frozen:
+                return function(self, *args, **kwargs)
+
+            with lock.reading() if mode == "read" else lock.writing():
+                return function(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
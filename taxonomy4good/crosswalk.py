@@ -0,0 +1,243 @@
+from .errors import FileTypeNotSupportedError
+from .taxonomyLayout import build_layout
+from collections import defaultdict
+import pandas as pd
+import unicodedata
+import re
+
+CROSSWALK_COLUMNS = ["source_taxonomy", "source_id", "source_name", "target_taxonomy",
+                     "target_id", "target_name", "method", "similarity"]
+
+# matching methods, from the most to the least reliable
+MATCH_METHODS = ["exact", "normalised", "token"]
+
+STOP_WORDS = {"a", "an", "and", "as", "at", "by", "for", "from", "in", "into", "of", "on",
+              "or", "the", "to", "with", "other", "others"}
+
+_NON_ALPHANUMERIC = re.compile(r"[^0-9a-z]+")
+
+
+def normalise_name(name):
+    """Normalise a term so that spelling variants compare equal: accents are
+    removed, the term is lower-cased, ``&`` becomes ``and``, punctuation is
+    replaced by spaces and simple plurals are reduced to their singular.
+
+    :param name: term to normalise
+    :type name: str
+    :returns: the normalised term
+    :rtype: str
+    """
+
+    name = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode("ascii")
+    name = _NON_ALPHANUMERIC.sub(" ", name.lower().replace("&", " and "))
+    return " ".join(_singular(word) for word in name.split())
+
+
+def name_tokens(normalised_name):
+    """Get the set of meaningful words of a normalised term (stop words removed)"""
+
+    return {word for word in normalised_name.split() if word not in STOP_WORDS}
+
+
+def _singular(word):
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+class _TermIndex:
+    """blocking indexes of the terms of one taxonomy"""
+
+    def __init__(self, taxonomy):
+        layout = build_layout(taxonomy.root, keep_items=False)
+
+        # the root only holds the name of the taxonomy
+        self.ids = [int(item_id) for item_id in layout.ids[1:]]
+        self.names = [str(name) for name in layout.names[1:]]
+        self.tokens = []
+        self.exact = defaultdict(list)
+        self.normalised = defaultdict(list)
+        self.postings = defaultdict(list)
+
+        for position, name in enumerate(self.names):
+            normalised = normalise_name(name)
+            tokens = name_tokens(normalised)
+            self.tokens.append(tokens)
+            self.exact[name].append(position)
+            self.normalised[normalised].append(position)
+            for token in tokens:
+                self.postings[token].append(position)
+
+
+class Crosswalk:
+    """Mapping table between the items of several taxonomies.
+
+    Use :func:`build_crosswalk` to match the items of taxonomies, and
+    :meth:`lookup` to get the items mapped to an item (in both directions).
+
+    :param mappings: one row per matched pair of items (see CROSSWALK_COLUMNS)
+    :type mappings: pd.DataFrame
+    """
+
+    def __init__(self, mappings=None):
+        if mappings is None:
+            mappings = pd.DataFrame(columns=CROSSWALK_COLUMNS)
+        self.mappings = mappings.reset_index(drop=True)
+
+        # (taxonomy, item id) -> (taxonomy, id, name) of the other side, method, similarity
+        self._index = defaultdict(list)
+        for record in self.mappings[CROSSWALK_COLUMNS].itertuples(index=False):
+            source = (record[0], int(record[1]), record[2])
+            target = (record[3], int(record[4]), record[5])
+            self._index[source[:2]].append((target, record[6], float(record[7])))
+            self._index[target[:2]].append((source, record[6], float(record[7])))
+
+    def __len__(self):
+        return len(self.mappings)
+
+    def lookup(self, taxonomy, item_id, target_taxonomy=None):
+        """Get the items mapped to an item
+
+        :param taxonomy: name of the taxonomy of the item
+        :type taxonomy: str
+        :param item_id: id of the item
+        :type item_id: int
+        :param target_taxonomy: only return the items of this taxonomy (default: all taxonomies)
+        :type target_taxonomy: str
+        :returns: taxonomy, id, name, method and similarity of the mapped items (best first)
+        :rtype: list of dict
+        """
+
+        matches = []
+        for (other_taxonomy, other_id, other_name), method, similarity in self._index.get(
+                (taxonomy, int(item_id)), []):
+            if target_taxonomy is not None and other_taxonomy != target_taxonomy:
+                continue
+            matches.append({"taxonomy": other_taxonomy, "id": other_id, "name": other_name,
+                            "method": method, "similarity": similarity})
+
+        return sorted(matches, key=lambda match: (-match["similarity"], MATCH_METHODS.index(match["method"])))
+
+    def to_dataframe(self):
+        """Get the mapping table
+
+        :rtype: pd.DataFrame
+        """
+
+        return self.mappings.copy()
+
+    def to_csv(self, filepath):
+        """Save the mapping table to a csv file
+
+        :param filepath: path where to save the resulting file
+        :type filepath: str
+        """
+
+        self.mappings.to_csv(f"{filepath}.csv", index=False)
+
+    def to_json(self, filepath):
+        """Save the mapping table to a JSON file (records structure)
+
+        :param filepath: path where to save the resulting file
+        :type filepath: str
+        """
+
+        self.mappings.to_json(f"{filepath}.json", orient="records")
+
+
+def read_crosswalk(filepath, filetype="csv"):
+    """Load a crosswalk saved with :meth:`Crosswalk.to_csv` or :meth:`Crosswalk.to_json`
+
+    :param filepath: path of the file
+    :type filepath: str
+    :param filetype: the type of the file (csv or json)
+    :type filetype: str
+    :rtype: Crosswalk
+    """
+
+    if filetype == "csv":
+        mappings = pd.read_csv(filepath)
+    elif filetype == "json":
+        mappings = pd.read_json(filepath)
+    else:
+        raise FileTypeNotSupportedError(f"{filetype} is currently not supported")
+
+    return Crosswalk(mappings.reindex(columns=CROSSWALK_COLUMNS))
+
+
+def build_crosswalk(taxonomies, min_similarity=0.5, max_block_size=100):
+    """Match the items of two or more taxonomies.
+
+    Every pair of taxonomies is matched through blocking indexes instead of
+    comparing all pairs of terms: identical names first (``exact``), then
+    identical normalised names (``normalised``, see :func:`normalise_name`),
+    then terms sharing words (``token``) scored with the Jaccard similarity of
+    their words. Only the items sharing a word are compared, words found in
+    more than ``max_block_size`` items of a taxonomy are too common to be used
+    as blocking keys.
+
+    :param taxonomies: taxonomies to match, by name (a list uses the names of their roots)
+    :type taxonomies: dict | list of SustainabilityTaxonomy
+    :param min_similarity: minimum Jaccard similarity of token matches
+    :type min_similarity: float
+    :param max_block_size: maximum number of items sharing a word for it to be used
+    :type max_block_size: int
+    :returns: the mapping table between the items of the taxonomies
+    :rtype: Crosswalk
+    """
+
+    if not isinstance(taxonomies, dict):
+        # the root of a taxonomy holds its name (the version names are usually all the same)
+        keyed = {}
+        for taxonomy in taxonomies:
+            name = str(taxonomy.root.name)
+            if name in keyed:
+                raise ValueError(f"several taxonomies are named {name}, pass them in a dict by name")
+            keyed[name] = taxonomy
+        taxonomies = keyed
+
+    indexes = {name: _TermIndex(taxonomy) for name, taxonomy in taxonomies.items()}
+    names = list(indexes)
+    rows = []
+
+    for i, source_name in enumerate(names):
+        for target_name in names[i + 1:]:
+            source, target = indexes[source_name], indexes[target_name]
+            matched = set()
+
+            def add(s, t, method, similarity):
+                matched.add((s, t))
+                rows.append((source_name, source.ids[s], source.names[s], target_name,
+                             target.ids[t], target.names[t], method, similarity))
+
+            for name in source.exact.keys() & target.exact.keys():
+                for s in source.exact[name]:
+                    for t in target.exact[name]:
+                        add(s, t, "exact", 1.0)
+
+            for name in source.normalised.keys() & target.normalised.keys():
+                for s in source.normalised[name]:
+                    for t in target.normalised[name]:
+                        if (s, t) not in matched:
+                            add(s, t, "normalised", 1.0)
+
+            # count the words shared by the candidate pairs of every block
+            shared = defaultdict(int)
+            for token in source.postings.keys() & target.postings.keys():
+                source_block, target_block = source.postings[token], target.postings[token]
+                if len(source_block) > max_block_size or len(target_block) > max_block_size:
+                    continue
+                for s in source_block:
+                    for t in target_block:
+                        shared[(s, t)] += 1
+
+            for (s, t), count in shared.items():
+                if (s, t) in matched:
+                    continue
+                similarity = count / len(source.tokens[s] | target.tokens[t])
+                if similarity >= min_similarity:
+                    add(s, t, "token", round(similarity, 4))
+
+    return Crosswalk(pd.DataFrame(rows, columns=CROSSWALK_COLUMNS))
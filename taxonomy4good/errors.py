@@ -11,3 +11,20 @@ class EmptyTaxonomyError(Exception):
 
 class AuthorizationException(Exception):
     pass
+
+
+class InvalidQueryError(Exception):
+    pass
+
+
+class FrozenTaxonomyError(Exception):
+    pass
+
+
+class TaxonomyValidationError(Exception):
+    """Structural issues found while loading a taxonomy, listed in the report attribute"""
+
+    def __init__(self, report):
+        self.report = report
+        super().__init__(f"{len(report)} structural issues found: {report!r}, "
+                         + "load with validation='repair' to fix them")
@@ -0,0 +1,86 @@
+import openpyxl
+import gzip
+import lzma
+import bz2
+import csv
+
+# columns of the exported items, as in SustainabilityTaxonomy.to_dataframe
+EXPORT_COLUMNS = ["id", "name", "level", "grouping", "parent", "weight", "score", "children", "meta_data"]
+
+# supported compressions: file opener and extension
+COMPRESSIONS = {"gzip": (gzip.open, "gz"), "bz2": (bz2.open, "bz2"), "xz": (lzma.open, "xz")}
+
+
+def export_row(item):
+    """Values of the EXPORT_COLUMNS of an item, as written by pandas (lists and
+    dictionaries as their text representation, None as an empty cell)"""
+
+    record = item.to_dict()
+    return [str(value) if isinstance(value, (list, dict)) else value
+            for value in (record[column] for column in EXPORT_COLUMNS)]
+
+
+def write_csv(items, filepath, chunk_size=10_000, compression=None):
+    """Write items to a csv file chunk by chunk: at most chunk_size rows are held in
+    memory, and every chunk is written (and flushed) as soon as it is complete
+
+    :param items: items to write
+    :type items: iterable of SustainabilityItem
+    :param filepath: path of the resulting file (extension included)
+    :type filepath: str
+    :param chunk_size: number of rows written at once
+    :type chunk_size: int
+    :param compression: None, "gzip", "bz2" or "xz"
+    :type compression: str
+    :returns: number of written items
+    :rtype: int
+    """
+
+    if compression is None:
+        handle = open(filepath, "w", newline="", encoding="utf-8")
+    elif compression in COMPRESSIONS:
+        handle = COMPRESSIONS[compression][0](filepath, "wt", newline="", encoding="utf-8")
+    else:
+        raise ValueError(f"{compression} is not a supported compression, use one of {list(COMPRESSIONS)}")
+
+    count = 0
+    with handle:
+        writer = csv.writer(handle)
+        # the first column is the row number, like the index written by pandas
+        writer.writerow([""] + EXPORT_COLUMNS)
+        chunk = []
+        for item in items:
+            chunk.append([count] + export_row(item))
+            count += 1
+            if len(chunk) == chunk_size:
+                writer.writerows(chunk)
+                handle.flush()
+                chunk = []
+        writer.writerows(chunk)
+
+    return count
+
+
+def write_excel(items, filepath):
+    """Write items to an Excel file through a write-only openpyxl workbook, rows are
+    streamed to disk instead of being kept in memory
+
+    :param items: items to write
+    :type items: iterable of SustainabilityItem
+    :param filepath: path of the resulting file (extension included)
+    :type filepath: str
+    :returns: number of written items
+    :rtype: int
+    """
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append([None] + EXPORT_COLUMNS)
+
+    count = 0
+    for item in items:
+        sheet.append([count] + export_row(item))
+        count += 1
+
+    workbook.save(filepath)
+    return count
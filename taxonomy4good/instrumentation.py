@@ -0,0 +1,277 @@
+from contextlib import contextmanager
+import pandas as pd
+import threading
+import functools
+import time
+import sys
+
+# global switch, checked before anything else so disabled instrumentation costs
+# a single attribute lookup per call of the instrumented functions
+_enabled = False
+_sinks = []
+_local = threading.local()
+# (method, wrapper) of the instrumented methods, the wrappers are only set on
+# their classes while instrumentation is on
+_methods = []
+
+
+class OperationEvent:
+    """Measurements of a single instrumented call or loader phase
+
+    :param name: name of the operation (e.g. ``SustainabilityTaxonomy.get_items`` or
+                 ``from_file.read``)
+    :type name: str
+    :param kind: ``method`` for instrumented functions, ``phase`` for loader phases
+    :type kind: str
+    :param seconds: wall time of the operation (nested operations included)
+    :type seconds: float
+    :param nodes_visited: number of items visited by the operation (nested operations included)
+    :type nodes_visited: int
+    """
+
+    def __init__(self, name, kind, seconds, nodes_visited):
+        self.name = name
+        self.kind = kind
+        self.seconds = seconds
+        self.nodes_visited = nodes_visited
+
+    def __repr__(self):
+        return (f"OperationEvent(name={self.name!r}, kind={self.kind!r}, "
+                f"seconds={self.seconds:.6f}, nodes_visited={self.nodes_visited})")
+
+
+class MetricsCollector:
+    """Metrics sink aggregating the events per operation (call counts, total and
+    maximum wall time, nodes visited). Instances are callables that can be passed
+    to :func:`add_sink`.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        with self._lock:
+            metric = self.metrics.get(event.name)
+            if metric is None:
+                metric = self.metrics[event.name] = {"kind": event.kind, "calls": 0, "total_seconds": 0.0,
+                                                     "max_seconds": 0.0, "nodes_visited": 0}
+            metric["calls"] += 1
+            metric["total_seconds"] += event.seconds
+            metric["max_seconds"] = max(metric["max_seconds"], event.seconds)
+            metric["nodes_visited"] += event.nodes_visited
+
+    def clear(self):
+        """Forget all the collected metrics"""
+
+        with self._lock:
+            self.metrics = {}
+
+    def report(self):
+        """Get the collected metrics, slowest operations first
+
+        :returns: one row per operation (kind, calls, total_seconds, mean_seconds,
+                  max_seconds, nodes_visited)
+        :rtype: pd.DataFrame
+        """
+
+        with self._lock:
+            report = pd.DataFrame.from_dict(self.metrics, orient="index",
+                                            columns=["kind", "calls", "total_seconds",
+                                                     "max_seconds", "nodes_visited"])
+        report.index.name = "operation"
+        report.insert(3, "mean_seconds", report["total_seconds"] / report["calls"])
+        return report.sort_values("total_seconds", ascending=False)
+
+    def __str__(self):
+        return self.report().to_string()
+
+
+def enable():
+    """Turn instrumentation on"""
+
+    global _enabled
+    _enabled = True
+    _install(True)
+
+
+def disable():
+    """Turn instrumentation off"""
+
+    global _enabled
+    _enabled = False
+    _install(False)
+
+
+def _install(enabled):
+    """set the wrappers of the instrumented methods on their classes (or the methods back)"""
+
+    for method, wrapper in _methods:
+        owner = sys.modules.get(method.__module__)
+        try:
+            for part in method.__qualname__.split(".")[:-1]:
+                owner = getattr(owner, part)
+        except AttributeError:
+            # class still being defined, its methods are decorated according to _enabled
+            continue
+        setattr(owner, method.__name__, wrapper if enabled else method)
+
+
+def is_enabled():
+    """Check if instrumentation is turned on"""
+
+    return _enabled
+
+
+def add_sink(sink):
+    """Register a callback receiving an :class:`OperationEvent` after every
+    instrumented call or loader phase
+
+    :param sink: metrics sink (e.g. a MetricsCollector, or a function forwarding
+                 the events to a monitoring system)
+    :type sink: callable
+    """
+
+    _sinks.append(sink)
+
+
+def remove_sink(sink):
+    """Unregister a callback added with :func:`add_sink`"""
+
+    if sink in _sinks:
+        _sinks.remove(sink)
+
+
+def count_nodes(n=1):
+    """Report that the running operation visited n items"""
+
+    if not _enabled:
+        return
+    frames = getattr(_local, "frames", None)
+    if frames:
+        frames[-1][2] += n
+
+
+def _emit(name, kind, started, frame):
+    seconds = time.perf_counter() - started
+    frames = _local.frames
+    frames.pop()
+
+    # nested operations are included in the figures of the enclosing one
+    if frames:
+        frames[-1][2] += frame[2]
+
+    event = OperationEvent(name, kind, seconds, frame[2])
+    for sink in list(_sinks):
+        sink(event)
+
+
+def instrumented(function):
+    """Decorator recording calls, wall time and nodes visited of a function.
+    Recursive calls are only recorded once, by the outermost call.
+
+    Methods are left undecorated while instrumentation is off (:func:`enable`
+    sets the wrapper on their class and :func:`disable` removes it), so that they
+    are called without any extra layer. Module level functions, which other
+    modules import directly, keep the wrapper.
+    """
+
+    name = function.__qualname__
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return function(*args, **kwargs)
+
+        frames = getattr(_local, "frames", None)
+        if frames is None:
+            frames = _local.frames = []
+        elif any(frame[0] == name for frame in frames):
+            # recursive call, measured by the outermost call
+            return function(*args, **kwargs)
+
+        frame = [name, "method", 0]
+        frames.append(frame)
+        started = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _emit(name, "method", started, frame)
+
+    parts = name.split(".")
+    if len(parts) == 1 or "<locals>" in parts:
+        return wrapper
+    _methods.append((function, wrapper))
+    return wrapper if _enabled else function
+
+
+class _NoPhase:
+    """context manager doing nothing, used when instrumentation is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+class _Phase:
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        frames = getattr(_local, "frames", None)
+        if frames is None:
+            frames = _local.frames = []
+        self.frame = [self.name, "phase", 0]
+        frames.append(self.frame)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        _emit(self.name, "phase", self.started, self.frame)
+        return False
+
+
+def phase(name):
+    """Context manager measuring a phase of an operation (e.g. the reading,
+    normalisation and linking phases of from_file)
+
+    :param name: name of the phase
+    :type name: str
+    """
+
+    if not _enabled:
+        return _NO_PHASE
+    return _Phase(name)
+
+
+@contextmanager
+def profile():
+    """Context manager turning instrumentation on and collecting the metrics of
+    the operations run inside it.
+
+    .. code-block:: python
+
+        with profile() as report:
+            taxonomy = from_file("eu_taxonomy")
+            taxonomy.get_level_scores(1)
+        print(report)
+
+    :returns: collector of the metrics, see :meth:`MetricsCollector.report`
+    :rtype: MetricsCollector
+    """
+
+    collector = MetricsCollector()
+    was_enabled = _enabled
+    add_sink(collector)
+    enable()
+    try:
+        yield collector
+    finally:
+        if not was_enabled:
+            disable()
+        remove_sink(collector)
@@ -0,0 +1,303 @@
+from .sustainabilityItem import SustainabilityItem
+from .taxonomySnapshot import write_snapshot, open_snapshot, SNAPSHOT_EXTENSION
+from .taxonomyDiff import TaxonomyDiff
+from .taxonomyLayout import build_layout
+import pandas as pd
+import numpy as np
+import json
+import time
+import os
+
+JOURNAL_FILE = "journal.jsonl"
+CHECKPOINT_FILE = "checkpoint.json"
+
+# attributes that can be changed with SustainabilityTaxonomy.update_item
+JOURNALED_ATTRIBUTES = ("name", "level", "grouping", "score", "weight", "meta_data")
+
+
+class TaxonomyJournal:
+    """Append-only log of the modifications of a taxonomy, stored in a directory
+    along with a snapshot of the taxonomy (see :meth:`checkpoint`).
+
+    Every modification made through insert_items, remove_subtree, remove_by_id,
+    update_item or merge is appended to ``journal.jsonl`` as one JSON line, so
+    saving costs O(changes) instead of a full export, and the log doubles as an
+    audit trail. :func:`recover_taxonomy` loads the last snapshot and replays the
+    modifications logged after it, reading the log from the byte offset recorded
+    by the checkpoint so that the earlier history is not parsed.
+
+    :param directory: directory of the journal (created if missing)
+    :type directory: str
+    :param checkpoint_every: number of logged modifications after which a new snapshot is
+                             saved automatically (default: only on :meth:`checkpoint`)
+    :type checkpoint_every: int
+    :param fsync: force every entry to disk before returning
+    :type fsync: bool
+    """
+
+    def __init__(self, directory, checkpoint_every=None, fsync=False):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.checkpoint_every = checkpoint_every
+        self.fsync = fsync
+        self.log_path = os.path.join(directory, JOURNAL_FILE)
+        self.checkpoint_path = os.path.join(directory, CHECKPOINT_FILE)
+
+        self.sequence = self._last_sequence()
+        checkpoint = self.read_checkpoint()
+        self.checkpoint_sequence = checkpoint["sequence"] if checkpoint is not None else None
+
+        self._taxonomy = None
+        self._file = open(self.log_path, "a", encoding="utf-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def attach(self, taxonomy):
+        """Set the taxonomy saved by the automatic checkpoints (see checkpoint_every),
+        done by :meth:`SustainabilityTaxonomy.attach_journal`
+
+        :param taxonomy: the journaled taxonomy
+        :type taxonomy: SustainabilityTaxonomy
+        """
+
+        self._taxonomy = taxonomy
+
+    def detach(self):
+        """Stop saving a taxonomy in the automatic checkpoints, done by
+        :meth:`SustainabilityTaxonomy.detach_journal`"""
+
+        self._taxonomy = None
+
+    def is_empty(self):
+        """Check if nothing was logged or checkpointed in the directory yet"""
+
+        return self.sequence == 0 and self.checkpoint_sequence is None
+
+    def record(self, operation, **payload):
+        """Append a modification to the log
+
+        :param operation: type of modification (insert, remove, update or merge)
+        :type operation: str
+        :param payload: description of the modification
+        """
+
+        self.sequence += 1
+        entry = {"sequence": self.sequence, "time": time.time(), "operation": operation}
+        entry.update(payload)
+        self._file.write(json.dumps(entry, default=_to_json) + "\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+        if (self.checkpoint_every is not None and self._taxonomy is not None
+                and self.sequence - (self.checkpoint_sequence or 0) >= self.checkpoint_every):
+            self.checkpoint()
+
+    def checkpoint(self, taxonomy=None):
+        """Save a snapshot of the taxonomy, recovery then starts from this snapshot
+
+        :param taxonomy: taxonomy to save (default: the taxonomy the journal is attached to)
+        :type taxonomy: SustainabilityTaxonomy
+        """
+
+        taxonomy = self._taxonomy if taxonomy is None else taxonomy
+        previous = self.read_checkpoint()
+
+        snapshot = f"snapshot-{self.sequence}.{SNAPSHOT_EXTENSION}"
+        write_snapshot(taxonomy, os.path.join(self.directory, snapshot))
+        # the entries logged after the snapshot start at the current end of the log
+        self._file.flush()
+        offset = os.fstat(self._file.fileno()).st_size
+
+        # the checkpoint file is replaced atomically, a crash leaves the previous one
+        temporary = self.checkpoint_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"sequence": self.sequence, "snapshot": snapshot, "offset": offset,
+                       "taxonomy_name": taxonomy._taxonomy_name,
+                       "version_name": taxonomy.version_name,
+                       "version_num": taxonomy.version_num}, f)
+        os.replace(temporary, self.checkpoint_path)
+        self.checkpoint_sequence = self.sequence
+
+        if previous is not None and previous["snapshot"] != snapshot:
+            os.remove(os.path.join(self.directory, previous["snapshot"]))
+
+    def read_checkpoint(self):
+        """Get the description of the last checkpoint (None if there is none)
+
+        :rtype: dict
+        """
+
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def entries(self, after=0, offset=0):
+        """Iterate over the logged modifications
+
+        :param after: only return the modifications logged after this sequence number
+        :type after: int
+        :param offset: byte offset of the log where to start reading (e.g. the offset
+                       recorded by a checkpoint), the lines before it are not read
+        :type offset: int
+        :rtype: generator of dict
+        """
+
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, "rb") as f:
+            # a log shorter than the offset was replaced, it is read from the start
+            if offset <= os.fstat(f.fileno()).st_size:
+                f.seek(offset)
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["sequence"] > after:
+                    yield entry
+
+    def to_dataframe(self):
+        """Get the logged modifications (audit trail) as a DataFrame
+
+        :rtype: pd.DataFrame
+        """
+
+        return pd.DataFrame(list(self.entries()))
+
+    def close(self):
+        """Close the log file"""
+
+        if not self._file.closed:
+            self._file.close()
+
+    def _last_sequence(self):
+        """sequence number of the last complete entry, read from the end of the log"""
+
+        if not os.path.exists(self.log_path):
+            return 0
+        with open(self.log_path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            block = 4096
+            while True:
+                f.seek(max(0, size - block))
+                lines = [line for line in f.read().splitlines() if line.strip()]
+                if len(lines) > 1 or block >= size:
+                    break
+                block *= 2
+
+        for line in reversed(lines):
+            try:
+                return json.loads(line)["sequence"]
+            except ValueError:
+                # entry cut by a crash
+                continue
+        return 0
+
+
+def item_records(items):
+    """Describe items and their subtrees for the journal (parents listed before their children)
+
+    :param items: inserted items
+    :type items: list of SustainabilityItem
+    :rtype: list of dict
+    """
+
+    records = []
+    for item in items:
+        for subtree_item in build_layout(item).items:
+            records.append({"id": subtree_item.id, "name": subtree_item.name, "level": subtree_item.level,
+                            "grouping": subtree_item.grouping, "parent": subtree_item.parent.id,
+                            "score": subtree_item.score, "weight": subtree_item.weight,
+                            "meta_data": subtree_item.meta_data})
+    return records
+
+
+def replay(taxonomy, entries):
+    """Apply logged modifications to a taxonomy (without logging them again)
+
+    :param taxonomy: taxonomy to update
+    :type taxonomy: SustainabilityTaxonomy
+    :param entries: modifications, as returned by :meth:`TaxonomyJournal.entries`
+    :type entries: iterable of dict
+    """
+
+    journal, taxonomy._journal = taxonomy._journal, None
+    items = None
+    try:
+        for entry in entries:
+            operation = entry["operation"]
+            if operation == "insert":
+                if items is None:
+                    items = {item.id: item for item in build_layout(taxonomy.root).items}
+                for record in entry["items"]:
+                    item = SustainabilityItem(id=record["id"], name=record["name"], level=record["level"],
+                                              grouping=record["grouping"], score=record["score"],
+                                              weight=record["weight"], meta_data=record["meta_data"])
+                    parent = items[record["parent"]]
+                    item.parent = parent
+                    if parent.children is None:
+                        parent.children = [item]
+                    else:
+                        parent.children.append(item)
+                    items[item.id] = item
+                taxonomy.invalidate_indexes()
+            elif operation == "remove":
+                taxonomy.remove_by_id(entry["ids"])
+            elif operation == "update":
+                taxonomy.update_item(entry["id"], **entry["attributes"])
+            elif operation == "merge":
+                taxonomy.merge(TaxonomyDiff(**entry["diff"]))
+                items = None
+            else:
+                raise ValueError(f"unknown journal operation {operation}")
+    finally:
+        taxonomy._journal = journal
+
+
+def recover_taxonomy(directory, checkpoint_every=None, fsync=False):
+    """Rebuild a journaled taxonomy: load its last snapshot and replay the
+    modifications logged after it. The journal is attached to the result, so
+    that the following modifications are logged as well.
+
+    :param directory: directory of the journal
+    :type directory: str
+    :param checkpoint_every: see :class:`TaxonomyJournal`
+    :type checkpoint_every: int
+    :param fsync: see :class:`TaxonomyJournal`
+    :type fsync: bool
+    :returns: the taxonomy as it was after the last logged modification
+    :rtype: SustainabilityTaxonomy
+    """
+
+    journal = TaxonomyJournal(directory, checkpoint_every, fsync)
+    checkpoint = journal.read_checkpoint()
+    if checkpoint is None:
+        journal.close()
+        raise FileNotFoundError(f"no checkpoint found in {directory}")
+
+    with open_snapshot(os.path.join(directory, checkpoint["snapshot"])) as snapshot:
+        taxonomy = snapshot.to_taxonomy()
+    taxonomy._taxonomy_name = checkpoint["taxonomy_name"]
+    taxonomy.version_name = checkpoint["version_name"]
+    taxonomy.version_num = checkpoint["version_num"]
+
+    replay(taxonomy, journal.entries(after=checkpoint["sequence"], offset=checkpoint["offset"]))
+    taxonomy.attach_journal(journal)
+
+    return taxonomy
+
+
+def _to_json(value):
+    """JSON conversion of the numpy values found in items"""
+
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
@@ -0,0 +1,108 @@
+from collections import OrderedDict
+import functools
+import threading
+
+
+class LRUCache:
+    """Least recently used cache of derived results
+
+    :param maxsize: maximum number of results kept in the cache
+    :type maxsize: int
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """Get the cached value of a key (and mark it as recently used)"""
+
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """Cache a value, evicting the least recently used one if the cache is full"""
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached values"""
+
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """Get the statistics of the cache
+
+        :returns: hits, misses, size and maxsize of the cache
+        :rtype: dict
+        """
+
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
+
+
+def subtree_key(name, start_root, *args):
+    """Key identifying a result derived from the subtree of start_root: the
+    fingerprint of the subtree along with the id of its parent (which is part of
+    the exported records)"""
+
+    parent_id = start_root.parent.id if start_root.parent is not None else None
+    return (name, start_root.fingerprint, parent_id) + args
+
+
+def memoized(copy=None):
+    """Decorator caching the result of a SustainabilityTaxonomy method taking
+    ``start_root`` as first argument. Results are reused as long as the
+    fingerprint of the subtree does not change. Nothing is cached unless
+    memoization is enabled on the taxonomy (see
+    :meth:`SustainabilityTaxonomy.enable_memoization`).
+
+    :param copy: function applied to the cached result before returning it, so
+                 that callers cannot alter the cache (e.g. DataFrame.copy)
+    :type copy: callable
+    """
+
+    def decorator(function):
+        name = function.__name__
+
+        @functools.wraps(function)
+        def wrapper(self, start_root=None, *args, **kwargs):
+            cache = self._memo
+            if cache is None or kwargs:
+                return function(self, start_root, *args, **kwargs)
+
+            root = self.root if start_root is None else start_root
+            if root is None:
+                return function(self, start_root, *args)
+
+            key = subtree_key(name, root, *args)
+            result = cache.get(key, _MISSING)
+            if result is _MISSING:
+                result = function(self, start_root, *args)
+                cache.put(key, result)
+
+            return copy(result) if copy is not None else result
+
+        return wrapper
+
+    return decorator
+
+
+_MISSING = object()
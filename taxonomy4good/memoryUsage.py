@@ -0,0 +1,107 @@
+from collections import deque
+import types
+import sys
+import numpy as np
+import pandas as pd
+
+# parts of a taxonomy reported by SustainabilityTaxonomy.memory_usage
+MEMORY_COMPONENTS = ["nodes", "names", "meta_data", "children", "caches", "indexes"]
+
+# shared by the whole interpreter, never attributed to a taxonomy
+_NOT_COUNTED = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+                types.MethodType, np.ufunc)
+
+
+def sizeof(obj, seen, deep=True):
+    """Size in bytes of an object and, if deep, of everything it references
+    (containers, attributes, numpy buffers), each object being counted once.
+
+    Objects whose id is in seen are skipped and the ids of the counted objects are
+    added to it, so that objects shared between several parts are only attributed
+    to the first one measured. Classes, modules and functions are not counted.
+
+    :param obj: object to measure
+    :type obj: object
+    :param seen: ids of the objects already counted
+    :type seen: set of int
+    :param deep: follow the references of obj (default), or only count obj itself
+    :type deep: bool
+    :rtype: int
+    """
+
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if current is None or id(current) in seen or isinstance(current, _NOT_COUNTED):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if not deep:
+            continue
+
+        if isinstance(current, np.ndarray):
+            # views do not own their buffer, the array they were taken from does
+            if current.base is not None:
+                stack.append(current.base)
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset, deque)):
+            stack.extend(current)
+        elif isinstance(current, (pd.DataFrame, pd.Series, pd.Index)):
+            # pandas objects include their values in their own __sizeof__
+            continue
+
+        attributes = getattr(current, "__dict__", None)
+        if isinstance(attributes, dict):
+            stack.append(attributes)
+        for slot in getattr(type(current), "__slots__", ()):
+            stack.append(getattr(current, slot, None))
+    return total
+
+
+def taxonomy_memory_usage(taxonomy, deep=True):
+    """Bytes used by the parts of a taxonomy, see :meth:`SustainabilityTaxonomy.memory_usage`
+
+    :param taxonomy: taxonomy to measure
+    :type taxonomy: SustainabilityTaxonomy
+    :param deep: also count the contents of meta_data, caches and indexes
+    :type deep: bool
+    :rtype: pd.Series
+    """
+
+    usage = dict.fromkeys(MEMORY_COMPONENTS, 0)
+    items = list(taxonomy.iter_items()) if taxonomy.root is not None else []
+
+    # the items and children lists are attributed to nodes and children whatever
+    # references them (parents, indexes, cached results)
+    seen = {id(taxonomy), id(taxonomy.__dict__)}
+    seen.update(id(item) for item in items)
+    children_lists = [item.children for item in items if item.children is not None]
+    seen.update(id(children) for children in children_lists)
+
+    for item in items:
+        attributes = item.__dict__
+        seen.add(id(attributes))
+        usage["nodes"] += sys.getsizeof(item) + sys.getsizeof(attributes)
+        for name, value in attributes.items():
+            if name in ("name", "grouping"):
+                usage["names"] += sizeof(value, seen)
+            elif name == "meta_data":
+                usage["meta_data"] += sizeof(value, seen, deep)
+            elif name not in ("parent", "children"):
+                # id, level, score, weight, fingerprint
+                usage["nodes"] += sizeof(value, seen)
+
+    for children in children_lists:
+        usage["children"] += sys.getsizeof(children)
+        attributes = getattr(children, "__dict__", None)
+        if attributes is not None:
+            seen.add(id(attributes))
+            usage["children"] += sys.getsizeof(attributes)
+
+    usage["caches"] = sizeof(taxonomy._memo, seen, deep)
+    usage["indexes"] = sizeof(taxonomy._indexes, seen, deep) + sizeof(taxonomy._similarity, seen, deep)
+    return pd.Series(usage, name="bytes", dtype=np.int64)
@@ -0,0 +1,272 @@
+from .errors import IDNotFoundError, FileTypeNotSupportedError
+from .validation import as_ids, parse_children
+from openpyxl import load_workbook
+from collections import defaultdict
+import pandas as pd
+import numpy as np
+
+# number of rows whose ids are converted at once while streaming a sheet
+CHUNK_SIZE = 4096
+
+# text cells read as missing values, as by pd.read_excel
+NA_VALUES = {"", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+             "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"}
+
+
+def select_branch(ids, parents, subtree_root=None, max_depth=None):
+    """Find the rows of a branch of a taxonomy file from its id and parent columns only.
+    The branch is collected level by level, each level being a vectorized lookup of
+    the rows whose parent is in the previous one.
+
+    :param ids: id of every row
+    :type ids: list | numpy.array
+    :param parents: parent id of every row (missing or 0 for the children of the root)
+    :type parents: list | numpy.array
+    :param subtree_root: id of the item heading the branch (default: root of the taxonomy)
+    :type subtree_root: int
+    :param max_depth: deepest level kept, relative to subtree_root (default: no limit)
+    :type max_depth: int
+    :returns: positions of the rows of the branch, in file order
+    :rtype: numpy.array (int)
+    """
+
+    ids = as_ids(ids)
+    parents = as_ids(parents)
+    parents[np.isnan(parents)] = 0
+
+    taken = np.zeros(len(ids), dtype=bool)
+    if subtree_root is None or subtree_root == 0:
+        # the root is not a row of the file
+        frontier = np.array([0.0])
+        selected = []
+    else:
+        rows = np.flatnonzero(ids == subtree_root)[:1]
+        if len(rows) == 0:
+            raise IDNotFoundError(f"{subtree_root} not found in the Taxonomy")
+        taken[rows] = True
+        frontier = ids[rows]
+        selected = [rows]
+
+    depth = 0
+    while len(frontier) and (max_depth is None or depth < max_depth):
+        # rows already taken are skipped, so that cycles end the search
+        rows = np.flatnonzero(np.isin(parents, frontier) & ~taken)
+        taken[rows] = True
+        selected.append(rows)
+        frontier = ids[rows]
+        depth += 1
+
+    return np.sort(np.concatenate(selected)) if selected else np.zeros(0, dtype=np.int64)
+
+
+def read_branch(filepath, filetype="excel", subtree_root=None, max_depth=None):
+    """Read only the rows of a branch of a taxonomy file. Excel sheets are streamed
+    once: a row is kept as soon as its parent is known to be in the branch, dropped
+    as soon as it is known to be out of it, and waits for its parent otherwise, so
+    that memory scales with the branch (and the rows listed before their parent)
+    rather than with the file. The whole sheet is still parsed, which takes most of
+    the loading time: reading a branch is faster than reading the file mostly
+    because fewer items are converted and linked. JSON files are parsed and then
+    filtered.
+
+    The parent of subtree_root is left out (it becomes a child of the root) and the
+    children lists only keep the ids of the branch, the items at max_depth having
+    no children.
+
+    :param filepath: path of the file
+    :type filepath: str
+    :param filetype: excel or json
+    :type filetype: str
+    :param subtree_root: id of the item heading the branch (default: root of the taxonomy)
+    :type subtree_root: int
+    :param max_depth: deepest level kept, relative to subtree_root (default: no limit)
+    :type max_depth: int
+    :returns: rows of the branch, with the columns of the file
+    :rtype: pd.DataFrame
+    """
+
+    if filetype == "excel":
+        items_df = _read_excel_branch(filepath, subtree_root, max_depth)
+    elif filetype == "json":
+        items_df = pd.read_json(filepath)
+        columns = {column.lower(): column for column in items_df.columns}
+        branch = select_branch(items_df[columns["id"]].tolist(), items_df[columns["parent"]].tolist(),
+                               subtree_root, max_depth)
+        items_df = items_df.iloc[branch].reset_index(drop=True)
+    else:
+        raise FileTypeNotSupportedError(f"{filetype} is currently not supported")
+
+    columns = {column.lower(): column for column in items_df.columns}
+    ids = as_ids(items_df[columns["id"]])
+    kept = set(ids.tolist())
+    if subtree_root is not None and subtree_root != 0:
+        # the branch hangs from the root of the partial taxonomy
+        items_df.loc[ids == subtree_root, columns["parent"]] = None
+    if "children" in columns:
+        children = []
+        for value in items_df[columns["children"]]:
+            try:
+                listed = [child for child in parse_children(value) if child in kept]
+            except (ValueError, SyntaxError):
+                # left as is, reported by the validation
+                children.append(value)
+                continue
+            children.append(str(listed) if listed else None)
+        items_df[columns["children"]] = pd.Series(children, index=items_df.index, dtype=object)
+    return items_df
+
+
+def _read_excel_branch(filepath, subtree_root, max_depth):
+    """rows of a branch of the first sheet of an Excel file, read in a single pass"""
+
+    workbook = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        # the dimensions saved in the file can be wrong
+        sheet.reset_dimensions()
+        rows = sheet.iter_rows(values_only=True)
+        header = _trimmed([_cell(value) for value in next(rows, ())])
+        lowered = [str(value).lower() for value in header]
+        if "id" not in lowered or "parent" not in lowered:
+            raise ValueError(f"{filepath} has no id and parent columns")
+        id_column, parent_column = lowered.index("id"), lowered.index("parent")
+
+        branch = _BranchRows(subtree_root, max_depth)
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == CHUNK_SIZE:
+                branch.add_rows(chunk, id_column, parent_column)
+                chunk = []
+        branch.add_rows(chunk, id_column, parent_column)
+    finally:
+        workbook.close()
+
+    # blank rows are skipped, as by pd.read_excel
+    rows = [row for row in (_trimmed([_cell(value) for value in row]) for row in branch.rows()) if row]
+    width = max([len(header)] + [len(row) for row in rows])
+    rows = [row + [""] * (width - len(row)) for row in rows]
+    return _frame(_column_names(header + [""] * (width - len(header))), rows)
+
+
+class _BranchRows:
+    """rows of a branch collected while streaming a file (see :func:`select_branch`
+    for the rules): rows whose parent is in the branch are kept, rows whose parent
+    is out of it are dropped, the others wait for their parent"""
+
+    def __init__(self, subtree_root, max_depth):
+        self.max_depth = max_depth
+        self.position = 0
+        # depth in the branch (relative to subtree_root) of the ids of the branch
+        self.depths = {}
+        self.outside = set()
+        # parent id -> (position, id, row) of the rows waiting for their parent
+        self.pending = defaultdict(list)
+        self.kept = []
+
+        if subtree_root is None or subtree_root == 0:
+            # the root is not a row of the file
+            self.subtree_root = None
+            self.depths[0.0] = 0
+        else:
+            self.subtree_root = float(subtree_root)
+            self.outside.add(0.0)
+
+    def add_rows(self, rows, id_column, parent_column):
+        """add the next rows of the file"""
+
+        ids = as_ids([row[id_column] if len(row) > id_column else None for row in rows])
+        parents = as_ids([row[parent_column] if len(row) > parent_column else None for row in rows])
+        parents[np.isnan(parents)] = 0
+        for id, parent, row in zip(ids.tolist(), parents.tolist(), rows):
+            position = self.position
+            self.position += 1
+            if id == self.subtree_root and id not in self.depths:
+                self._keep(position, id, row, 0)
+            elif parent in self.depths:
+                self._keep(position, id, row, self.depths[parent] + 1)
+            elif parent in self.outside:
+                self._drop(id)
+            else:
+                self.pending[parent].append((position, id, row))
+
+    def _keep(self, position, id, row, depth):
+        """keep a row and the rows waiting for it"""
+
+        stack = [(position, id, row, depth)]
+        while stack:
+            position, id, row, depth = stack.pop()
+            if self.max_depth is not None and depth > self.max_depth:
+                self._drop(id)
+                continue
+            self.kept.append((position, row))
+            # rows already taken are not visited again, so that cycles end the search
+            if id not in self.depths:
+                self.depths[id] = depth
+                stack.extend((position, child, row, depth + 1) for position, child, row in self.pending.pop(id, []))
+
+    def _drop(self, id):
+        """drop the rows waiting for an id out of the branch"""
+
+        stack = [id]
+        while stack:
+            id = stack.pop()
+            if id not in self.outside and id not in self.depths:
+                self.outside.add(id)
+                stack.extend(child for _, child, _ in self.pending.pop(id, []))
+
+    def rows(self):
+        """the rows of the branch, in file order"""
+
+        if self.subtree_root is not None and self.subtree_root not in self.depths:
+            raise IDNotFoundError(f"{int(self.subtree_root)} not found in the Taxonomy")
+        return [row for _, row in sorted(self.kept, key=lambda kept: kept[0])]
+
+
+def _cell(value):
+    """value of a cell, converted as by pd.read_excel"""
+
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _trimmed(row):
+    while row and row[-1] == "":
+        row.pop()
+    return row
+
+
+def _column_names(header):
+    """names of the columns as given by pd.read_excel: blank header cells are
+    unnamed and duplicated names are numbered"""
+
+    names = []
+    used = set()
+    for position, name in enumerate(header):
+        name = f"Unnamed: {position}" if name == "" else name
+        base, count = name, 0
+        while name in used:
+            count += 1
+            name = f"{base}.{count}"
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def _frame(columns, rows):
+    """DataFrame of the rows, missing values and dtypes inferred as by pd.read_excel"""
+
+    items_df = pd.DataFrame(rows, columns=columns, dtype=object)
+    for position in range(len(columns)):
+        values = items_df.iloc[:, position].map(
+            lambda value: np.nan if isinstance(value, str) and value in NA_VALUES else value)
+        try:
+            # numbers, including numbers stored as text
+            values = pd.to_numeric(values)
+        except (ValueError, TypeError):
+            values = values.infer_objects()
+        items_df.isetitem(position, values)
+    return items_df
@@ -0,0 +1,206 @@
+from .errors import InvalidQueryError
+from collections import defaultdict
+import numpy as np
+
+# columns of the items that can be queried, meta_data keys are queried as "meta.<key>"
+QUERY_COLUMNS = ("id", "name", "level", "grouping", "score", "weight")
+QUERY_OPERATORS = ("==", "!=", "in", "<", "<=", ">", ">=")
+META_PREFIX = "meta."
+
+_EMPTY = np.zeros(0, dtype=np.int64)
+
+
+def parse_conditions(where):
+    """Convert query conditions to a list of (column, operator, value) triples.
+
+    Conditions are given either as such triples or as a dictionary mapping
+    columns to a value (``==``), a set or list of values (``in``) or an
+    ``(operator, value)`` tuple, e.g.
+    ``{"grouping": "Environmental", "meta.sector": {"Energy", "Utilities"}, "weight": (">=", 0.5)}``
+
+    :param where: conditions to parse
+    :type where: dict | list of tuple
+    :rtype: list of tuple
+    """
+
+    if where is None:
+        return []
+
+    if isinstance(where, dict):
+        conditions = []
+        for column, value in where.items():
+            if isinstance(value, (set, frozenset, list)):
+                conditions.append((column, "in", value))
+            elif isinstance(value, tuple) and len(value) == 2 and value[0] in QUERY_OPERATORS:
+                conditions.append((column, value[0], value[1]))
+            else:
+                conditions.append((column, "==", value))
+    else:
+        conditions = [tuple(condition) for condition in where]
+
+    for condition in conditions:
+        if len(condition) != 3:
+            raise InvalidQueryError(f"{condition} is not a (column, operator, value) condition")
+        column, operator, _ = condition
+        if operator not in QUERY_OPERATORS:
+            raise InvalidQueryError(f"{operator} is not a supported operator, use one of {QUERY_OPERATORS}")
+        if column not in QUERY_COLUMNS and not str(column).startswith(META_PREFIX):
+            raise InvalidQueryError(f"{column} is not a queryable column, use one of {QUERY_COLUMNS}"
+                                    + f" or {META_PREFIX}<key>")
+
+    return conditions
+
+
+class QueryIndex:
+    """Indexes answering queries over the attributes and meta_data of the items
+    of a :class:`TaxonomyLayout`.
+
+    Indexes are built per column on first use: a hash index (value -> sorted
+    positions) for ``==``, ``!=`` and ``in`` conditions and a sorted index
+    (values sorted along with their positions) for range conditions. Since the
+    layout is in DFS pre-order, restricting a result to a subtree is a binary
+    search in the sorted positions.
+
+    :param layout: flat view of the taxonomy
+    :type layout: TaxonomyLayout
+    """
+
+    def __init__(self, layout):
+        self.layout = layout
+        self._hash_indexes = {}
+        self._sorted_indexes = {}
+
+    def _values(self, column):
+        """values of a column for every item (layout order)"""
+
+        layout = self.layout
+        if column == "id":
+            return layout.ids.tolist()
+        if column == "name":
+            return layout.names
+        if column == "level":
+            return layout.levels
+        if column == "grouping":
+            return layout.groupings
+        if column == "score":
+            return layout.scores.tolist()
+        if column == "weight":
+            return layout.weights.tolist()
+
+        key = column[len(META_PREFIX):]
+        return [meta.get(key) if isinstance(meta, dict) else None for meta in layout.meta_data]
+
+    def hash_index(self, column):
+        """Get the hash index of a column (built on first use)
+
+        :returns: sorted positions of the items for every value of the column
+        :rtype: dict
+        """
+
+        index = self._hash_indexes.get(column)
+        if index is None:
+            groups = defaultdict(list)
+            for position, value in enumerate(self._values(column)):
+                groups[_key(value)].append(position)
+            index = {value: np.array(positions, dtype=np.int64) for value, positions in groups.items()}
+            self._hash_indexes[column] = index
+
+        return index
+
+    def sorted_index(self, column):
+        """Get the sorted index of a column (built on first use), missing values are left out
+
+        :returns: sorted values of the column and the positions of their items
+        :rtype: (numpy.array, numpy.array (int))
+        """
+
+        index = self._sorted_indexes.get(column)
+        if index is None:
+            pairs = [(value, position) for position, value in enumerate(self._values(column))
+                     if _key(value) is not None]
+            values = np.array([value for value, _ in pairs])
+            if values.dtype == object or len({isinstance(value, str) for value, _ in pairs}) > 1:
+                raise InvalidQueryError(f"{column} mixes values that cannot be compared")
+            positions = np.array([position for _, position in pairs], dtype=np.int64)
+
+            order = np.argsort(values, kind="stable")
+            index = (values[order], positions[order])
+            self._sorted_indexes[column] = index
+
+        return index
+
+    def select(self, column, operator, value):
+        """Get the positions of the items matching a condition
+
+        :returns: sorted positions of the matching items
+        :rtype: numpy.array (int)
+        """
+
+        if operator in ("==", "!=", "in"):
+            index = self.hash_index(column)
+            if operator == "in":
+                matches = [index[key] for key in {_key(v) for v in value} if key in index]
+                return np.sort(np.concatenate(matches)) if matches else _EMPTY
+
+            matches = index.get(_key(value), _EMPTY)
+            if operator == "==":
+                return matches
+            return np.setdiff1d(np.arange(len(self.layout), dtype=np.int64), matches, assume_unique=True)
+
+        values, positions = self.sorted_index(column)
+        if len(values) and (values.dtype.kind == "U") != isinstance(value, str):
+            raise InvalidQueryError(f"{column} values cannot be compared to {value!r}")
+        try:
+            if operator == "<":
+                matches = positions[:np.searchsorted(values, value, side="left")]
+            elif operator == "<=":
+                matches = positions[:np.searchsorted(values, value, side="right")]
+            elif operator == ">":
+                matches = positions[np.searchsorted(values, value, side="right"):]
+            else:
+                matches = positions[np.searchsorted(values, value, side="left"):]
+        except TypeError:
+            raise InvalidQueryError(f"{column} values cannot be compared to {value!r}")
+
+        return np.sort(matches)
+
+    def query(self, conditions, start=0, end=None):
+        """Get the positions of the items matching all the conditions within a range
+        of positions (the subtree of the item at position start is [start, ends[start]))
+
+        :param conditions: (column, operator, value) triples, see :func:`parse_conditions`
+        :type conditions: list of tuple
+        :param start: first position of the range
+        :type start: int
+        :param end: end of the range (default: end of the layout)
+        :type end: int
+        :returns: sorted positions of the matching items
+        :rtype: numpy.array (int)
+        """
+
+        end = len(self.layout) if end is None else end
+        result = None
+        for column, operator, value in conditions:
+            matches = self.select(column, operator, value)
+            matches = matches[np.searchsorted(matches, start):np.searchsorted(matches, end)]
+            result = matches if result is None else np.intersect1d(result, matches, assume_unique=True)
+            if len(result) == 0:
+                break
+
+        if result is None:
+            return np.arange(start, end, dtype=np.int64)
+        return result
+
+
+def _key(value):
+    """hashable version of a value (missing values, None and NaN, become None)"""
+
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, np.generic):
+        return _key(value.item())
+    if isinstance(value, list):
+        return tuple(value)
+    if isinstance(value, dict):
+        return tuple(sorted(value.items()))
+    return value
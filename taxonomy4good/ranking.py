@@ -0,0 +1,269 @@
+from .taxonomyLayout import build_layout
+import threading
+import heapq
+import numpy as np
+
+# values items are ranked by: their score, or their score multiplied by their weight
+RANKING_KEYS = ("score", "weighted")
+
+
+class _Tournament:
+    """Max and min tournament trees (segment trees) over a sequence of values,
+    answering top-k and value range queries over a range of the sequence in
+    O(log n + k log n) and updated in O(log n) per changed value. Missing values
+    (NaN) are never returned."""
+
+    def __init__(self, values):
+        self.n = len(values)
+        self.size = 1 << max(0, int(self.n - 1).bit_length())
+        self.max = np.full(2 * self.size, -np.inf)
+        self.min = np.full(2 * self.size, np.inf)
+        self.values = np.full(self.n, np.nan)
+        self.update(np.arange(self.n), values)
+
+    def update(self, leaves, values):
+        """Set the values of some leaves and update their ancestors, level by level"""
+
+        leaves = np.asarray(leaves, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        self.values[leaves] = values
+        missing = np.isnan(values)
+        nodes = leaves + self.size
+        self.max[nodes] = np.where(missing, -np.inf, values)
+        self.min[nodes] = np.where(missing, np.inf, values)
+
+        nodes = np.unique(nodes // 2)
+        nodes = nodes[nodes >= 1]
+        while len(nodes):
+            self.max[nodes] = np.maximum(self.max[2 * nodes], self.max[2 * nodes + 1])
+            self.min[nodes] = np.minimum(self.min[2 * nodes], self.min[2 * nodes + 1])
+            nodes = np.unique(nodes[nodes > 1] // 2)
+
+    def _cover(self, low, high):
+        """nodes covering exactly the leaves [low, high)"""
+
+        nodes = []
+        low = int(low) + self.size
+        high = int(high) + self.size
+        while low < high:
+            if low & 1:
+                nodes.append(low)
+                low += 1
+            if high & 1:
+                high -= 1
+                nodes.append(high)
+            low //= 2
+            high //= 2
+        return nodes
+
+    def top(self, low, high, k, largest=True):
+        """k leaves of [low, high) having the largest (or smallest) values, ties in leaf order
+
+        :rtype: list of int
+        """
+
+        # best-first search: a node is expanded only when its best value is among the k best
+        tree, sign = (self.max, -1) if largest else (self.min, 1)
+        heap = [(sign * tree[node], node) for node in self._cover(low, high)]
+        heapq.heapify(heap)
+        leaves = []
+        while heap and len(leaves) < k:
+            key, node = heapq.heappop(heap)
+            if np.isinf(key):
+                break
+            if node >= self.size:
+                leaves.append(node - self.size)
+            else:
+                heapq.heappush(heap, (sign * tree[2 * node], 2 * node))
+                heapq.heappush(heap, (sign * tree[2 * node + 1], 2 * node + 1))
+        return leaves
+
+    def between(self, low, high, min_value, max_value):
+        """leaves of [low, high) whose value is in [min_value, max_value], in leaf order
+
+        :rtype: list of int
+        """
+
+        leaves = []
+        stack = sorted(self._cover(low, high), reverse=True)
+        while stack:
+            node = stack.pop()
+            # subtrees of values entirely outside the range are pruned
+            if self.max[node] < min_value or self.min[node] > max_value:
+                continue
+            if node >= self.size:
+                if not np.isnan(self.values[node - self.size]):
+                    leaves.append(node - self.size)
+            else:
+                stack.append(2 * node + 1)
+                stack.append(2 * node)
+        return sorted(leaves)
+
+
+class ScoreIndex:
+    """Index ranking the items of a taxonomy by score (or weighted score), per
+    level and under any subtree.
+
+    Items are kept in DFS pre-order, where every subtree is a contiguous range,
+    and tournament trees over that order (one for all the items and one per
+    level of the taxonomy, i.e. depth, built on first use) return the k best or worst items of a range, or
+    the items of a range whose value is in an interval, without sorting.
+
+    Before every query the index is synchronised with the items: the fingerprint
+    of every item is compared with the one recorded at the previous
+    synchronisation, and only the subtrees whose fingerprint changed are
+    visited, so changed scores (through update_item, compute_scores or direct
+    assignments) are updated in place in O(log n) each. The index rebuilds
+    itself if the structure changed.
+
+    :param root: root item of the taxonomy
+    :type root: SustainabilityItem
+    """
+
+    def __init__(self, root):
+        self._lock = threading.Lock()
+        self._build(root)
+
+    def _build(self, root):
+        self.root = root
+        self.layout = build_layout(root)
+        self.items = self.layout.items
+        self.scores = np.array(self.layout.scores)
+        self.weights = np.array(self.layout.weights)
+        root.fingerprint
+        self._fingerprints = [item.__dict__.get("_fingerprint") for item in self.items]
+        self._groups = None
+        self._trees = {}
+
+    def _values(self, by):
+        if by == "score":
+            return self.scores
+        if by == "weighted":
+            return self.scores * self.weights
+        raise ValueError(f"{by} is not a ranking key, use one of {RANKING_KEYS}")
+
+    def _group(self, level):
+        """positions (in DFS pre-order) of the items at a depth, None for all the items"""
+
+        if level is None:
+            return np.arange(len(self.items), dtype=np.int64)
+        if self._groups is None:
+            order = np.argsort(self.layout.depths, kind="stable")
+            depths = self.layout.depths[order]
+            bounds = np.searchsorted(depths, np.arange(int(depths.max(initial=-1)) + 2))
+            self._groups = [order[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        if not 0 <= level < len(self._groups):
+            return np.zeros(0, dtype=np.int64)
+        return self._groups[level]
+
+    def _tree(self, level, by):
+        key = (level, by)
+        if key not in self._trees:
+            positions = self._group(level)
+            self._trees[key] = (positions, _Tournament(self._values(by)[positions]))
+        return self._trees[key]
+
+    def sync(self):
+        """Update the index with the scores and weights changed since the previous query"""
+
+        layout = self.layout
+        visited = []
+        changed = []
+        stack = [0]
+        while stack:
+            position = stack.pop()
+            item = self.items[position]
+            fingerprint = item.__dict__.get("_fingerprint")
+            if fingerprint is not None and fingerprint == self._fingerprints[position]:
+                continue
+            visited.append(position)
+
+            children = item.children or []
+            child_positions = layout.children_positions(position)
+            if len(children) != len(child_positions) or any(
+                    self.items[child_position] is not child
+                    for child, child_position in zip(children, child_positions)):
+                self._build(self.root)
+                return
+
+            score, weight = _as_float(item.score), _as_float(item.weight)
+            if not (_same(score, self.scores[position]) and _same(weight, self.weights[position])):
+                self.scores[position] = score
+                self.weights[position] = weight
+                changed.append(position)
+            stack.extend(child_positions.tolist())
+
+        if not visited:
+            return
+        self.root.fingerprint
+        for position in visited:
+            self._fingerprints[position] = self.items[position].__dict__.get("_fingerprint")
+
+        if changed:
+            changed = np.array(sorted(changed), dtype=np.int64)
+            for (level, by), (positions, tree) in self._trees.items():
+                leaves = np.searchsorted(positions, changed)
+                leaves = leaves[(leaves < len(positions))]
+                leaves = leaves[np.isin(positions[leaves], changed)]
+                if len(leaves):
+                    tree.update(leaves, self._values(by)[positions[leaves]])
+
+    def _leaf_range(self, positions, subtree):
+        """range of the leaves of a tree (over positions) strictly under the item subtree"""
+
+        position = 0
+        if subtree is not None:
+            position = self.layout.position(subtree.id)
+            if self.items[position] is not subtree:
+                raise ValueError(f"item {subtree.id} is not part of the taxonomy")
+        start, end = position + 1, int(self.layout.ends[position])
+        return np.searchsorted(positions, start), np.searchsorted(positions, end)
+
+    def top_k(self, k, level=None, subtree=None, by="score", largest=True):
+        """Get the k items under a subtree having the largest (or smallest) values
+
+        :param k: number of items
+        :type k: int
+        :param level: only rank the items of this level (default: all the items)
+        :type level: int
+        :param subtree: root of the subtree, which is not ranked itself (default: root of the taxonomy)
+        :type subtree: SustainabilityItem
+        :param by: score or weighted (score * weight)
+        :type by: str
+        :param largest: best (default) or worst items
+        :type largest: bool
+        :returns: items and their values, best (or worst) first, ties in DFS pre-order
+        :rtype: list of (SustainabilityItem, float)
+        """
+
+        with self._lock:
+            self.sync()
+            positions, tree = self._tree(level, by)
+            low, high = self._leaf_range(positions, subtree)
+            leaves = tree.top(low, high, k, largest)
+            return [(self.items[positions[leaf]], float(tree.values[leaf])) for leaf in leaves]
+
+    def score_range(self, min_value=None, max_value=None, level=None, subtree=None, by="score"):
+        """Get the items under a subtree whose value is in [min_value, max_value]
+
+        :returns: items and their values, largest first, ties in DFS pre-order
+        :rtype: list of (SustainabilityItem, float)
+        """
+
+        min_value = -np.inf if min_value is None else min_value
+        max_value = np.inf if max_value is None else max_value
+        with self._lock:
+            self.sync()
+            positions, tree = self._tree(level, by)
+            low, high = self._leaf_range(positions, subtree)
+            leaves = tree.between(low, high, min_value, max_value)
+            leaves.sort(key=lambda leaf: -tree.values[leaf])
+            return [(self.items[positions[leaf]], float(tree.values[leaf])) for leaf in leaves]
+
+
+def _as_float(value):
+    return np.nan if value is None else float(value)
+
+
+def _same(value, stored):
+    return value == stored or (np.isnan(value) and np.isnan(stored))
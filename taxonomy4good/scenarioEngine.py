@@ -0,0 +1,230 @@
+import numpy as np
+import pandas as pd
+
+
+class ScenarioResult:
+    """Scores computed for a batch of weight scenarios by :class:`ScenarioEngine`
+
+    :param root_scores: score of the root for every scenario, shape (K,)
+    :type root_scores: numpy.array
+    :param level_scores: score of every item of the requested level for every scenario, shape (K, m)
+    :type level_scores: numpy.array
+    :param level_ids: ids of the items of the requested level
+    :type level_ids: numpy.array
+    :param level_names: names of the items of the requested level
+    :type level_names: list of str
+    :param root_id: id of the root
+    :type root_id: int
+    :param root_name: name of the root
+    :type root_name: str
+    """
+
+    def __init__(self, root_scores, level_scores, level_ids, level_names, root_id, root_name):
+        self.root_scores = root_scores
+        self.level_scores = level_scores
+        self.level_ids = level_ids
+        self.level_names = level_names
+        self.root_id = root_id
+        self.root_name = root_name
+
+    def __len__(self):
+        return len(self.root_scores)
+
+    @classmethod
+    def concatenate(cls, results):
+        """Combine the results of several chunks of scenarios
+
+        :param results: results of the chunks, in order
+        :type results: list of ScenarioResult
+        :rtype: ScenarioResult
+        """
+
+        first = results[0]
+        return cls(root_scores=np.concatenate([result.root_scores for result in results]),
+                   level_scores=np.concatenate([result.level_scores for result in results]),
+                   level_ids=first.level_ids, level_names=first.level_names,
+                   root_id=first.root_id, root_name=first.root_name)
+
+    def summary(self, percentiles=(5, 50, 95)):
+        """Summarize the distribution of the scores over the scenarios
+
+        :param percentiles: percentiles to compute
+        :type percentiles: tuple of float
+        :returns: id, name, mean, std and percentiles of the root and level scores (root first)
+        :rtype: pd.DataFrame
+        """
+
+        values = np.column_stack([self.root_scores, self.level_scores])
+        frame = pd.DataFrame({"id": np.concatenate([[self.root_id], self.level_ids]),
+                              "name": [self.root_name] + list(self.level_names),
+                              "mean": values.mean(axis=0),
+                              "std": values.std(axis=0)})
+        for percentile, column in zip(percentiles, np.percentile(values, percentiles, axis=0)):
+            frame[f"p{percentile:g}"] = column
+
+        return frame
+
+
+class ScenarioEngine:
+    """What-if analysis of the weights of a taxonomy: computes the root and level
+    scores of many weight scenarios at once, without modifying the taxonomy.
+
+    Scores follow the rules of :meth:`SustainabilityTaxonomy.compute_scores`: the
+    score of an item is the sum of ``score * weight`` over the leaves under it
+    (the items whose children are None, see :attr:`TaxonomyLayout.is_leaf`), so
+    only the weights of leaves change the results. The leaves are laid out
+    in DFS pre-order, where the leaves under an item are a contiguous range: the
+    scores of a batch of K scenarios are differences of cumulative sums of a
+    (K, leaves) matrix of weighted scores.
+
+    Scenarios are weight matrices of shape (K, n) whose columns follow
+    :attr:`ids`, or DataFrames with item ids as columns (the current weights
+    are used for the missing items).
+
+    :param layout: flat view of the taxonomy (with its current scores and weights)
+    :type layout: TaxonomyLayout
+    """
+
+    def __init__(self, layout):
+        self.layout = layout
+        self.ids = layout.ids
+        self.base_weights = layout.weights
+
+        is_leaf = layout.is_leaf
+        self._leaves = np.flatnonzero(is_leaf)
+        # number of leaves before every position, the leaves under the item at
+        # position i are the leaves ranked [leaf_rank[i], leaf_rank[ends[i]])
+        self._leaf_rank = np.concatenate([[0], np.cumsum(is_leaf)])
+        self._is_leaf = is_leaf
+
+    def weight_matrix(self, weights):
+        """Convert scenarios to a (K, n) weight matrix whose columns follow :attr:`ids`
+
+        :param weights: one weight vector per scenario (a single vector is one scenario)
+        :type weights: numpy.array | pd.DataFrame
+        :rtype: numpy.array
+        """
+
+        return self._matrix(weights, self.base_weights, "weight")
+
+    def _matrix(self, values, base, kind):
+        """(K, n) matrix of values, items missing from a DataFrame keep their base value"""
+
+        if isinstance(values, pd.DataFrame):
+            matrix = np.tile(base, (len(values), 1))
+            positions = self.layout.positions(np.asarray(values.columns, dtype=np.int64))
+            matrix[:, positions] = values.to_numpy(dtype=np.float64)
+            return matrix
+
+        matrix = np.atleast_2d(np.asarray(values, dtype=np.float64))
+        if matrix.shape[1] != len(self.ids):
+            raise ValueError(f"{kind} vectors have {matrix.shape[1]} values, expected {len(self.ids)}"
+                             + " (one per item, in the order of ScenarioEngine.ids)")
+        return matrix
+
+    def evaluate(self, weights, level=1):
+        """Compute the scores of a batch of scenarios
+
+        :param weights: weight scenarios, see :meth:`weight_matrix`
+        :type weights: numpy.array | pd.DataFrame
+        :param level: level of the items whose scores are returned along with the root score
+        :type level: int
+        :rtype: ScenarioResult
+        """
+
+        return self._rollup(self.weight_matrix(weights), self.layout.scores, level)
+
+    def evaluate_scores(self, scores, level=1):
+        """Compute the root and level scores of a batch of score vectors (e.g. one per
+        company) with the current weights
+
+        :param scores: one score vector per row, as a (K, n) matrix whose columns follow
+                       :attr:`ids` or a DataFrame with item ids as columns (the current
+                       scores are used for the missing items)
+        :type scores: numpy.array | pd.DataFrame
+        :param level: level of the items whose scores are returned along with the root score
+        :type level: int
+        :rtype: ScenarioResult
+        """
+
+        return self._rollup(self.base_weights, self._matrix(scores, self.layout.scores, "score"), level)
+
+    def _rollup(self, weights, scores, level):
+        """roll up rows of weights and/or scores (a single vector is shared by all rows)"""
+
+        layout = self.layout
+        weights, scores = np.atleast_2d(weights), np.atleast_2d(scores)
+        rows = max(len(weights), len(scores))
+
+        contributions = weights[:, self._leaves] * scores[:, self._leaves]
+        cumulative = np.zeros((rows, len(self._leaves) + 1))
+        np.cumsum(contributions, axis=1, out=cumulative[:, 1:])
+
+        positions = np.concatenate([[0], np.flatnonzero(layout.depths == level)])
+        rolled_up = (cumulative[:, self._leaf_rank[layout.ends[positions]]]
+                     - cumulative[:, self._leaf_rank[positions]])
+        # leaves keep their raw score
+        leaves = self._is_leaf[positions]
+        rolled_up[:, leaves] = scores[:, positions[leaves]]
+
+        return ScenarioResult(root_scores=rolled_up[:, 0], level_scores=rolled_up[:, 1:],
+                              level_ids=layout.ids[positions[1:]],
+                              level_names=[layout.names[position] for position in positions[1:]],
+                              root_id=int(layout.ids[0]), root_name=layout.names[0])
+
+    def iter_evaluate(self, weights, level=1, chunk_size=1024):
+        """Compute the scores of scenarios chunk by chunk
+
+        :param weights: weight scenarios, see :meth:`weight_matrix`
+        :type weights: numpy.array | pd.DataFrame
+        :param level: level of the items whose scores are returned along with the root score
+        :type level: int
+        :param chunk_size: number of scenarios per chunk
+        :type chunk_size: int
+        :returns: one result per chunk of scenarios
+        :rtype: generator of ScenarioResult
+        """
+
+        for start in range(0, len(weights), chunk_size):
+            chunk = weights.iloc[start:start + chunk_size] if isinstance(weights, pd.DataFrame) \
+                else weights[start:start + chunk_size]
+            yield self.evaluate(chunk, level)
+
+    def iter_monte_carlo(self, n_scenarios, sampler=None, scale=0.1, seed=None, level=1, chunk_size=1024):
+        """Compute the scores of randomly perturbed weights chunk by chunk
+
+        :param n_scenarios: number of scenarios
+        :type n_scenarios: int
+        :param sampler: function (rng, base_weights, size) returning a (size, n) weight
+                        matrix (default: base weights multiplied by 1 + scale * N(0, 1) noise)
+        :type sampler: callable
+        :param scale: standard deviation of the relative noise of the default sampler
+        :type scale: float
+        :param seed: seed of the random generator
+        :type seed: int
+        :param level: level of the items whose scores are returned along with the root score
+        :type level: int
+        :param chunk_size: number of scenarios per chunk
+        :type chunk_size: int
+        :returns: one result per chunk of scenarios
+        :rtype: generator of ScenarioResult
+        """
+
+        if sampler is None:
+            def sampler(rng, base_weights, size):
+                return base_weights * (1 + scale * rng.standard_normal((size, len(base_weights))))
+
+        rng = np.random.default_rng(seed)
+        for start in range(0, n_scenarios, chunk_size):
+            size = min(chunk_size, n_scenarios - start)
+            yield self.evaluate(sampler(rng, self.base_weights, size), level)
+
+    def monte_carlo(self, n_scenarios, sampler=None, scale=0.1, seed=None, level=1, chunk_size=1024):
+        """Compute the scores of randomly perturbed weights (see :meth:`iter_monte_carlo`),
+        only the root and level scores are kept in memory
+
+        :rtype: ScenarioResult
+        """
+
+        return ScenarioResult.concatenate(list(self.iter_monte_carlo(n_scenarios, sampler, scale, seed,
+                                                                     level, chunk_size)))
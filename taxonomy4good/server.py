@@ -0,0 +1,402 @@
+"""Local HTTP service answering lookups on taxonomies loaded once, built on asyncio
+(no dependency beyond the standard library).
+
+    taxonomy4good serve eu_taxonomy clients.xlsx --port 8765
+
+Every endpoint is batched and takes a JSON body (``POST /<taxonomy>/<endpoint>``):
+
+- ``lookup``: ``{"ids": [12, 15]}``, the items having the ids (null for unknown ids)
+- ``search``: ``{"terms": ["climate"], "mode": "name" | "fuzzy", "k": 10}``, for every term the
+  first k items whose name contains it, or the k items whose name is the most similar (TF-IDF)
+- ``levels``: ``{"levels": [1, 2]}``, the items of every level
+- ``score``: ``{"scores": [{"3": 1.5, "4": 2}, ...], "level": 1}``, root and level scores of
+  every score vector (items missing from a vector keep their stored score)
+
+``GET /taxonomies`` lists the taxonomies and ``GET /stats`` the cache and coalescing
+statistics. Taxonomies are frozen when loaded, so responses are cached (LRU) and
+identical requests received while one of them is computed share its result.
+"""
+
+from .sustainabilityTaxonomy import SustainabilityTaxonomy, BUILTIN_TAXONOMIES
+from .memoization import LRUCache
+from .taxonomyLayout import _to_python
+from .errors import IDNotFoundError, EmptyTaxonomyError, InvalidQueryError
+import pandas as pd
+import numpy as np
+import threading
+import asyncio
+import json
+import os
+
+ENDPOINTS = ("lookup", "search", "levels", "score")
+SEARCH_MODES = ("name", "fuzzy")
+
+# largest accepted request body
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+    """Error returned to the client with an HTTP status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class TaxonomyServer:
+    """Taxonomies loaded once and shared by the clients of a local HTTP service.
+
+    Builtin taxonomies are loaded on their first request, custom ones are added
+    with :meth:`add_taxonomy`. All of them are frozen and their indexes built when
+    they are loaded, so that requests are answered from several threads without
+    locking.
+
+    :param taxonomies: custom taxonomies by name, as SustainabilityTaxonomy objects or
+                       taxonomy files (see :func:`taxonomy4good.cli.load_taxonomy`)
+    :type taxonomies: dict
+    :param builtin: serve the builtin taxonomies as well
+    :type builtin: bool
+    :param cache_size: number of responses kept in the cache (0 disables the cache)
+    :type cache_size: int
+    :param meta: load the meta-data of the builtin taxonomies and taxonomy files
+    :type meta: bool
+    """
+
+    def __init__(self, taxonomies=None, builtin=True, cache_size=1024, meta=False):
+        self.builtin = builtin
+        self.meta = meta
+        self._taxonomies = {}
+        self._engines = {}
+        self._loading = threading.Lock()
+        self._cache = LRUCache(cache_size) if cache_size else None
+        self._in_flight = {}
+        self.requests = 0
+        self.coalesced = 0
+
+        for name, taxonomy in (taxonomies or {}).items():
+            self.add_taxonomy(name, taxonomy)
+
+    def add_taxonomy(self, name, taxonomy):
+        """Serve a taxonomy under a name (replacing the taxonomy having this name)
+
+        :param name: name of the taxonomy in the urls
+        :type name: str
+        :param taxonomy: taxonomy, or builtin taxonomy name or path of a taxonomy file
+        :type taxonomy: SustainabilityTaxonomy | str
+        """
+
+        if not isinstance(taxonomy, SustainabilityTaxonomy):
+            from .cli import load_taxonomy
+            taxonomy = load_taxonomy(taxonomy, meta=self.meta)
+        engine = _prepare(taxonomy)
+        with self._loading:
+            self._taxonomies[name] = taxonomy
+            self._engines[name] = engine
+        if self._cache is not None:
+            self._cache.clear()
+
+    def names(self):
+        """Get the names of the taxonomies that can be requested
+
+        :rtype: list of str
+        """
+
+        names = list(self._taxonomies)
+        if self.builtin:
+            directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "taxonomies")
+            names += [name for name in BUILTIN_TAXONOMIES if name not in self._taxonomies
+                      and os.path.exists(os.path.join(directory, name + ".xlsx"))]
+        return names
+
+    def taxonomy(self, name):
+        """Get a served taxonomy, loading builtin taxonomies on their first request
+
+        :param name: name of the taxonomy
+        :type name: str
+        :rtype: SustainabilityTaxonomy
+        """
+
+        taxonomy = self._taxonomies.get(name)
+        if taxonomy is not None:
+            return taxonomy
+        if name not in self.names():
+            raise RequestError(404, f"{name} is not a served taxonomy")
+
+        # concurrent first requests load the taxonomy once
+        with self._loading:
+            if name not in self._taxonomies:
+                from .cli import load_taxonomy
+                taxonomy = load_taxonomy(name, meta=self.meta)
+                self._engines[name] = _prepare(taxonomy)
+                self._taxonomies[name] = taxonomy
+            return self._taxonomies[name]
+
+    def _engine(self, name):
+        engine = self._engines.get(name)
+        if engine is None:
+            engine = self._engines.setdefault(name, self.taxonomy(name).scenario_engine())
+        return engine
+
+    def stats(self):
+        """Get the number of requests, of coalesced requests and the statistics of the cache
+
+        :rtype: dict
+        """
+
+        return {"requests": self.requests, "coalesced": self.coalesced,
+                "cache": self._cache.info() if self._cache is not None else None,
+                "loaded": list(self._taxonomies)}
+
+    async def handle(self, method, path, body=b""):
+        """Answer a request
+
+        :param method: HTTP method (GET or POST)
+        :type method: str
+        :param path: path of the url, e.g. /eu_taxonomy/lookup
+        :type path: str
+        :param body: JSON body of the request
+        :type body: bytes
+        :returns: HTTP status and JSON response
+        :rtype: (int, bytes)
+        """
+
+        self.requests += 1
+        try:
+            parts = [part for part in path.split("?")[0].split("/") if part]
+            if parts in (["taxonomies"], ["stats"]):
+                if method != "GET":
+                    raise RequestError(405, f"use GET for /{parts[0]}")
+                payload = self.names() if parts == ["taxonomies"] else self.stats()
+                return 200, _encode(payload)
+
+            if len(parts) != 2 or parts[1] not in ENDPOINTS:
+                raise RequestError(404, f"{path} is not an endpoint, use /<taxonomy>/<{'|'.join(ENDPOINTS)}>")
+            if method != "POST":
+                raise RequestError(405, f"use POST for /{parts[1]}")
+
+            key = (parts[0], parts[1], bytes(body))
+            if self._cache is not None:
+                response = self._cache.get(key)
+                if response is not None:
+                    return 200, response
+
+            # identical requests being answered share the same result
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return 200, await asyncio.shield(future)
+
+            future = asyncio.get_running_loop().run_in_executor(None, self._respond, parts[0], parts[1], body)
+            self._in_flight[key] = future
+            try:
+                response = await asyncio.shield(future)
+            finally:
+                self._in_flight.pop(key, None)
+            if self._cache is not None:
+                self._cache.put(key, response)
+            return 200, response
+
+        except RequestError as error:
+            return error.status, _encode({"error": str(error)})
+        except (IDNotFoundError, EmptyTaxonomyError, InvalidQueryError, ValueError, TypeError) as error:
+            return 400, _encode({"error": str(error)})
+        except Exception as error:
+            return 500, _encode({"error": f"{type(error).__name__}: {error}"})
+
+    def _respond(self, name, endpoint, body):
+        """compute the JSON response of an endpoint (run in a worker thread)"""
+
+        try:
+            request = json.loads(body) if body else {}
+        except ValueError as error:
+            raise RequestError(400, f"invalid JSON body: {error}")
+        if not isinstance(request, dict):
+            raise RequestError(400, "the body must be a JSON object")
+
+        taxonomy = self.taxonomy(name)
+        if endpoint == "lookup":
+            payload = self._lookup(taxonomy, _required(request, "ids"))
+        elif endpoint == "search":
+            payload = self._search(taxonomy, _required(request, "terms"), request.get("mode", "name"),
+                                   request.get("k", 10))
+        elif endpoint == "levels":
+            payload = self._levels(taxonomy, _required(request, "levels"))
+        else:
+            payload = self._score(name, _required(request, "scores"), request.get("level", 1))
+        return _encode(payload)
+
+    def _lookup(self, taxonomy, ids):
+        layout = taxonomy._layout()
+        ids = [int(id) for id in ids]
+        known = np.isin(ids, layout.ids)
+        positions = iter(layout.positions(np.array(ids, dtype=np.int64)[known]).tolist())
+        return [item_record(layout.items[next(positions)]) if is_known else None
+                for is_known in known.tolist()]
+
+    def _search(self, taxonomy, terms, mode, k):
+        if mode not in SEARCH_MODES:
+            raise RequestError(400, f"{mode} is not a search mode, use one of {SEARCH_MODES}")
+        terms = [str(term) for term in terms]
+        if mode == "fuzzy":
+            return [[dict(item_record(item), similarity=similarity) for item, similarity in related]
+                    for related in taxonomy.related_terms(terms, k=int(k))]
+
+        layout = taxonomy._layout()
+        names = [str(name).lower() for name in layout.names]
+        return [[item_record(layout.items[position]) for position, name in enumerate(names)
+                 if term.lower() in name][:int(k)] for term in terms]
+
+    def _levels(self, taxonomy, levels):
+        layout = taxonomy._layout()
+        return {str(level): [item_record(item) for item in layout.items[layout.depths == int(level)]]
+                for level in levels}
+
+    def _score(self, name, scores, level):
+        if not all(isinstance(vector, dict) for vector in scores):
+            raise RequestError(400, "every score vector must be a JSON object")
+        engine = self._engine(name)
+        frame = pd.DataFrame([{int(id): score for id, score in vector.items()} for vector in scores],
+                             dtype=np.float64)
+        # items missing from some of the vectors keep their stored score
+        stored = engine.layout.scores[engine.layout.positions(np.asarray(frame.columns, dtype=np.int64))]
+        frame = frame.fillna(pd.Series(stored, index=frame.columns))
+        result = engine.evaluate_scores(frame, int(level))
+        return {"root": result.root_scores.tolist(),
+                "ids": result.level_ids.tolist(),
+                "names": list(result.level_names),
+                "scores": result.level_scores.tolist()}
+
+    async def _connection(self, reader, writer):
+        """answer the requests of a connection (kept alive unless the client closes it)"""
+
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    header, _, value = line.decode("latin-1").partition(":")
+                    headers[header.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0) or 0)
+                if length > MAX_BODY_SIZE:
+                    status, response = 413, _encode({"error": "request body too large"})
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, response = await self.handle(method, path, body)
+                    keep_alive = (headers.get("connection", "").lower() != "close"
+                                  and version.upper() == "HTTP/1.1")
+
+                writer.write(f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                             f"Content-Type: application/json\r\n"
+                             f"Content-Length: {len(response)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+                             + response)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8765):
+        """Start listening (port 0 picks a free port, see ``server.sockets``)
+
+        :rtype: asyncio.Server
+        """
+
+        return await asyncio.start_server(self._connection, host, port)
+
+    def serve_forever(self, host="127.0.0.1", port=8765):
+        """Listen and answer requests until interrupted"""
+
+        async def run():
+            server = await self.start(host, port)
+            async with server:
+                await server.serve_forever()
+
+        asyncio.run(run())
+
+
+def _prepare(taxonomy):
+    """freeze a taxonomy and build the indexes used by the endpoints before it is
+    served, so that the first requests do not build them concurrently
+
+    :returns: the scenario engine of the taxonomy
+    :rtype: ScenarioEngine
+    """
+
+    taxonomy.freeze()
+    engine = taxonomy.scenario_engine()
+    # the id indexes are otherwise built by the first lookups
+    for layout in (taxonomy._layout(), engine.layout):
+        layout.positions([])
+    return engine
+
+
+def item_record(item):
+    """JSON description of an item (parent and children as ids)
+
+    :param item: item to describe
+    :type item: SustainabilityItem
+    :rtype: dict
+    """
+
+    return {"id": _to_python(item.id), "name": item.name, "level": _to_python(item.level),
+            "grouping": item.grouping, "parent": item.parent.id if item.parent is not None else None,
+            "score": _to_python(item.score), "weight": _to_python(item.weight),
+            "children": [child.id for child in item.children] if item.children else None,
+            "meta_data": item.meta_data or None}
+
+
+def _required(request, field):
+    value = request.get(field)
+    if not isinstance(value, list):
+        raise RequestError(400, f"{field} must be a list")
+    return value
+
+
+def _default(value):
+    if isinstance(value, np.generic):
+        return _to_python(value)
+    if isinstance(value, (np.ndarray, set)):
+        return list(value)
+    return str(value)
+
+
+def _encode(payload):
+    return json.dumps(payload, default=_default).encode("utf-8")
+
+
+def serve(taxonomies=None, host="127.0.0.1", port=8765, builtin=True, cache_size=1024, meta=False):
+    """Serve taxonomies on a local port until interrupted (see :class:`TaxonomyServer`)
+
+    :param taxonomies: custom taxonomies by name (taxonomy objects or files)
+    :type taxonomies: dict
+    :param host: address to listen on
+    :type host: str
+    :param port: port to listen on
+    :type port: int
+    :param builtin: serve the builtin taxonomies as well
+    :type builtin: bool
+    :param cache_size: number of responses kept in the cache
+    :type cache_size: int
+    :param meta: load the meta-data of the taxonomies
+    :type meta: bool
+    """
+
+    TaxonomyServer(taxonomies, builtin, cache_size, meta).serve_forever(host, port)
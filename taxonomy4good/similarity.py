@@ -0,0 +1,270 @@
+from .errors import IDNotFoundError
+from .crosswalk import normalise_name, STOP_WORDS
+from collections import Counter
+import numpy as np
+
+# maximum number of similarities computed at once by a batch of queries
+BLOCK_SIZE = 2 ** 22
+
+_EMPTY = np.zeros(0, dtype=np.int64)
+
+
+class TfidfIndex:
+    """Sparse TF-IDF vectors of the names (and selected meta_data fields) of items,
+    answering top-k cosine similarity queries.
+
+    Terms are normalised (see :func:`taxonomy4good.crosswalk.normalise_name`) and
+    described by their words (stop words removed) and the character n-grams of
+    every word padded with spaces, so that "emission" and "emissions reduction"
+    share features. Features are weighted by their count times their smoothed
+    inverse document frequency ``log((1 + n) / (1 + df)) + 1``, and the vectors
+    are normalised so that dot products are cosine similarities.
+
+    The matrix is kept in compressed sparse column form with numpy arrays (the
+    items and weights of every feature). A batch of queries is answered by
+    gathering the columns of the features of the queries and summing their
+    products with ``numpy.bincount``, which only touches the items sharing a
+    feature with a query.
+
+    Items are added and removed incrementally: only the added items are
+    analysed, the document frequencies are updated in place and the sparse
+    arrays are reassembled (vectorized) on the next query.
+
+    :param items: items to index
+    :type items: iterable of SustainabilityItem
+    :param meta_fields: meta_data keys whose values are indexed along with the names
+    :type meta_fields: list of str
+    :param char_ngrams: length of the character n-grams (0 to only use words)
+    :type char_ngrams: int
+    """
+
+    def __init__(self, items=(), meta_fields=None, char_ngrams=3):
+        self.meta_fields = tuple(meta_fields) if meta_fields is not None else ()
+        self.char_ngrams = char_ngrams
+        self.vocabulary = {}
+        self._df = []
+        # slot -> item and (feature ids, counts), None once removed
+        self._items = []
+        self._features = []
+        self._slots = {}
+        self._matrix = None
+        self.add(items)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _analyse(self, text):
+        """feature counts of a text"""
+
+        words = normalise_name(text).split()
+        features = Counter(f"w:{word}" for word in words if word not in STOP_WORDS)
+        n = self.char_ngrams
+        if n > 0:
+            for word in words:
+                padded = f" {word} "
+                features.update(f"c:{padded[i:i + n]}" for i in range(max(1, len(padded) - n + 1)))
+        return features
+
+    def _text(self, item):
+        """indexed text of an item"""
+
+        parts = [str(item.name)]
+        if self.meta_fields and item.meta_data is not None:
+            for field in self.meta_fields:
+                value = item.meta_data.get(field)
+                # skip missing values (None and NaN)
+                if value is not None and value == value:
+                    parts.append(str(value))
+        return " ".join(parts)
+
+    def add(self, items):
+        """Index items (an item already indexed is replaced, e.g. after a rename)
+
+        :param items: items to index
+        :type items: iterable of SustainabilityItem
+        """
+
+        for item in items:
+            if item.id in self._slots:
+                self.remove([item.id])
+
+            features = self._analyse(self._text(item))
+            feature_ids = np.empty(len(features), dtype=np.int64)
+            for i, feature in enumerate(features):
+                feature_id = self.vocabulary.get(feature)
+                if feature_id is None:
+                    feature_id = self.vocabulary[feature] = len(self._df)
+                    self._df.append(0)
+                self._df[feature_id] += 1
+                feature_ids[i] = feature_id
+
+            self._slots[item.id] = len(self._items)
+            self._items.append(item)
+            self._features.append((feature_ids, np.fromiter(features.values(), dtype=np.float64,
+                                                            count=len(features))))
+        self._matrix = None
+
+    def remove(self, ids):
+        """Stop indexing items
+
+        :param ids: ids of the items to remove (ids not indexed are ignored)
+        :type ids: iterable of int
+        """
+
+        for id in ids:
+            slot = self._slots.pop(id, None)
+            if slot is None:
+                continue
+            for feature_id in self._features[slot][0]:
+                self._df[feature_id] -= 1
+            self._items[slot] = None
+            self._features[slot] = None
+        self._matrix = None
+
+        # drop the removed slots once they take most of the room
+        if len(self._items) > 2 * len(self._slots) + 64:
+            alive = [slot for slot, item in enumerate(self._items) if item is not None]
+            self._items = [self._items[slot] for slot in alive]
+            self._features = [self._features[slot] for slot in alive]
+            self._slots = {item.id: slot for slot, item in enumerate(self._items)}
+
+    def _compile(self):
+        """(items, idf, indptr, rows, weights): the normalised TF-IDF matrix by feature (built on first use)"""
+
+        matrix = self._matrix
+        if matrix is not None:
+            return matrix
+
+        alive = [slot for slot, item in enumerate(self._items) if item is not None]
+        items = np.empty(len(alive), dtype=object)
+        items[:] = [self._items[slot] for slot in alive]
+        n = len(alive)
+        df = np.asarray(self._df, dtype=np.float64)
+        idf = np.log((1 + n) / (1 + df)) + 1
+
+        if n == 0:
+            matrix = (items, idf, np.zeros(len(df) + 1, dtype=np.int64), _EMPTY, np.zeros(0))
+        else:
+            features = [self._features[slot] for slot in alive]
+            lengths = np.fromiter((len(ids) for ids, _ in features), dtype=np.int64, count=n)
+            feature_ids = np.concatenate([ids for ids, _ in features])
+            rows = np.repeat(np.arange(n, dtype=np.int64), lengths)
+            weights = np.concatenate([counts for _, counts in features]) * idf[feature_ids]
+            norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=n))
+            weights /= np.where(norms > 0, norms, 1)[rows]
+
+            order = np.argsort(feature_ids, kind="stable")
+            indptr = np.zeros(len(df) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(feature_ids, minlength=len(df)), out=indptr[1:])
+            matrix = (items, idf, indptr, rows[order], weights[order])
+
+        self._matrix = matrix
+        return matrix
+
+    def _vector(self, text, idf, n):
+        """(feature ids, weights) of the normalised TF-IDF vector of a text; features
+        missing from the index only count in the norm"""
+
+        features = self._analyse(text)
+        unseen_idf = np.log(1 + n) + 1
+        ids, weights = [], []
+        norm = 0.0
+        for feature, count in features.items():
+            feature_id = self.vocabulary.get(feature)
+            if feature_id is not None and self._df[feature_id] > 0:
+                weight = count * idf[feature_id]
+                ids.append(feature_id)
+                weights.append(weight)
+            else:
+                weight = count * unseen_idf
+            norm += weight ** 2
+
+        weights = np.asarray(weights, dtype=np.float64)
+        if norm > 0:
+            weights /= np.sqrt(norm)
+        return np.asarray(ids, dtype=np.int64), weights
+
+    def _top_k(self, vectors, k, min_similarity, exclude):
+        """best matches of every query vector (exclude: row of the index to skip per query, -1 for none)"""
+
+        items, _, indptr, rows, weights = self._compile()
+        n = len(items)
+        results = []
+        if n == 0:
+            return [[] for _ in vectors]
+
+        block = max(1, BLOCK_SIZE // n)
+        for first in range(0, len(vectors), block):
+            chunk = vectors[first:first + block]
+
+            # columns of the features of every query: (query, starts, ends, query weights)
+            query_rows = np.repeat(np.arange(len(chunk), dtype=np.int64), [len(ids) for ids, _ in chunk])
+            feature_ids = np.concatenate([ids for ids, _ in chunk] + [_EMPTY])
+            query_weights = np.concatenate([w for _, w in chunk] + [np.zeros(0)])
+            starts = indptr[feature_ids]
+            lengths = indptr[feature_ids + 1] - starts
+
+            # positions of all the gathered column entries
+            total = int(lengths.sum())
+            offsets = np.cumsum(lengths) - lengths
+            positions = np.repeat(starts - offsets, lengths) + np.arange(total, dtype=np.int64)
+
+            cells = np.repeat(query_rows, lengths) * n + rows[positions]
+            products = np.repeat(query_weights, lengths) * weights[positions]
+            scores = np.bincount(cells, weights=products, minlength=len(chunk) * n).reshape(len(chunk), n)
+
+            for i in range(len(chunk)):
+                row = scores[i]
+                skip = exclude[first + i]
+                if skip >= 0:
+                    row[skip] = 0
+                top = min(k, n)
+                best = np.argpartition(-row, top - 1)[:top]
+                best = best[np.lexsort((best, -row[best]))]
+                results.append([(items[j], float(row[j])) for j in best
+                                if row[j] > 0 and row[j] >= min_similarity])
+
+        return results
+
+    def query_terms(self, terms, k=10, min_similarity=0.0):
+        """Get the items whose indexed text is the most similar to terms
+
+        :param terms: terms to look for
+        :type terms: list of str
+        :param k: maximum number of items returned per term
+        :type k: int
+        :param min_similarity: minimum cosine similarity of the returned items
+        :type min_similarity: float
+        :returns: (item, similarity) pairs of every term, most similar first
+        :rtype: list of list of tuple
+        """
+
+        _, idf, _, _, _ = self._compile()
+        n = len(self._slots)
+        vectors = [self._vector(str(term), idf, n) for term in terms]
+        return self._top_k(vectors, k, min_similarity, [-1] * len(vectors))
+
+    def query_items(self, ids, k=10, min_similarity=0.0):
+        """Get the items whose indexed text is the most similar to the one of indexed
+        items (the items themselves are left out)
+
+        :param ids: ids of indexed items
+        :type ids: list of int
+        :param k: maximum number of items returned per item
+        :type k: int
+        :param min_similarity: minimum cosine similarity of the returned items
+        :type min_similarity: float
+        :returns: (item, similarity) pairs of every item, most similar first
+        :rtype: list of list of tuple
+        """
+
+        items, idf, _, _, _ = self._compile()
+        n = len(items)
+        missing = [id for id in ids if id not in self._slots]
+        if missing:
+            raise IDNotFoundError(f"{set(missing)} not found in the index")
+
+        # rows of the items in the compiled matrix
+        rows = {item.id: row for row, item in enumerate(items)}
+        vectors = [self._vector(self._text(self._items[self._slots[id]]), idf, n) for id in ids]
+        return self._top_k(vectors, k, min_similarity, [rows[id] for id in ids])
@@ -1,3 +1,46 @@
+from .errors import FrozenTaxonomyError
+import hashlib
+
+# attributes covered by the fingerprint of an item
+FINGERPRINT_ATTRIBUTES = ("id", "name", "level", "grouping", "score", "weight", "children", "meta_data")
+
+
+class ChildList(list):
+    """List of children of a SustainabilityItem. Changing its content invalidates
+    the fingerprint of the item owning it (and of the item ancestors)."""
+
+    def __init__(self, iterable=(), owner=None):
+        super().__init__(iterable)
+        self.owner = owner
+
+    def _changed(self):
+        # owner is not set yet while unpickling
+        owner = self.__dict__.get("owner")
+        if owner is not None:
+            owner.invalidate_fingerprint()
+
+
+def _invalidating(name):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        owner = self.__dict__.get("owner")
+        if owner is not None and owner.__dict__.get("_frozen"):
+            raise FrozenTaxonomyError(f"the children of item {owner.id} are frozen")
+        result = method(self, *args, **kwargs)
+        self._changed()
+        return result
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in ("append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse",
+              "__setitem__", "__delitem__", "__iadd__", "__imul__"):
+    setattr(ChildList, _name, _invalidating(_name))
+
+
 class SustainabilityItem:
 
     # children here must be initialized to None (leaf nodes) by default,
@@ -5,15 +48,58 @@ class SustainabilityItem:
     # IDs (fetch from file)
     def __init__(self, id, name, level=0, grouping=None, parent=None,
                  score=0, weight=1, children=None, meta_data=None):
-        self.id = id
-        self.name = name
-        self.level = level
-        self.grouping = grouping
-        self.parent = parent
-        self.score = score
-        self.weight = weight
-        self.children = children
-        self.meta_data = meta_data
+        # the attributes are set directly, the new item has no fingerprint to keep up to date
+        self.__dict__.update(id=id, name=name, level=level, grouping=grouping, parent=parent,
+                             score=score, weight=weight, children=children, meta_data=meta_data)
+
+    def __setattr__(self, name, value):
+        attributes = self.__dict__
+        if attributes.get("_frozen"):
+            raise FrozenTaxonomyError(f"item {self.id} belongs to a frozen taxonomy")
+
+        if attributes.get("_fingerprint") is None:
+            # no fingerprint (hence none above the item either) to invalidate, the
+            # children are wrapped in a ChildList when the fingerprint is computed
+            object.__setattr__(self, name, value)
+        elif name in FINGERPRINT_ATTRIBUTES:
+            if name == "children" and isinstance(value, list) and not (
+                    isinstance(value, ChildList) and value.owner is self):
+                value = ChildList(value, owner=self)
+
+            previous = self.__dict__.get(name, _MISSING)
+            object.__setattr__(self, name, value)
+
+            # the fingerprint only changes if the value does
+            if not (previous is value or (type(previous) is type(value) and _equal(previous, value))):
+                self.invalidate_fingerprint()
+        else:
+            object.__setattr__(self, name, value)
+
+    def invalidate_fingerprint(self):
+        """Mark the fingerprint of the item and of its ancestors as outdated. This is
+        done automatically when an attribute or the list of children changes, call
+        it after modifying ``meta_data`` in place."""
+
+        item = self
+        while item is not None and item.__dict__.get("_fingerprint") is not None:
+            item.__dict__["_fingerprint"] = None
+            item = item.__dict__.get("parent")
+
+    @property
+    def fingerprint(self):
+        """Merkle-style fingerprint of the subtree of the item, covering the
+        structure and the id, name, level, grouping, score, weight and meta_data of
+        every item under it. Fingerprints are cached and only the outdated ones
+        are recomputed.
+
+        :returns: 16 bytes digest
+        :rtype: bytes
+        """
+
+        fingerprint = self.__dict__.get("_fingerprint")
+        if fingerprint is None:
+            fingerprint = _compute_fingerprints(self)
+        return fingerprint
 
     def details(self):
         """prints the values of the attributes of the SustainabilityItem object"""
@@ -70,3 +156,40 @@ class SustainabilityItem:
 
 
 
+
+
+_MISSING = object()
+
+
+def _equal(a, b):
+    try:
+        return bool(a == b)
+    except Exception:
+        return False
+
+
+def _compute_fingerprints(start_item):
+    """compute the outdated fingerprints of the subtree of start_item (bottom up, no recursion)"""
+
+    stack = [(start_item, False)]
+    while stack:
+        item, expanded = stack.pop()
+        children = item.children if isinstance(item.children, list) else None
+        if children is not None and not (isinstance(children, ChildList) and children.owner is item):
+            # from now on, changing the children invalidates the fingerprint
+            children = item.__dict__["children"] = ChildList(children, owner=item)
+
+        if not expanded and children:
+            stack.append((item, True))
+            stack.extend((child, False) for child in children
+                         if child.__dict__.get("_fingerprint") is None)
+            continue
+
+        digest = hashlib.blake2b(repr((item.id, item.name, item.level, item.grouping, item.score,
+                                       item.weight, item.meta_data)).encode("utf-8"), digest_size=16)
+        if children:
+            for child in children:
+                digest.update(child.__dict__["_fingerprint"])
+        item.__dict__["_fingerprint"] = digest.digest()
+
+    return start_item.__dict__["_fingerprint"]
@@ -1,5 +1,25 @@
-from .errors import IDNotFoundError, EmptyTaxonomyError, FileTypeNotSupportedError, AuthorizationException
+from .errors import IDNotFoundError, EmptyTaxonomyError, FileTypeNotSupportedError, AuthorizationException, \
+    InvalidQueryError
 from .sustainabilityItem import SustainabilityItem
+from .taxonomySnapshot import write_snapshot, open_snapshot, SNAPSHOT_EXTENSION
+from .instrumentation import instrumented, phase, count_nodes, is_enabled
+from .taxonomyDiff import diff_taxonomies, apply_diff
+from .memoization import LRUCache, memoized, subtree_key
+from .taxonomyLayout import build_layout, to_columns, from_columns
+from concurrent.futures import ProcessPoolExecutor
+from .ancestry import AncestryIndex
+from .query import QueryIndex, parse_conditions
+from .scenarioEngine import ScenarioEngine
+from .journal import item_records, JOURNALED_ATTRIBUTES
+from .concurrency import ReadWriteLock, locked
+from .export import write_csv, write_excel, COMPRESSIONS
+from .traversal import walk, traverse
+from .similarity import TfidfIndex
+from .validation import prepare_dataframe
+from .aggregation import get_aggregation
+from .memoryUsage import taxonomy_memory_usage, MEMORY_COMPONENTS
+from .ranking import ScoreIndex
+from .partialLoading import read_branch
 import pandas as pd
 import numpy as np
 import requests
@@ -39,6 +59,14 @@ class SustainabilityTaxonomy:
                  api_key=None):
 
         self._taxonomy_name = taxonomy_name
+        self._memo = None
+        self._indexes = {}
+        self._similarity = None
+        self._structure_version = 0
+        self._dfs_storage = False
+        self._journal = None
+        self._frozen = False
+        self._lock = None
         self._host = "https://86rwxza410.execute-api.us-east-1.amazonaws.com"
         self._stage = "/sbx"
         self._resource = "/taxonomies"
@@ -141,6 +169,40 @@ class SustainabilityTaxonomy:
                 self.version_name = version_name
                 self.version_num = version_num
 
+    def __getstate__(self):
+        """State pickled (and copied) instead of the graph of linked items: the items
+        are flattened into columns (see :func:`taxonomy4good.taxonomyLayout.to_columns`),
+        which is smaller, faster and does not hit the recursion limit on deep
+        taxonomies. Caches and indexes are rebuilt on demand after unpickling and
+        the journal is detached.
+        """
+
+        state = dict(self.__dict__)
+        state["root"] = to_columns(self.root) if state.get("root") is not None else None
+        state["_memo"] = self._memo.maxsize if self._memo is not None else None
+        state["_lock"] = self._lock is not None
+        state["_journal"] = None
+        state["_indexes"] = {}
+        state["_similarity"] = None
+        return state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        columns = state.pop("root")
+        maxsize = state.pop("_memo")
+        locking = state.pop("_lock")
+        frozen = state.pop("_frozen")
+
+        self.__dict__.update(state)
+        self.root = from_columns(columns) if columns is not None else None
+        self._memo = LRUCache(maxsize) if maxsize is not None else None
+        self._lock = ReadWriteLock() if locking else None
+        self._frozen = False
+        if frozen:
+            self.freeze()
+
+    @instrumented
+    @locked("write")
     def insert_items(self, items):
         """ Insert additional items (terms/lexicons) to this existing taxonomy4good
 
@@ -169,7 +231,18 @@ class SustainabilityTaxonomy:
                 else:
                     parents[idx].children.append(item)
 
+            similarity = self._similarity
+            self.invalidate_indexes()
+            if similarity is not None:
+                # the TF-IDF index is updated instead of being rebuilt
+                similarity.add(added for item in items for added in traverse(item))
+                self._similarity = similarity
+            if self._journal is not None:
+                self._journal.record("insert", items=item_records(items))
+
     # TODO: fix big in remove function
+    @instrumented
+    @locked("write")
     def remove_subtree(self, items=None):
         """Remove the passed items along with their children from the taxonomy4good
 
@@ -179,12 +252,28 @@ class SustainabilityTaxonomy:
 
         if not isinstance(items, list) and not isinstance(items, np.ndarray):
             items = [items]
+        removed_ids = [item.id for item in items]
+
+        similarity = self._similarity
+        if similarity is not None:
+            similarity.remove([removed.id for item in items for removed in traverse(item)])
+
+        self._remove_subtree(items)
+
+        self.invalidate_indexes()
+        self._similarity = similarity
+        if self._journal is not None:
+            self._journal.record("remove", ids=removed_ids)
+
+    def _remove_subtree(self, items):
+        """recursively remove items along with their children"""
+
         # every supplied item
         for item in items:
 
             # if item is not a leaf node, perform this function on children first
             if item.children is not None:
-                self.remove_subtree(item.children)
+                self._remove_subtree(item.children)
 
             # update the parent item
             if item.parent is not None:
@@ -192,6 +281,8 @@ class SustainabilityTaxonomy:
 
             del item
 
+    @instrumented
+    @locked("write")
     def remove_by_id(self, ids):
         """Remove from the taxonomy4good items corresponding to the supplied ids
 
@@ -205,6 +296,449 @@ class SustainabilityTaxonomy:
         # remove items from taxonomy4good
         self.remove_subtree(items)
 
+    @instrumented
+    @locked("write")
+    def update_item(self, id, **attributes):
+        """Change attributes (name, level, grouping, score, weight or meta_data) of the
+        item having the specified id. Unlike setting the attributes of the item
+        directly, the change is logged in the journal of the taxonomy4good (see
+        :meth:`attach_journal`).
+
+        :param id: id of the item to update
+        :type id: int
+        :param attributes: new values of the attributes, e.g. score=3
+        :returns: the updated item
+        :rtype: SustainabilityItem
+        """
+
+        unknown = set(attributes).difference(JOURNALED_ATTRIBUTES)
+        if unknown:
+            raise ValueError(f"{unknown} cannot be updated, use one of {JOURNALED_ATTRIBUTES}")
+
+        layout = self._layout()
+        item = layout.items[layout.position(id)]
+        for attribute, value in attributes.items():
+            setattr(item, attribute, value)
+        if self._similarity is not None and ("name" in attributes or "meta_data" in attributes):
+            self._similarity.add([item])
+
+        if self._journal is not None:
+            self._journal.record("update", id=id, attributes=attributes)
+        return item
+
+    def attach_journal(self, journal):
+        """Log the following modifications of the taxonomy4good (insert_items,
+        remove_subtree, remove_by_id, update_item and merge) in a journal. A first
+        snapshot is saved if the journal is empty, use
+        :func:`taxonomy4good.journal.recover_taxonomy` to continue an existing journal.
+
+        :param journal: the journal to write to
+        :type journal: TaxonomyJournal
+        """
+
+        self._journal = journal
+        journal.attach(self)
+        if journal.is_empty():
+            journal.checkpoint(self)
+
+    def detach_journal(self):
+        """Stop logging the modifications of the taxonomy4good"""
+
+        if self._journal is not None:
+            self._journal.detach()
+        self._journal = None
+
+    def freeze(self):
+        """Make the taxonomy4good immutable so that it can be read by many threads at
+        once without locking. Scores are rolled up once and for all (compute_scores,
+        get_level_scores, print_hierarchy and summary then only read them), the
+        fingerprints and the DFS layout are precomputed, and any modification of the
+        taxonomy4good or of its items raises a FrozenTaxonomyError. The meta_data
+        dictionaries of the items must not be modified in place.
+
+        :returns: the frozen taxonomy4good
+        :rtype: SustainabilityTaxonomy
+        """
+
+        if not self._frozen and self.root is not None:
+            self._compute_scores(self.root)
+            self.root.fingerprint
+            layout = self._layout()
+            for item in layout.items:
+                item.__dict__["_frozen"] = True
+
+        self._frozen = True
+        return self
+
+    @property
+    def is_frozen(self):
+        """True if the taxonomy4good was frozen with :meth:`freeze`"""
+
+        return self._frozen
+
+    def enable_locking(self):
+        """Protect the taxonomy4good with a reader-writer lock: reading methods run
+        concurrently, while the methods modifying the taxonomy4good or rolling scores up
+        (compute_scores, get_level_scores, print_hierarchy and summary) run alone.
+        Items modified directly instead of through the methods of the taxonomy4good
+        are not protected.
+        """
+
+        if self._lock is None:
+            self._lock = ReadWriteLock()
+
+    def disable_locking(self):
+        """Stop locking the taxonomy4good"""
+
+        self._lock = None
+
+    def enable_memoization(self, maxsize=128):
+        """Cache the results of to_dataframe, taxonomy_to_dict, get_items_each_level
+        and compute_scores. A cached result is reused as long as the fingerprint of
+        the subtree it was computed from (see :attr:`SustainabilityItem.fingerprint`)
+        does not change. Results returned by taxonomy_to_dict are shared with the
+        cache and should not be modified.
+
+        :param maxsize: maximum number of cached results (least recently used ones are evicted)
+        :type maxsize: int
+        """
+
+        self._memo = LRUCache(maxsize)
+
+    def disable_memoization(self):
+        """Stop caching results and drop the cached ones"""
+
+        self._memo = None
+
+    def cache_info(self):
+        """Get the statistics of the results cache (None if memoization is disabled)
+
+        :returns: hits, misses, size and maxsize of the cache
+        :rtype: dict
+        """
+
+        return self._memo.info() if self._memo is not None else None
+
+    @instrumented
+    @locked("read")
+    def memory_usage(self, deep=True):
+        """Get the bytes used by the taxonomy4good, similarly to pandas' memory_usage:
+
+        - ``nodes``: SustainabilityItem objects, their attributes and numeric values
+        - ``names``: name and grouping strings
+        - ``meta_data``: meta_data dictionaries
+        - ``children``: children lists
+        - ``caches``: results cached by memoization
+        - ``indexes``: structural indexes, DFS storage and similarity index
+
+        Objects are counted once, in the first of these parts referencing them
+        (items stored in caches and indexes are counted in nodes). Without deep,
+        the contents of meta_data, caches and indexes are not followed.
+
+        :param deep: also count the contents of meta_data, caches and indexes
+        :type deep: bool
+        :returns: bytes used by every part, indexed by part
+        :rtype: pd.Series
+        """
+
+        return taxonomy_memory_usage(self, deep)
+
+    def invalidate_indexes(self):
+        """Drop the structural indexes (DFS layout, ancestry index, ...) so that they
+        are rebuilt on their next use. This is done by the methods modifying the
+        taxonomy, call it after adding, removing or moving SustainabilityItems directly.
+        """
+
+        self._structure_version += 1
+        self._indexes = {}
+        self._similarity = None
+
+    def _get_index(self, name, build, key=None):
+        """get a structural index, (re)building it if the taxonomy changed since it was
+        built (or if key, identifying what the index was built from, changed)"""
+
+        stamp = (self._structure_version, key)
+        entry = self._indexes.get(name)
+        if entry is None or entry[0] != stamp:
+            entry = (stamp, build())
+            self._indexes[name] = entry
+        return entry[1]
+
+    def _layout(self):
+        """flat DFS pre-order view of the whole taxonomy (cached). With DFS storage the
+        layout is also checked against the fingerprint of the root, so that direct
+        modifications of the items are picked up."""
+
+        key = self.root.fingerprint if self._dfs_storage and self.root is not None else None
+        return self._get_index("layout", lambda: build_layout(self.root), key=key)
+
+    def _similarity_index(self, meta_fields):
+        """TF-IDF index of the names and meta_fields of the items (cached, kept up to
+        date by insert_items, remove_subtree and update_item)"""
+
+        meta_fields = tuple(meta_fields) if meta_fields is not None else ()
+        similarity = self._similarity
+        if similarity is None or similarity.meta_fields != meta_fields:
+            # the root only holds the name of the taxonomy
+            similarity = TfidfIndex(self.iter_items(predicate=lambda item: item is not self.root),
+                                    meta_fields=meta_fields)
+            self._similarity = similarity
+        return similarity
+
+    def _ancestry(self):
+        layout = self._layout()
+        return self._get_index("ancestry", lambda: AncestryIndex(layout), key=layout)
+
+    def enable_dfs_storage(self):
+        """Keep the items in DFS pre-order storage, where every subtree is a contiguous
+        range. Subtrees are then extracted, counted and searched as slices of that
+        storage instead of being traversed: get_items, get_terms, count_items,
+        items_to_dict, to_dataframe, search_items_by_name and search_similar_names
+        run in O(subtree size) and return the items in DFS pre-order (parents
+        followed by their subtrees) instead of level by level.
+
+        The storage is built on first use and rebuilt when the fingerprint of the
+        root changes.
+        """
+
+        self._dfs_storage = True
+        # cached exports are ordered level by level
+        if self._memo is not None:
+            self._memo.clear()
+
+    def disable_dfs_storage(self):
+        """Go back to traversing the items (level by level) and drop the DFS storage"""
+
+        self._dfs_storage = False
+        self._indexes.pop("layout", None)
+        if self._memo is not None:
+            self._memo.clear()
+
+    def _subtree_range(self, start_root):
+        """(layout, start, end) of the subtree of start_root in the DFS storage, None if
+        the storage is disabled or start_root is not part of the taxonomy"""
+
+        if not self._dfs_storage or self.root is None:
+            return None
+        if start_root is None:
+            start_root = self.root
+
+        layout = self._layout()
+        try:
+            position = layout.position(start_root.id)
+        except IDNotFoundError:
+            return None
+        if layout.items[position] is not start_root:
+            return None
+
+        return layout, position, int(layout.ends[position])
+
+    @instrumented
+    @locked("read")
+    def is_ancestor(self, ancestor_ids, descendant_ids):
+        """Check if items sit under other items (O(1) per pair once the index is built)
+
+        :param ancestor_ids: ids of the candidate ancestors
+        :type ancestor_ids: int | list of int | numpy.array
+        :param descendant_ids: ids of the candidate descendants
+        :type descendant_ids: int | list of int | numpy.array
+        :returns: True where the first item is a (strict) ancestor of the second one
+        :rtype: bool | numpy.array (bool)
+        """
+
+        return self._ancestry().is_ancestor(ancestor_ids, descendant_ids)
+
+    @instrumented
+    @locked("read")
+    def depth(self, ids):
+        """Get the depth of items in the taxonomy (the root has depth 0)
+
+        :param ids: ids of the items
+        :type ids: int | list of int | numpy.array
+        :returns: depths of the items
+        :rtype: int | numpy.array (int)
+        """
+
+        return self._ancestry().depth(ids)
+
+    @instrumented
+    @locked("read")
+    def path_to_root(self, id):
+        """Get the ids of the items from an item up to the root (both included)
+
+        :param id: id of the item
+        :type id: int
+        :returns: ids of the item, its parent, ..., the root
+        :rtype: list of int
+        """
+
+        return self._ancestry().path_to_root(id)
+
+    @instrumented
+    @locked("read")
+    def lowest_common_ancestor(self, first_ids, second_ids):
+        """Get the lowest common ancestors of pairs of items (O(1) per pair once the
+        index is built). The LCA of an item and one of its descendants is the item itself.
+
+        :param first_ids: ids of the first items of the pairs
+        :type first_ids: int | list of int | numpy.array
+        :param second_ids: ids of the second items of the pairs
+        :type second_ids: int | list of int | numpy.array
+        :returns: ids of the lowest common ancestors
+        :rtype: int | numpy.array (int)
+        """
+
+        return self._ancestry().lowest_common_ancestor(first_ids, second_ids)
+
+    @instrumented
+    @locked("read")
+    def query(self, where=None, start_root=None, output="ids"):
+        """Find the items matching conditions on their attributes (id, name, level,
+        grouping, score, weight) and meta_data (``meta.<key>``), e.g.
+        ``query({"grouping": "Environmental", "meta.sector": {"Energy", "Utilities"}}, start_root=item)``
+
+        Conditions map a column to a value (``==``), a set or list of values (``in``)
+        or an ``(operator, value)`` tuple with operator one of ==, !=, in, <, <=, >, >=.
+        They can also be given as a list of (column, operator, value) triples.
+        Queries are answered with per column hash and sorted indexes built on first
+        use, and rebuilt when the fingerprint of the root changes.
+
+        :param where: conditions that all the returned items satisfy (default: no condition)
+        :type where: dict | list of tuple
+        :param start_root: only search the substructure of this item (default: root of the taxonomy4good)
+        :type start_root: SustainabilityItem
+        :param output: "ids", "items" or "dataframe"
+        :type output: str
+        :returns: the matching items, in DFS pre-order
+        :rtype: numpy.array (int) | list of SustainabilityItem | pd.DataFrame
+        """
+
+        if output not in ("ids", "items", "dataframe"):
+            raise InvalidQueryError(f"{output} is not a supported output, use ids, items or dataframe")
+        conditions = parse_conditions(where)
+
+        if self.root is None:
+            ids, items = np.zeros(0, dtype=np.int64), []
+        else:
+            index = self._get_index("query", lambda: QueryIndex(build_layout(self.root)),
+                                    key=self.root.fingerprint)
+            layout = index.layout
+            start, end = 0, len(layout)
+            if start_root is not None:
+                start = layout.position(start_root.id)
+                end = int(layout.ends[start])
+            positions = index.query(conditions, start, end)
+            items = layout.items[positions]
+            ids = layout.ids[positions]
+
+        if output == "ids":
+            return ids
+        if output == "items":
+            return list(items)
+        return pd.DataFrame([item.to_dict() for item in items],
+                            columns=["id", "name", "level", "grouping", "parent", "weight",
+                                     "score", "children", "meta_data"])
+
+    def _score_index(self):
+        """ranking index of the scores (cached, synchronised with the scores before every query)"""
+
+        return self._get_index("ranking", lambda: ScoreIndex(self.root), key=self.root)
+
+    def _ranked_subtree(self, subtree):
+        if subtree is None or isinstance(subtree, SustainabilityItem):
+            return subtree
+        return self.search_by_id(subtree)[0]
+
+    @instrumented
+    @locked("read")
+    def top_k(self, k, level=None, subtree=None, by="score", largest=True):
+        """Get the best (or worst) scoring items of a level or of a substructure, e.g.
+        ``top_k(5, level=2, subtree=social_item, by="weighted")``. Items are ranked
+        with an index kept up to date as scores change (see
+        :class:`taxonomy4good.ranking.ScoreIndex`), so refreshing a ranking does not
+        sort the items again. Scores are ranked as stored, call
+        :meth:`compute_scores` first to rank rolled-up scores. Items without score
+        are not ranked.
+
+        :param k: number of items
+        :type k: int
+        :param level: only rank the items of this level (default: all the levels)
+        :type level: int
+        :param subtree: only rank the items under this item or id, excluded (default: root of the taxonomy4good)
+        :type subtree: SustainabilityItem | int
+        :param by: "score" or "weighted" (score multiplied by weight)
+        :type by: str
+        :param largest: best (default) or worst items
+        :type largest: bool
+        :returns: items and their score (or weighted score), best (or worst) first
+        :rtype: list of (SustainabilityItem, float)
+        """
+
+        if self.root is None:
+            return []
+        return self._score_index().top_k(k, level, self._ranked_subtree(subtree), by, largest)
+
+    @instrumented
+    @locked("read")
+    def score_range(self, min_score=None, max_score=None, level=None, subtree=None, by="score"):
+        """Get the items of a level or of a substructure whose score (or weighted score)
+        is between min_score and max_score (included), answered with the index of
+        :meth:`top_k`
+
+        :param min_score: lowest score (default: no bound)
+        :type min_score: float
+        :param max_score: highest score (default: no bound)
+        :type max_score: float
+        :param level: only select the items of this level (default: all the levels)
+        :type level: int
+        :param subtree: only select the items under this item or id, excluded (default: root of the taxonomy4good)
+        :type subtree: SustainabilityItem | int
+        :param by: "score" or "weighted" (score multiplied by weight)
+        :type by: str
+        :returns: items and their score (or weighted score), highest first
+        :rtype: list of (SustainabilityItem, float)
+        """
+
+        if self.root is None:
+            return []
+        return self._score_index().score_range(min_score, max_score, level, self._ranked_subtree(subtree), by)
+
+    @instrumented
+    @locked("read")
+    def diff(self, other):
+        """Compute the changes between this taxonomy and another version of it
+        (items are matched by id). Identical branches are detected with subtree
+        hashes and are not visited.
+
+        :param other: the other (newer) version of the taxonomy
+        :type other: SustainabilityTaxonomy
+        :returns: added, removed, moved, renamed, reweighted, relevelled, regrouped,
+                  rescored, reannotated and reordered items
+        :rtype: TaxonomyDiff
+        """
+
+        return diff_taxonomies(self, other)
+
+    @instrumented
+    @locked("write")
+    def merge(self, diff):
+        """Apply the changes computed by :meth:`diff` to this taxonomy (in place)
+
+        :param diff: changes to apply
+        :type diff: TaxonomyDiff
+        :returns: the updated taxonomy
+        :rtype: SustainabilityTaxonomy
+        """
+
+        apply_diff(self, diff)
+        self.invalidate_indexes()
+        if self._journal is not None:
+            self._journal.record("merge", diff=diff.to_dict())
+        return self
+
+    @instrumented
+    @locked("read")
+    @memoized(copy=np.ndarray.copy)
     def get_items_each_level(self, start_root=None):
         """Get lists of items for each level of the taxonomy4good (grouped by level)
 
@@ -218,29 +752,19 @@ class SustainabilityTaxonomy:
         if start_root is None:
             start_root = self.root
 
-        # these will help iterate over the levels of the taxonomy4good
-        current_level = 0
-        current_items = np.array([start_root])
+        # level order visits the items level after level
         items = []
-        next_level_items = np.array([])
-
-        # while we did not reach the final level
-        while current_level < self.level(start_root):
-            next_level_items = np.array([])
-
-            for ci in current_items:
-                # specify next level items if current item is not leaf item
-                if ci.children is not None:
-                    next_level_items = np.concatenate(
-                        [next_level_items, ci.children])
-
-            # update the state of the iteration step and update the current items to list
-            items.append(np.array([ci for ci in current_items]))
-            current_level += 1
-            current_items = next_level_items
+        for item, depth in walk(start_root):
+            if depth == len(items):
+                items.append([])
+            items[depth].append(item)
 
+        count_nodes(sum(len(level_items) for level_items in items))
+        items = [np.array(level_items) for level_items in items]
         return np.array(items, dtype=object)
 
+    @instrumented
+    @locked("read")
     def get_level_items(self, level):
         """Get items of the specified level
 
@@ -252,6 +776,77 @@ class SustainabilityTaxonomy:
 
         return self.get_items_each_level(self.root)[level]
 
+    def _order(self, order):
+        """traversal order of the listing methods (None: the order of get_items)"""
+
+        if order is None:
+            return "dfs" if self._dfs_storage else "level"
+        return order
+
+    def iter_items(self, start_root=None, order=None, max_depth=None, predicate=None):
+        """Iterate lazily over the items of the structure. Items are yielded as they
+        are visited, so that stopping early or counting costs no list of the items.
+        The lock of the taxonomy4good (see :meth:`enable_locking`) is not held while
+        iterating: iterate over frozen taxonomies, or use get_items, when other
+        threads modify the taxonomy4good.
+
+        :param start_root: root item of the desired structure or substructure
+                           (default: root of the entire taxonomy4good)
+        :type start_root: SustainabilityItem
+        :param order: "level" (breadth first) or "dfs" (depth first pre-order)
+                      (default: the order of get_items)
+        :type order: str
+        :param max_depth: deepest level visited, start_root having depth 0 (default: no limit)
+        :type max_depth: int
+        :param predicate: only yield the items for which predicate(item) is true
+        :type predicate: callable
+        :returns: the items of the structure
+        :rtype: generator of SustainabilityItem
+        """
+
+        if start_root is None:
+            start_root = self.root
+
+        return traverse(start_root, self._order(order), max_depth, predicate)
+
+    def iter_terms(self, start_root=None, order=None, max_depth=None, predicate=None):
+        """Iterate lazily over the terms (names/lexicon) of the structure, see :meth:`iter_items`
+
+        :param start_root: root item of the desired structure or substructure
+                           (default: root of the entire taxonomy4good)
+        :type start_root: SustainabilityItem
+        :param order: "level" or "dfs" (default: the order of get_items)
+        :type order: str
+        :param max_depth: deepest level visited, start_root having depth 0 (default: no limit)
+        :type max_depth: int
+        :param predicate: only yield the terms of the items for which predicate(item) is true
+        :type predicate: callable
+        :returns: the terms of the structure
+        :rtype: generator of str
+        """
+
+        return (item.name for item in self.iter_items(start_root, order, max_depth, predicate))
+
+    def iter_ids(self, start_root=None, order=None, max_depth=None, predicate=None):
+        """Iterate lazily over the ids of the structure, see :meth:`iter_items`
+
+        :param start_root: root item of the desired structure or substructure
+                           (default: root of the entire taxonomy4good)
+        :type start_root: SustainabilityItem
+        :param order: "level" or "dfs" (default: the order of get_items)
+        :type order: str
+        :param max_depth: deepest level visited, start_root having depth 0 (default: no limit)
+        :type max_depth: int
+        :param predicate: only yield the ids of the items for which predicate(item) is true
+        :type predicate: callable
+        :returns: the ids of the structure
+        :rtype: generator of int
+        """
+
+        return (item.id for item in self.iter_items(start_root, order, max_depth, predicate))
+
+    @instrumented
+    @locked("read")
     def get_items(self, start_root=None):
         """Get all the items of the structure
 
@@ -262,14 +857,42 @@ class SustainabilityTaxonomy:
         :rtype: numpy.array (SustainabilityItem)
         """
 
+        subtree = self._subtree_range(start_root)
+        if subtree is not None:
+            layout, start, end = subtree
+            return layout.items[start:end].copy()
+
         # if no root is specified, set the root of the taxonomy4good as starting root
         if start_root is None:
             if self.root is None:
                 return np.array([])
             start_root = self.root
 
-        return np.concatenate(self.get_items_each_level(start_root))
+        items = list(self.iter_items(start_root, order="level"))
+        count_nodes(len(items))
+        return np.array(items, dtype=object)
+
+    @instrumented
+    @locked("read")
+    def count_items(self, start_root=None):
+        """Count the items of the structure
 
+        :param start_root: root item of the desired structure or substructure
+                           (default: root of the entire taxonomy4good)
+        :type start_root: SustainabilityItem
+        :returns: number of items in the structure (start_root included)
+        :rtype: int
+        """
+
+        subtree = self._subtree_range(start_root)
+        if subtree is not None:
+            _, start, end = subtree
+            return end - start
+
+        return sum(1 for _ in self.iter_items(start_root))
+
+    @instrumented
+    @locked("read")
     def get_terms(self, start_root=None):
         """Get all terms (names/lexicon) in the taxonomy4good
 
@@ -280,10 +903,15 @@ class SustainabilityTaxonomy:
         :rtype: numpy.array (str)
         """
 
-        # extract all items first, then return the name attributes
-        items = self.get_items(start_root)
-        return [item.name for item in items]
+        subtree = self._subtree_range(start_root)
+        if subtree is not None:
+            layout, start, end = subtree
+            return layout.names[start:end]
 
+        return list(self.iter_terms(start_root, order="level"))
+
+    @instrumented
+    @locked("read")
     def get_all_ids(self, start_root=None):
         """Get ids of all the nodes in the current taxonomy4good (grouped by level)
 
@@ -297,13 +925,17 @@ class SustainabilityTaxonomy:
         # if no root is specified, set the root of the taxonomy4good as starting root
         if start_root is None:
             start_root = self.root
-        items = self.get_items_each_level(start_root)
+
         ids = []
-        for level in range(len(items)):
-            ids.append([item.id for item in items[level]])
+        for item, depth in walk(start_root):
+            if depth == len(ids):
+                ids.append([])
+            ids[depth].append(item.id)
 
         return np.array(ids, dtype=object)
 
+    @instrumented
+    @locked("read")
     def search_by_id(self, ids):
         """Search for items by their id
 
@@ -314,22 +946,27 @@ class SustainabilityTaxonomy:
         """
         if isinstance(ids, int):
             ids = [ids]
-        # get the ids of current taxonomy4good nodes
-        node_ids = np.concatenate(self.get_all_ids().flatten())
 
-        # check if all ids exist in the taxonomy4good
-        if not set(ids).issubset(node_ids):
-            raise IDNotFoundError(f"{set(ids).difference(node_ids)}"
-                                  + " not found in the Taxonomy")
+        if self._dfs_storage and self.root is not None:
+            # positions are found with a binary search over the ids of the DFS storage
+            layout = self._layout()
+            return list(layout.items[layout.positions(ids)])
 
-        # get all items in taxonomy4good
-        sustainability_items = self.get_items()
+        # collect the items having one of the ids in a single traversal
+        wanted = set(ids)
+        found = {}
+        for item in self.iter_items(order="level", predicate=lambda item: item.id in wanted):
+            found.setdefault(item.id, []).append(item)
 
-        # get items with the corresponding ids
-        idx = np.concatenate([np.where(node_ids == id) for id in ids])
+        # check if all ids exist in the taxonomy4good
+        if len(found) < len(wanted):
+            raise IDNotFoundError(f"{wanted.difference(found)}"
+                                  + " not found in the Taxonomy")
 
-        return list(sustainability_items[[idx]].flatten())
+        return [item for id in ids for item in found[id]]
 
+    @instrumented
+    @locked("read")
     def level(self, start_item=None):
         """ Compute the maximum depth/level of the taxonomy4good
 
@@ -346,18 +983,20 @@ class SustainabilityTaxonomy:
         if start_item is None:
             start_item = self.root
 
-        # if root has no children, number of levels is 1
-        if start_item.children is None:
-            return 1
+        # the number of levels is the depth of the deepest item plus one
+        deepest = 0
+        count = 0
+        for _, depth in walk(start_item, order="dfs"):
+            count += 1
+            if depth > deepest:
+                deepest = depth
+        count_nodes(count)
 
-        # if current item has children, get level of children subtrees
-        for item in start_item.children:
-            lvl = self.level(item) + 1
+        return deepest + 1
 
-        # get the maximum level of children subtrees and add 1 for current root
-        return max(lvl) if isinstance(lvl, list) else lvl
-
-    def to_csv(self, filepath, start_root=None):
+    @instrumented
+    @locked("read")
+    def to_csv(self, filepath, start_root=None, chunk_size=None, compression=None):
         """Save current taxonomy4good/substructure to a csv file
 
         :param filepath: path where to save the resulting file
@@ -365,14 +1004,28 @@ class SustainabilityTaxonomy:
         :param start_root: root item of the structure or substructure to be saved as
                           csv (default: root of the entire taxonomy4good)
         :type start_root: SustainabilityItem
+        :param chunk_size: stream the items to the file chunk_size rows at a time instead of
+                           building the whole DataFrame first (default: no streaming)
+        :type chunk_size: int
+        :param compression: compress the streamed file with gzip, bz2 or xz (extension
+                            added after .csv)
+        :type compression: str
         """
         if start_root is None:
             start_root = self.root
 
+        if chunk_size is not None or compression is not None:
+            extension = f".{COMPRESSIONS[compression][1]}" if compression in COMPRESSIONS else ""
+            write_csv(self.iter_items(start_root), f"{filepath}.csv{extension}",
+                      chunk_size=chunk_size or 10_000, compression=compression)
+            return
+
         items_df = self.to_dataframe(start_root)
         items_df.to_csv(f"{filepath}.csv")
 
-    def to_excel(self, filepath, start_root=None):
+    @instrumented
+    @locked("read")
+    def to_excel(self, filepath, start_root=None, write_only=False):
         """Save current taxonomy4good/substructure to an Excel file
 
         :param filepath: path where to save the resulting file
@@ -380,14 +1033,23 @@ class SustainabilityTaxonomy:
         :param start_root: root item of the structure or substructure to be saved as
                           Excel (default: root of the entire taxonomy4good)
         :type start_root: SustainabilityItem
+        :param write_only: stream the items to a write-only workbook instead of building
+                           the whole DataFrame first
+        :type write_only: bool
         """
 
         if start_root is None:
             start_root = self.root
 
+        if write_only:
+            write_excel(self.iter_items(start_root), f"{filepath}.xlsx")
+            return
+
         items_df = self.to_dataframe(start_root)
         items_df.to_excel(f"{filepath}.xlsx")
 
+    @instrumented
+    @locked("read")
     def items_to_json(self, filepath, start_root=None):
         """Save current taxonomy4good/substructure items to a JSON file (records structure)
 
@@ -405,6 +1067,8 @@ class SustainabilityTaxonomy:
         items_df = self.to_dataframe(start_root)
         items_df.to_json(f"{filepath}.json", orient='records')
 
+    @instrumented
+    @locked("read")
     def taxonomy_to_json(self, filepath, start_root=None):
         """Save current taxonomy4good/substructure items to a JSON file (hierarchical structure)
 
@@ -424,6 +1088,21 @@ class SustainabilityTaxonomy:
         with open(f"{filepath}.json", "w") as f:
             json.dump(taxonomy_dict, f, indent=4)
 
+    @instrumented
+    @locked("read")
+    def to_snapshot(self, filepath):
+        """Save current taxonomy4good to a snapshot file that can be memory-mapped
+        (see :func:`taxonomy4good.taxonomySnapshot.open_snapshot`). Processes opening
+        the same snapshot share one copy of it and opening it requires no parsing.
+
+        :param filepath: path where to save the resulting file
+        :type filepath: str
+        """
+
+        write_snapshot(self, f"{filepath}.{SNAPSHOT_EXTENSION}")
+
+    @instrumented
+    @locked("scores")
     def print_hierarchy(self, start_item=None, current_level=0, islast=False):
         """Print the current hierarchy of the taxonomy4good with the respective values
 
@@ -448,6 +1127,9 @@ class SustainabilityTaxonomy:
             self.compute_scores(start_item, False)
             # print root
             if current_level == 0:
+                # counted once for the whole hierarchy
+                if is_enabled():
+                    count_nodes(sum(1 for _ in traverse(start_item)))
                 print(f"{start_item.name} : {start_item.score}")
                 print("│\n│")
             else:
@@ -479,15 +1161,25 @@ class SustainabilityTaxonomy:
                     self.print_hierarchy(
                         start_item.children[idx], current_level, islast)
 
-    def get_level_scores(self, level):
+    @instrumented
+    @locked("scores")
+    def get_level_scores(self, level, aggregation="sum"):
         """Compute the weighted values/scores for the specified level
 
         :param level: taxonomy4good level
         :type level: int
+        :param aggregation: how the scores of children are combined, see :meth:`compute_scores`
+        :type aggregation: str | Aggregation
         :returns: names of level items and their respective weighted values
         :rtype: dict
         """
 
+        aggregation = get_aggregation(aggregation)
+        if aggregation is not get_aggregation("sum"):
+            layout, scores = self._aggregate(self.root, aggregation)
+            return {layout.names[position]: float(scores[position])
+                    for position in np.flatnonzero(layout.depths == level)}
+
         # compute scores for the entire taxonomy4good (bottom up)
         self.compute_scores(self.root, False)
 
@@ -499,19 +1191,28 @@ class SustainabilityTaxonomy:
 
         return level_scores
 
-    def compute_scores(self, start_root=None, root_score=True):
+    @instrumented
+    @locked("scores")
+    def compute_scores(self, start_root=None, root_score=True, aggregation="sum"):
         """Compute the weighted scores for the entire taxonomy4good
 
+        The default aggregation sums the ``score * weight`` of the leaves under every
+        item. Other aggregations combine the scores of the children of every item
+        (raw scores for leaves, aggregated ones for the others):
+        ``weighted_sum`` (weights of all the children are used), ``weighted_mean``
+        (weights normalised per parent), ``mean``, ``max``, ``min``, or any
+        aggregation registered with :func:`taxonomy4good.aggregation.register_aggregation`.
+
         :param root_score: decide whether to return the score of the root, default is true
         :type root_score: bool
         :param start_root: root of taxonomy4good/substructure for which we want to compute
                             the score (default: root of the entire taxonomy4good)
         :type start_root: SustainabilityItem
+        :param aggregation: how the scores of children are combined (default: sum)
+        :type aggregation: str | Aggregation
         :returns: the weighted value/score of the root node (start_root)
         :rtype: float
         """
-        # compute the weighted scores from the attributes up to the root
-        score = 0
         if start_root is None:
             if self.root is None:
                 raise EmptyTaxonomyError("Taxonomy is empty")
@@ -519,27 +1220,106 @@ class SustainabilityTaxonomy:
             # otherwise set start root as the root of the overall taxonomy4good
             start_root = self.root
 
+        aggregation = get_aggregation(aggregation)
+        if aggregation is not get_aggregation("sum"):
+            if start_root.children is None:
+                score = start_root.score * start_root.weight
+            else:
+                score = float(self._aggregate(start_root, aggregation)[1][0])
+        # scores already rolled up and unchanged since then
+        elif self._frozen:
+            # rolled up by freeze, leaves contribute their weighted score
+            score = start_root.score * start_root.weight if start_root.children is None else start_root.score
+        elif self._memo is not None:
+            score = self._memo.get(subtree_key("compute_scores", start_root))
+            if score is None:
+                score = self._compute_scores(start_root)
+                self._memo.put(subtree_key("compute_scores", start_root), score)
+        else:
+            score = self._compute_scores(start_root)
+
+        # leaf items always return their weighted score
+        if root_score or start_root.children is None:
+            return score
+
+    def _compute_scores(self, start_root):
+        """compute (and update) the weighted scores from the leaves up to start_root"""
+
         # return weighted score if current item is leaf node
         if start_root.children is None:
+            count_nodes()
             return start_root.score * start_root.weight
 
-        # compute the weighted score for all the children of current item
-        for child in start_root.children:
-            score += self.compute_scores(child)
+        # items with children in DFS pre-order, updated in reverse so that the
+        # children are scored before their parent (no recursion)
+        parents = []
+        stack = [start_root]
+        while stack:
+            item = stack.pop()
+            parents.append(item)
+            stack.extend(child for child in item.children if child.children is not None)
+        count_nodes(1 + sum(len(item.children) for item in parents))
+
+        for item in reversed(parents):
+            # leaves contribute their weighted score, the other children their rolled up score
+            item.score = sum(child.score * child.weight if child.children is None else child.score
+                             for child in item.children)
+        return start_root.score
+
+    def _aggregate(self, start_root, aggregation):
+        """(layout, scores): scores of the substructure of start_root rolled up with an
+        aggregation (vectorized over its layout), written into the items unless the
+        taxonomy4good is frozen"""
+
+        layout = build_layout(start_root)
+        count_nodes(len(layout))
+        scores = layout.rollup_scores(aggregation=aggregation)
+
+        if not self._frozen:
+            internal = ~layout.is_leaf
+            for item, score in zip(layout.items[internal], scores[internal]):
+                item.score = float(score)
+
+        return layout, scores
+
+    @instrumented
+    @locked("read")
+    def scenario_engine(self):
+        """Create a ScenarioEngine computing the root and level scores of many weight
+        scenarios (given as a matrix or sampled for Monte Carlo analyses) in batched
+        operations. The engine works on a copy of the current scores and weights, the
+        taxonomy4good is never modified.
+
+        :returns: the scenario engine of the current taxonomy4good
+        :rtype: ScenarioEngine
+        """
+
+        if self.root is None:
+            raise EmptyTaxonomyError("Taxonomy is empty")
 
-        # update the value by the current weighted value
-        start_root.score = score
-        if root_score:
-            return score
+        return ScenarioEngine(build_layout(self.root, keep_items=False))
 
-    def summary(self):
-        """Print the general information about the entire taxonomy4good"""
+    @instrumented
+    @locked("scores")
+    def summary(self, aggregation="sum"):
+        """Print the general information about the entire taxonomy4good
+
+        :param aggregation: how the scores of children are combined, see :meth:`compute_scores`
+        :type aggregation: str | Aggregation
+        """
 
         if self.root is None:
             print("The taxonomy4good is empty")
         else:
             print(f"Number of Sustainability items: {self.get_items().size}")
-            root_score = self.compute_scores(self.root, True)
+            aggregation = get_aggregation(aggregation)
+            if aggregation is get_aggregation("sum"):
+                root_score = self.compute_scores(self.root, True)
+                top_level_scores = [item.score for item in self.root.children or []]
+            else:
+                layout, scores = self._aggregate(self.root, aggregation)
+                root_score = float(scores[0])
+                top_level_scores = [float(scores[position]) for position in layout.children_positions(0)]
             print(f"Overall weighted score: {root_score}")
             print(f"Number of levels : {self.level()}")
 
@@ -547,8 +1327,11 @@ class SustainabilityTaxonomy:
                 top_level_name = [child.name for child in self.root.children]
                 print(f"Top level items are {top_level_name}")
                 print(
-                    f"Top level items scores: {[item.score for item in self.root.children]}")
+                    f"Top level items scores: {top_level_scores}")
 
+    @instrumented
+    @locked("read")
+    @memoized(copy=pd.DataFrame.copy)
     def to_dataframe(self, start_root=None):
         """Convert the entire taxonomy4good to a DataFrame
 
@@ -565,6 +1348,8 @@ class SustainabilityTaxonomy:
         items = self.items_to_dict(start_root)
         return pd.DataFrame(items)
 
+    @instrumented
+    @locked("read")
     def similar_items(self, sustainability_items):
         """Gives the items under the same parent
 
@@ -591,6 +1376,8 @@ class SustainabilityTaxonomy:
 
         return similar_items
 
+    @instrumented
+    @locked("read")
     def similar_items_byid(self, ids):
         """Gives the items under the same parent as items having the specified ids
 
@@ -605,6 +1392,58 @@ class SustainabilityTaxonomy:
             sustainability_items = sustainability_items[0]
         return self.similar_items(sustainability_items)
 
+    @instrumented
+    @locked("read")
+    def related_terms(self, terms, k=10, min_similarity=0.0, meta_fields=None):
+        """Find the items related to terms across the entire taxonomy4good, ranked by the
+        cosine similarity of TF-IDF vectors of words and character n-grams (see
+        :class:`taxonomy4good.similarity.TfidfIndex`). The index is built on first use
+        and updated incrementally when items are inserted, removed or updated.
+
+        :param terms: term or list of terms to look for
+        :type terms: str | list of str
+        :param k: maximum number of items returned per term
+        :type k: int
+        :param min_similarity: minimum cosine similarity of the returned items
+        :type min_similarity: float
+        :param meta_fields: meta_data keys whose values are indexed along with the names
+        :type meta_fields: list of str
+        :returns: (item, similarity) pairs, most similar first (one list per term if
+                  a list of terms is given)
+        :rtype: list of tuple | list of list of tuple
+        """
+
+        single = isinstance(terms, str)
+        index = self._similarity_index(meta_fields)
+        related = index.query_terms([terms] if single else list(terms), k, min_similarity)
+        return related[0] if single else related
+
+    @instrumented
+    @locked("read")
+    def related_items(self, ids, k=10, min_similarity=0.0, meta_fields=None):
+        """Find the items related to items of the taxonomy4good (anywhere in the
+        taxonomy4good, unlike similar_items), see :meth:`related_terms`
+
+        :param ids: id or list of ids of the items
+        :type ids: int | list of int
+        :param k: maximum number of items returned per item
+        :type k: int
+        :param min_similarity: minimum cosine similarity of the returned items
+        :type min_similarity: float
+        :param meta_fields: meta_data keys whose values are indexed along with the names
+        :type meta_fields: list of str
+        :returns: (item, similarity) pairs, most similar first (one list per item if
+                  a list of ids is given)
+        :rtype: list of tuple | list of list of tuple
+        """
+
+        single = np.ndim(ids) == 0
+        index = self._similarity_index(meta_fields)
+        related = index.query_items([ids] if single else list(ids), k, min_similarity)
+        return related[0] if single else related
+
+    @instrumented
+    @locked("read")
     def search_items_by_name(self, terms, start_root=None):
         """Look for similar SustainabilityItems using a string partial match
 
@@ -623,19 +1462,30 @@ class SustainabilityTaxonomy:
         if not isinstance(terms, list):
             terms = [terms]
 
-        # get all items start from start_root
-        items = self.get_items(start_root)
-        items_found = []
+        subtree = self._subtree_range(start_root)
+        if subtree is not None:
+            # only the range of the subtree is searched
+            layout, start, end = subtree
+            names = [name.lower() for name in layout.names[start:end]]
+            items = layout.items[start:end]
+            items_found = [[items[i] for i, name in enumerate(names) if term.lower() in name]
+                           for term in terms]
+        else:
+            # get all items start from start_root
+            items = self.get_items(start_root)
+            items_found = []
 
-        # check if terms are substrings of the name attribute in terms
-        for term in terms:
-            items_found.append([item for item in items
-                                if term.lower() in item.name.lower()])
+            # check if terms are substrings of the name attribute in terms
+            for term in terms:
+                items_found.append([item for item in items
+                                    if term.lower() in item.name.lower()])
 
         if len(items_found) == 1:
             items_found = sum(items_found, [])
         return items_found
 
+    @instrumented
+    @locked("read")
     def search_similar_names(self, terms, start_root=None):
         """Search for similar names/terms in the taxonomy4good using a string partial match
 
@@ -652,20 +1502,31 @@ class SustainabilityTaxonomy:
 
         if not isinstance(terms, list):
             terms = [terms]
-        # get all items start from start_root
-        items = self.get_items(start_root)
-        items_found = []
+        subtree = self._subtree_range(start_root)
+        if subtree is not None:
+            # only the range of the subtree is searched
+            layout, start, end = subtree
+            names = layout.names[start:end]
+            lower_names = [name.lower() for name in names]
+            items_found = [[names[i] for i, name in enumerate(lower_names) if term.lower() in name]
+                           for term in terms]
+        else:
+            # get all items start from start_root
+            items = self.get_items(start_root)
+            items_found = []
 
-        # check if terms are substrings of the name attribute in terms
-        for term in terms:
-            items_found.append([item.name for item in items
-                                if term.lower() in item.name.lower()])
+            # check if terms are substrings of the name attribute in terms
+            for term in terms:
+                items_found.append([item.name for item in items
+                                    if term.lower() in item.name.lower()])
 
         if len(items_found) == 1:
             items_found = sum(items_found, [])
 
         return items_found
 
+    @instrumented
+    @locked("read")
     def items_to_dict(self, start_root=None):
         """Convert the entire taxonomy4good to a dictionary (records) starting from start_root
 
@@ -679,13 +1540,12 @@ class SustainabilityTaxonomy:
         if start_root is None:
             start_root = self.root
 
-        # get all items in the taxonomy4good starting from start_root
-        sustainability_items = self.get_items(start_root)
-
-        # convert each item to a dictionary
-        dict_items = [item.to_dict() for item in sustainability_items]
-        return dict_items
+        # convert each item to a dictionary, in the order of get_items
+        return [item.to_dict() for item in self.iter_items(start_root)]
 
+    @instrumented
+    @locked("read")
+    @memoized()
     def taxonomy_to_dict(self, start_root=None):
         """Convert the entire taxonomy4good to a dictionary (structural hierarchy)
         starting from start_root
@@ -699,14 +1559,22 @@ class SustainabilityTaxonomy:
         if start_root is None:
             start_root = self.root
 
+        # counted once rather than by every recursive call
+        if is_enabled():
+            count_nodes(sum(1 for _ in traverse(start_root)))
+        return self._taxonomy_to_dict(start_root)
+
+    def _taxonomy_to_dict(self, start_root):
+        """recursively convert the substructure of start_root to a dictionary"""
+
         if start_root.children is None:
             return [start_root.to_dict()]
 
         # this makes sure to avoid unnecessary [] if there is only a single child
         if len(start_root.children) == 1:
-            dict_builder = self.taxonomy_to_dict(start_root.children[0])
+            dict_builder = self._taxonomy_to_dict(start_root.children[0])
         else:
-            dict_builder = [self.taxonomy_to_dict(
+            dict_builder = [self._taxonomy_to_dict(
                 child) for child in start_root.children]
 
         root_dict = start_root.to_dict()
@@ -716,7 +1584,9 @@ class SustainabilityTaxonomy:
         return root_dict
 
 
-def from_file(filepath, version_name="Standard Taxonomy", version_num="0.1.0", filetype='excel', meta=False):
+@instrumented
+def from_file(filepath, version_name="Standard Taxonomy", version_num="0.1.0", filetype='excel', meta=False,
+              validation="strict", subtree_root=None, max_depth=None):
     """Create a taxonomy from existing file. This can be a builtin taxonomy in taxonomy4good or a newly created one.
 
     :param filepath: the path of the file describing the structure of taxonomy or the name of builtin taxonomy.
@@ -729,40 +1599,203 @@ def from_file(filepath, version_name="Standard Taxonomy", version_num="0.1.0", f
     :type filetype: str
     :param meta: indicating if the file include meta-data
     :type meta: bool
+    :param validation: strict (raise a TaxonomyValidationError listing the duplicated ids,
+                       orphans, cycles and inconsistent children lists), repair (fix them)
+                       or off (no validation, ids must match row positions)
+    :type validation: str
+    :param subtree_root: only load the branch headed by the item having this id, attached to
+                         the root (default: the whole taxonomy). The branch is found from the id
+                         and parent columns and only its rows are converted, validated and linked,
+                         so time and memory after reading the file scale with the branch.
+    :type subtree_root: int
+    :param max_depth: only load the items down to this depth below subtree_root (or below the
+                      root), the items at max_depth having no children (default: no limit)
+    :type max_depth: int
 
     :returns: create taxonomy from the indicated file
     :rtype: SustainabilityTaxonomy
     """
+    with phase("from_file.read"):
+        if filetype == 'excel':
+            # if the name corresponds to one of the existing taxonomies, get file from taxonomies directory
+            if filepath in BUILTIN_TAXONOMIES:
+                version_name = TAXONOMIES_DESC[filepath]
+                filepath = os.path.dirname(os.path.abspath(__file__)) + "/taxonomies/" + filepath + ".xlsx"
+
+        if subtree_root is not None or max_depth is not None:
+            items_df = read_branch(filepath, filetype, subtree_root, max_depth)
+        elif filetype == 'excel':
+            items_df = pd.read_excel(filepath)
+        elif filetype == 'json':
+            items_df = pd.read_json(filepath)
+        else:
+            raise FileTypeNotSupportedError(
+                f"{filetype} is currently not supported")
+
+    return from_dataframe(items_df, version_name, version_num, meta, validation)
+
+
+def from_dataframe(items_df, version_name="Standard Taxonomy", version_num="0.1.0", meta=False,
+                   validation="strict"):
+    """Create a taxonomy from a DataFrame having the structure of the files read by
+    :func:`from_file` (one row per item, the root excluded)
+
+    :param items_df: items of the taxonomy (modified in place)
+    :type items_df: pd.DataFrame
+    :param version_name: the name of the taxonomy
+    :type version_name: str
+    :param version_num: the number of the taxonomy version
+    :type version_num: str
+    :param meta: indicating if the DataFrame include meta-data columns
+    :type meta: bool
+    :param validation: strict, repair or off (see :func:`from_file`)
+    :type validation: str
+
+    :returns: create taxonomy from the DataFrame
+    :rtype: SustainabilityTaxonomy
+    """
+
     root = SustainabilityItem(id=0, name=version_name)
 
-    if filetype == 'excel':
-        # if the name corresponds to one of the existing taxonomies, get file from taxonomies directory
-        if filepath in BUILTIN_TAXONOMIES:
-            root.name = TAXONOMIES_DESC[filepath]
-            items_df = pd.read_excel(os.path.dirname(os.path.abspath(
-                __file__)) + "/taxonomies/" + filepath + ".xlsx")
-            version_name = TAXONOMIES_DESC[filepath]
+    with phase("from_file.normalise"):
+        items_df.replace({np.nan: None}, inplace=True)
+
+        # Consider any additional columns as meta-data
+        all_columns = [c.lower() for c in items_df.columns]
+
+        meta_data_col = [col for col in all_columns
+                         if col not in ["id", "name", "level", "grouping",
+                                        "parent", "score", "weight", "children"]]
+        items_df.columns = all_columns
+
+    with phase("from_file.validate"):
+        items_df, report = prepare_dataframe(items_df, validation)
+        if report is not None and not report.is_valid():
+            logging.warning(f"{len(report)} structural issues repaired: {report!r}")
+        records = items_df.to_dict('records')
+
+    with phase("from_file.link"):
+        if validation == "off":
+            items = _link_items(root, records, meta_data_col, meta)
         else:
-            items_df = pd.read_excel(filepath)
-    elif filetype == 'json':
-        items_df = pd.read_json(filepath)
+            items = _link_records(root, records, meta_data_col, meta)
+        count_nodes(len(items))
+
+    return SustainabilityTaxonomy(items[0], version_name, version_num)
+
+
+def from_files(filepaths, workers=None, version_names=None, version_num="0.1.0", filetype='excel',
+               meta=False, snapshot_dir=None, validation="strict"):
+    """Create taxonomies from many files, parsing them in parallel in a pool of processes.
+
+    Workers do not send the taxonomies back as linked SustainabilityItems, which
+    are slow to transfer, but as flat layouts that are linked again in this
+    process. With snapshot_dir, workers save the taxonomies as snapshot files
+    instead, which are memory-mapped without any parsing (see
+    :meth:`SustainabilityTaxonomy.to_snapshot`).
+
+    :param filepaths: paths of the files describing the structure of the taxonomies (or builtin taxonomy names)
+    :type filepaths: list of str
+    :param workers: number of processes (default: number of processors)
+    :type workers: int
+    :param version_names: names of the taxonomies, in the order of the files (default: Standard Taxonomy)
+    :type version_names: list of str
+    :param version_num: the number of the taxonomy versions
+    :type version_num: str
+    :param filetype: the type of the files (excel or json)
+    :type filetype: str
+    :param meta: indicating if the files include meta-data
+    :type meta: bool
+    :param snapshot_dir: directory where to save snapshots of the taxonomies (default: no snapshot)
+    :type snapshot_dir: str
+    :param validation: strict, repair or off (see :func:`from_file`)
+    :type validation: str
+
+    :returns: one taxonomy per file, in the order of the files
+    :rtype: list of SustainabilityTaxonomy | list of TaxonomySnapshot
+    """
+
+    if version_names is None:
+        version_names = ["Standard Taxonomy"] * len(filepaths)
+    elif len(version_names) != len(filepaths):
+        raise ValueError(f"{len(version_names)} version names given for {len(filepaths)} files")
+
+    tasks = []
+    for i, (filepath, version_name) in enumerate(zip(filepaths, version_names)):
+        snapshot_path = None
+        if snapshot_dir is not None:
+            name = os.path.splitext(os.path.basename(filepath))[0]
+            snapshot_path = os.path.join(snapshot_dir, f"{i}_{name}.{SNAPSHOT_EXTENSION}")
+        tasks.append((filepath, version_name, version_num, filetype, meta, snapshot_path, validation))
+
+    if workers == 1 or len(tasks) <= 1:
+        results = [_load_file(task) for task in tasks]
     else:
-        raise FileTypeNotSupportedError(
-            f"{filetype} is currently not supported")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_load_file, tasks))
 
-    items_df.replace({np.nan: None}, inplace=True)
+    if snapshot_dir is not None:
+        return [open_snapshot(snapshot_path) for snapshot_path in results]
 
-    items = [root]
+    return [SustainabilityTaxonomy(layout.to_items(), taxonomy_name, version_name, version_num)
+            for layout, (taxonomy_name, version_name, version_num) in results]
+
+
+def builtin_memory_usage(deep=True, meta=False, indexes=False):
+    """Get the memory footprint of every builtin taxonomy (see
+    :meth:`SustainabilityTaxonomy.memory_usage`), e.g. to size the processes
+    holding them or to track the cost of new indexes. Builtin taxonomies whose
+    file is not shipped are skipped.
+
+    :param deep: also count the contents of meta_data, caches and indexes
+    :type deep: bool
+    :param meta: load the taxonomies with their meta-data
+    :type meta: bool
+    :param indexes: build the DFS, ancestry, query and similarity indexes before measuring
+    :type indexes: bool
+    :returns: items and bytes used by every part (and in total) of every taxonomy, indexed by name
+    :rtype: pd.DataFrame
+    """
+
+    directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "taxonomies")
+    rows = {}
+    for name in BUILTIN_TAXONOMIES:
+        if not os.path.exists(os.path.join(directory, name + ".xlsx")):
+            continue
+        taxonomy = from_file(name, meta=meta)
+        if indexes:
+            taxonomy.depth(taxonomy.root.id)
+            taxonomy.query({"level": 1})
+            taxonomy.related_terms(taxonomy.root.name)
+        usage = taxonomy.memory_usage(deep)
+        rows[name] = {"items": taxonomy.count_items(), **usage.to_dict(), "total": int(usage.sum())}
+
+    return pd.DataFrame.from_dict(rows, orient="index", columns=["items"] + MEMORY_COMPONENTS + ["total"])
 
-    # Consider any additional columns as meta-data
-    all_columns = [c.lower() for c in items_df.columns]
 
-    meta_data_col = [col for col in all_columns
-                     if col not in ["id", "name", "level", "grouping",
-                                    "parent", "score", "weight", "children"]]
-    items_df.columns = all_columns
+def _load_file(task):
+    """load one file of from_files (run in a worker process), returns the path of its
+    snapshot or its flat layout along with its names"""
+
+    filepath, version_name, version_num, filetype, meta, snapshot_path, validation = task
+    taxonomy = from_file(filepath, version_name, version_num, filetype, meta, validation)
+
+    if snapshot_path is not None:
+        write_snapshot(taxonomy, snapshot_path)
+        return snapshot_path
+
+    return build_layout(taxonomy.root, keep_items=False), (taxonomy._taxonomy_name, taxonomy.version_name,
+                                                           taxonomy.version_num)
+
+
+def _link_items(root, records, meta_data_col, meta):
+    """Create the SustainabilityItems of the records read by from_file and link
+    them to their parents and children"""
+
+    items = [root]
+
     # create sustainability items
-    for item in items_df.to_dict('records'):
+    for item in records:
         # create item with respective attributes
         if meta:
             meta_dict = {key: item[key] for key in meta_data_col}
@@ -803,4 +1836,43 @@ def from_file(filepath, version_name="Standard Taxonomy", version_num="0.1.0", f
 
         items.append(sustainability_item)
 
-    return SustainabilityTaxonomy(items[0], version_name, version_num)
+    return items
+
+
+def _link_records(root, records, meta_data_col, meta):
+    """Create the SustainabilityItems of validated records (see
+    :func:`taxonomy4good.validation.prepare_dataframe`) and link them by id"""
+
+    items = [root]
+    items_by_id = {0: root}
+
+    for item in records:
+        if meta:
+            meta_dict = {key: item[key] for key in meta_data_col}
+        else:
+            meta_dict = {}
+        sustainability_item = SustainabilityItem(id=item['id'],
+                                                 name=item['name'],
+                                                 level=item['level'],
+                                                 grouping=item['grouping'],
+                                                 score=item['score'],
+                                                 weight=item['weight'],
+                                                 meta_data=meta_dict)
+        items_by_id[int(item['id'])] = sustainability_item
+        items.append(sustainability_item)
+
+    root_children = []
+    for item, sustainability_item in zip(records, items[1:]):
+        # items without parent are children of the root
+        if item['parent'] is None:
+            sustainability_item.parent = root
+            root_children.append(sustainability_item)
+        else:
+            sustainability_item.parent = items_by_id[item['parent']]
+        if item['children'] is not None:
+            sustainability_item.children = [items_by_id[int(child)] for child in item['children']]
+
+    if root_children:
+        root.children = root_children
+
+    return items
@@ -0,0 +1,324 @@
+from .sustainabilityItem import SustainabilityItem
+from collections import defaultdict
+import pandas as pd
+import numpy as np
+
+
+class TaxonomyDiff:
+    """Differences between two versions of a taxonomy, as computed by
+    :meth:`SustainabilityTaxonomy.diff`. Items are matched by id.
+
+    :param added: records of the items only found in the new version (parents listed before their children)
+    :type added: list of dict
+    :param removed: records of the items only found in the old version
+    :type removed: list of dict
+    :param moved: items having a different parent (id, old_parent, new_parent, old_level, new_level)
+    :type moved: list of dict
+    :param renamed: items having a different name (id, old_name, new_name)
+    :type renamed: list of dict
+    :param reweighted: items having a different weight (id, old_weight, new_weight)
+    :type reweighted: list of dict
+    :param relevelled: items that were not moved but have a different level, e.g. the
+                       descendants of moved items (id, old_level, new_level)
+    :type relevelled: list of dict
+    :param regrouped: items having a different grouping (id, old_grouping, new_grouping)
+    :type regrouped: list of dict
+    :param rescored: items having a different score (id, old_score, new_score)
+    :type rescored: list of dict
+    :param reannotated: items having different meta_data (id, old_meta_data, new_meta_data)
+    :type reannotated: list of dict
+    :param reordered: items whose children would not be in the order of the new version
+                      once the other changes are applied (id, old_children, new_children)
+    :type reordered: list of dict
+    """
+
+    def __init__(self, added=None, removed=None, moved=None, renamed=None, reweighted=None, relevelled=None,
+                 regrouped=None, rescored=None, reannotated=None, reordered=None):
+        self.added = added if added is not None else []
+        self.removed = removed if removed is not None else []
+        self.moved = moved if moved is not None else []
+        self.renamed = renamed if renamed is not None else []
+        self.reweighted = reweighted if reweighted is not None else []
+        self.relevelled = relevelled if relevelled is not None else []
+        self.regrouped = regrouped if regrouped is not None else []
+        self.rescored = rescored if rescored is not None else []
+        self.reannotated = reannotated if reannotated is not None else []
+        self.reordered = reordered if reordered is not None else []
+
+    def __repr__(self):
+        return (f"TaxonomyDiff(added={len(self.added)}, removed={len(self.removed)}, "
+                f"moved={len(self.moved)}, renamed={len(self.renamed)}, "
+                f"reweighted={len(self.reweighted)}, relevelled={len(self.relevelled)}, "
+                f"regrouped={len(self.regrouped)}, rescored={len(self.rescored)}, "
+                f"reannotated={len(self.reannotated)}, reordered={len(self.reordered)})")
+
+    def __len__(self):
+        return sum(len(changes) for changes in self.to_dict().values())
+
+    def is_empty(self):
+        """Check if both versions are identical"""
+
+        return len(self) == 0
+
+    def to_dict(self):
+        """Get the lists of changes, by kind of change (the keyword arguments of TaxonomyDiff)
+
+        :rtype: dict
+        """
+
+        return {"added": self.added, "removed": self.removed, "moved": self.moved,
+                "renamed": self.renamed, "reweighted": self.reweighted, "relevelled": self.relevelled,
+                "regrouped": self.regrouped, "rescored": self.rescored, "reannotated": self.reannotated,
+                "reordered": self.reordered}
+
+    def to_dataframe(self):
+        """Convert the differences to a DataFrame (one row per change)
+
+        :returns: change, id, name, old and new values of every change
+        :rtype: pd.DataFrame
+        """
+
+        rows = [{"change": "added", "id": r["id"], "name": r["name"], "old": None, "new": r["parent"]}
+                for r in self.added]
+        rows += [{"change": "removed", "id": r["id"], "name": r["name"], "old": r["parent"], "new": None}
+                 for r in self.removed]
+        rows += [{"change": "moved", "id": r["id"], "name": r["name"], "old": r["old_parent"],
+                  "new": r["new_parent"]} for r in self.moved]
+        rows += [{"change": "renamed", "id": r["id"], "name": r["new_name"], "old": r["old_name"],
+                  "new": r["new_name"]} for r in self.renamed]
+        rows += [{"change": "reweighted", "id": r["id"], "name": r["name"], "old": r["old_weight"],
+                  "new": r["new_weight"]} for r in self.reweighted]
+        rows += [{"change": "relevelled", "id": r["id"], "name": r["name"], "old": r["old_level"],
+                  "new": r["new_level"]} for r in self.relevelled]
+        for change, attribute in [("regrouped", "grouping"), ("rescored", "score"),
+                                  ("reannotated", "meta_data"), ("reordered", "children")]:
+            rows += [{"change": change, "id": r["id"], "name": r["name"], "old": r[f"old_{attribute}"],
+                      "new": r[f"new_{attribute}"]} for r in getattr(self, change)]
+
+        return pd.DataFrame(rows, columns=["change", "id", "name", "old", "new"])
+
+
+def _parent_id(item):
+    return item.parent.id if item.parent is not None else None
+
+
+def _record(item):
+    return {"id": item.id, "name": item.name, "level": item.level, "grouping": item.grouping,
+            "parent": _parent_id(item), "score": item.score, "weight": item.weight,
+            "meta_data": dict(item.meta_data) if item.meta_data is not None else None}
+
+
+def _subtrees(items):
+    """all the items under the given ones (included), by id, parents first"""
+
+    region = {}
+    stack = list(reversed(items))
+    while stack:
+        item = stack.pop()
+        region[item.id] = item
+        if item.children:
+            stack.extend(reversed(item.children))
+    return region
+
+
+def _differs(old_value, new_value):
+    """check if two attribute values differ (missing values being equal)"""
+
+    missing = pd.isna(old_value), pd.isna(new_value)
+    if np.ndim(missing[0]) == 0 and np.ndim(missing[1]) == 0 and (missing[0] or missing[1]):
+        return not (missing[0] and missing[1])
+    return old_value != new_value
+
+
+def _children_ids(item):
+    return [child.id for child in item.children] if item.children is not None else None
+
+
+def _compare(old_item, new_item, diff):
+    """record the differences between two matched items (the name of the root is
+    the version name of the taxonomy, it is not compared)"""
+
+    if old_item.parent is not None and _parent_id(old_item) != _parent_id(new_item):
+        diff.moved.append({"id": new_item.id, "name": new_item.name,
+                           "old_parent": _parent_id(old_item), "new_parent": _parent_id(new_item),
+                           "old_level": old_item.level, "new_level": new_item.level})
+    elif _differs(old_item.level, new_item.level):
+        diff.relevelled.append({"id": new_item.id, "name": new_item.name,
+                                "old_level": old_item.level, "new_level": new_item.level})
+    if old_item.parent is not None and old_item.name != new_item.name:
+        diff.renamed.append({"id": new_item.id, "old_name": old_item.name, "new_name": new_item.name})
+    if old_item.weight != new_item.weight:
+        diff.reweighted.append({"id": new_item.id, "name": new_item.name,
+                                "old_weight": old_item.weight, "new_weight": new_item.weight})
+    if _differs(old_item.grouping, new_item.grouping):
+        diff.regrouped.append({"id": new_item.id, "name": new_item.name,
+                               "old_grouping": old_item.grouping, "new_grouping": new_item.grouping})
+    if _differs(old_item.score, new_item.score):
+        diff.rescored.append({"id": new_item.id, "name": new_item.name,
+                              "old_score": old_item.score, "new_score": new_item.score})
+    # compared as by the fingerprints, missing values being equal
+    if repr(old_item.meta_data) != repr(new_item.meta_data):
+        diff.reannotated.append({"id": new_item.id, "name": new_item.name,
+                                 "old_meta_data": old_item.meta_data, "new_meta_data": new_item.meta_data})
+
+
+def _compare_children(parents, diff):
+    """record the items whose children would not end up in the order of the new
+    version: apply_diff keeps the children that stay in their old order, then
+    appends the added ones and then the moved ones"""
+
+    removed = {record["id"] for record in diff.removed}
+    moved = {record["id"] for record in diff.moved}
+    attached = defaultdict(list)
+    for record in diff.added:
+        attached[record["parent"]].append(record["id"])
+    for record in diff.moved:
+        attached[record["new_parent"]].append(record["id"])
+
+    for old_item, new_item in parents:
+        old_children = _children_ids(old_item) if old_item is not None else None
+        merged = old_children
+        if old_children is not None or attached[new_item.id]:
+            merged = [id for id in old_children or [] if id not in removed and id not in moved]
+            merged += attached[new_item.id]
+        new_children = _children_ids(new_item)
+        if merged != new_children:
+            diff.reordered.append({"id": new_item.id, "name": new_item.name,
+                                   "old_children": old_children, "new_children": new_children})
+
+
+def diff_taxonomies(old, new):
+    """Compute the differences between two versions of a taxonomy.
+
+    Both trees are walked top down from their roots, matching children by id.
+    When two matched items have the same fingerprint (see
+    :attr:`SustainabilityItem.fingerprint`) their whole subtrees are identical
+    and are skipped. The subtrees of the children left unmatched are
+    then compared by id: items found on both sides were moved, the others were
+    added or removed. Finally the children of the items visited are checked to
+    be in the order of the new version once the changes are applied.
+
+    :param old: previous version of the taxonomy
+    :type old: SustainabilityTaxonomy
+    :param new: new version of the taxonomy
+    :type new: SustainabilityTaxonomy
+    :returns: the changes turning old into new
+    :rtype: TaxonomyDiff
+    """
+
+    diff = TaxonomyDiff()
+
+    pairs = [(old.root, new.root)]
+    old_frontier = []
+    new_frontier = []
+    # (old item or None, new item) of the items whose children may have changed
+    parents = []
+
+    while pairs:
+        old_item, new_item = pairs.pop()
+        _compare(old_item, new_item, diff)
+        if old_item.fingerprint == new_item.fingerprint:
+            # identical subtrees, nothing to visit below
+            continue
+        parents.append((old_item, new_item))
+
+        old_children = {child.id: child for child in (old_item.children or [])}
+        for child in (new_item.children or []):
+            match = old_children.pop(child.id, None)
+            if match is not None:
+                pairs.append((match, child))
+            else:
+                new_frontier.append(child)
+        old_frontier.extend(old_children.values())
+
+    # items that are not under a matching parent were added, removed or moved
+    old_region = _subtrees(old_frontier)
+    new_region = _subtrees(new_frontier)
+
+    for item_id, new_item in new_region.items():
+        old_item = old_region.pop(item_id, None)
+        if old_item is None:
+            diff.added.append(_record(new_item))
+        else:
+            _compare(old_item, new_item, diff)
+        parents.append((old_item, new_item))
+    diff.removed = [_record(item) for item in old_region.values()]
+    _compare_children(parents, diff)
+
+    return diff
+
+
+def apply_diff(taxonomy, diff):
+    """Apply the changes of a diff to a taxonomy (in place)
+
+    :param taxonomy: taxonomy to update
+    :type taxonomy: SustainabilityTaxonomy
+    :param diff: changes to apply
+    :type diff: TaxonomyDiff
+    """
+
+    items = {}
+    stack = [taxonomy.root]
+    while stack:
+        item = stack.pop()
+        items[item.id] = item
+        if item.children:
+            stack.extend(item.children)
+
+    def attach(item, parent):
+        item.parent = parent
+        if parent.children is None:
+            parent.children = []
+        parent.children.append(item)
+
+    def detach(item):
+        # the parent keeps an empty list of children, as with remove_subtree
+        if item.parent is not None:
+            item.parent.children.remove(item)
+            item.parent = None
+
+    # parents are listed before their children
+    for record in diff.added:
+        item = SustainabilityItem(id=record["id"], name=record["name"], level=record["level"],
+                                  grouping=record["grouping"], score=record["score"],
+                                  weight=record["weight"],
+                                  meta_data=dict(record["meta_data"]) if record["meta_data"] is not None else None)
+        attach(item, items[record["parent"]])
+        items[item.id] = item
+
+    for record in diff.moved:
+        item = items[record["id"]]
+        detach(item)
+        attach(item, items[record["new_parent"]])
+        item.level = record["new_level"]
+
+    for record in diff.relevelled:
+        items[record["id"]].level = record["new_level"]
+
+    for record in diff.renamed:
+        items[record["id"]].name = record["new_name"]
+
+    for record in diff.reweighted:
+        items[record["id"]].weight = record["new_weight"]
+
+    for record in diff.regrouped:
+        items[record["id"]].grouping = record["new_grouping"]
+
+    for record in diff.rescored:
+        items[record["id"]].score = record["new_score"]
+
+    for record in diff.reannotated:
+        meta_data = record["new_meta_data"]
+        items[record["id"]].meta_data = dict(meta_data) if meta_data is not None else None
+
+    # the remaining descendants of removed items are removed along with them
+    removed_ids = {record["id"] for record in diff.removed}
+    for record in diff.removed:
+        item = items[record["id"]]
+        if item.parent is not None and item.parent.id not in removed_ids:
+            detach(item)
+
+    for record in diff.reordered:
+        item = items[record["id"]]
+        item.children = ([items[child_id] for child_id in record["new_children"]]
+                         if record["new_children"] is not None else None)
@@ -0,0 +1,259 @@
+from .sustainabilityTaxonomy import SustainabilityTaxonomy, BUILTIN_TAXONOMIES, from_file
+from .crosswalk import normalise_name
+from .memoryUsage import sizeof
+from collections import defaultdict
+import pandas as pd
+import os
+
+
+class TaxonomyForest:
+    """Several taxonomies sharing one dictionary of terms.
+
+    The names of the items are interned: every distinct name is stored once,
+    whatever the number of taxonomies and items using it, and gets an integer
+    term id. A postings index maps every term id to the items having this
+    name in every taxonomy, so that finding which taxonomies contain a term,
+    and where, is a dictionary lookup instead of a search of every tree.
+
+    Taxonomies are frozen when added (see :meth:`SustainabilityTaxonomy.freeze`)
+    so that the postings stay valid.
+
+    :param taxonomies: taxonomies of the forest, indexed by name
+    :type taxonomies: dict of (str, SustainabilityTaxonomy)
+    """
+
+    def __init__(self, taxonomies=None):
+        self._taxonomies = {}
+        # term id -> term, and term -> term id
+        self._terms = []
+        self._term_ids = {}
+        # term id -> {taxonomy name: items}
+        self._postings = []
+        # normalised term -> term ids (see crosswalk.normalise_name)
+        self._normalised = defaultdict(list)
+
+        for name, taxonomy in (taxonomies or {}).items():
+            self.add_taxonomy(name, taxonomy)
+
+    def __len__(self):
+        return len(self._taxonomies)
+
+    def __contains__(self, name):
+        return name in self._taxonomies
+
+    def add_taxonomy(self, name, taxonomy):
+        """Add a taxonomy to the forest, interning the names of its items
+
+        :param name: name of the taxonomy in the forest
+        :type name: str
+        :param taxonomy: taxonomy to add (frozen by this method)
+        :type taxonomy: SustainabilityTaxonomy
+        :returns: the frozen taxonomy
+        :rtype: SustainabilityTaxonomy
+        """
+
+        if name in self._taxonomies:
+            raise ValueError(f"{name} is already in the forest")
+        if not isinstance(taxonomy, SustainabilityTaxonomy):
+            raise TypeError(f"{name} is not a SustainabilityTaxonomy")
+
+        for item in taxonomy.iter_items(order="dfs"):
+            # the root only holds the name of the taxonomy
+            if item is taxonomy.root or not isinstance(item.name, str):
+                continue
+            term_id = self._intern(item.name)
+            # the interned string is equal to the name, so the fingerprints of the
+            # items do not change and frozen items can be updated in place
+            item.__dict__["name"] = self._terms[term_id]
+            self._postings[term_id].setdefault(name, []).append(item)
+
+        # indexes built before holding the previous strings
+        taxonomy.invalidate_indexes()
+        taxonomy.freeze()
+        self._taxonomies[name] = taxonomy
+        return taxonomy
+
+    def _intern(self, term):
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            term_id = len(self._terms)
+            self._terms.append(term)
+            self._term_ids[term] = term_id
+            self._postings.append({})
+            self._normalised[normalise_name(term)].append(term_id)
+        return term_id
+
+    def names(self):
+        """Get the names of the taxonomies of the forest, in the order they were added
+
+        :rtype: list of str
+        """
+
+        return list(self._taxonomies)
+
+    def taxonomy(self, name):
+        """Get a taxonomy of the forest
+
+        :param name: name of the taxonomy
+        :type name: str
+        :rtype: SustainabilityTaxonomy
+        """
+
+        if name not in self._taxonomies:
+            raise KeyError(f"{name} is not in the forest")
+        return self._taxonomies[name]
+
+    def term_id(self, term):
+        """Get the id of a term in the shared dictionary
+
+        :param term: name of items
+        :type term: str
+        :returns: the term id (None if no item has this name)
+        :rtype: int
+        """
+
+        return self._term_ids.get(term)
+
+    def term(self, term_id):
+        """Get the term having an id in the shared dictionary
+
+        :param term_id: id of the term
+        :type term_id: int
+        :rtype: str
+        """
+
+        return self._terms[term_id]
+
+    def terms(self):
+        """Get the terms of the shared dictionary, in the order of their ids
+
+        :rtype: list of str
+        """
+
+        return list(self._terms)
+
+    def _term_ids_of(self, term, normalised):
+        if normalised:
+            return self._normalised.get(normalise_name(term), [])
+        term_id = self._term_ids.get(term)
+        return [] if term_id is None else [term_id]
+
+    def contains(self, term, taxonomy=None, normalised=False):
+        """Check if items of the forest (or of one of its taxonomies) have a name
+
+        :param term: name of items
+        :type term: str
+        :param taxonomy: name of the taxonomy to look in (default: any taxonomy)
+        :type taxonomy: str
+        :param normalised: compare the normalised names (see :func:`crosswalk.normalise_name`)
+        :type normalised: bool
+        :rtype: bool
+        """
+
+        for term_id in self._term_ids_of(term, normalised):
+            if taxonomy is None or taxonomy in self._postings[term_id]:
+                return True
+        return False
+
+    def lookup(self, term, taxonomy=None, normalised=False):
+        """Get the items having a name in every taxonomy of the forest
+
+        :param term: name of items
+        :type term: str
+        :param taxonomy: name of the taxonomy to look in (default: every taxonomy)
+        :type taxonomy: str
+        :param normalised: compare the normalised names (see :func:`crosswalk.normalise_name`)
+        :type normalised: bool
+        :returns: (taxonomy name, item) of every item having the name, in the order
+                  the taxonomies were added then in DFS order
+        :rtype: list of (str, SustainabilityItem)
+        """
+
+        found = defaultdict(list)
+        for term_id in self._term_ids_of(term, normalised):
+            for name, items in self._postings[term_id].items():
+                if taxonomy is None or name == taxonomy:
+                    found[name].extend(items)
+
+        order = {name: position for position, name in enumerate(self._taxonomies)}
+        return [(name, item) for name in sorted(found, key=order.get) for item in found[name]]
+
+    def taxonomies_with(self, term, normalised=False):
+        """Get the names of the taxonomies having items with a name
+
+        :param term: name of items
+        :type term: str
+        :param normalised: compare the normalised names (see :func:`crosswalk.normalise_name`)
+        :type normalised: bool
+        :rtype: list of str
+        """
+
+        names = {name for term_id in self._term_ids_of(term, normalised) for name in self._postings[term_id]}
+        return [name for name in self._taxonomies if name in names]
+
+    def shared_terms(self, min_taxonomies=2):
+        """Get the terms used by several taxonomies
+
+        :param min_taxonomies: minimum number of taxonomies using a term
+        :type min_taxonomies: int
+        :returns: taxonomies and number of items using every term, indexed by term
+                  and sorted by decreasing number of taxonomies
+        :rtype: pd.DataFrame
+        """
+
+        rows = {}
+        for term_id, postings in enumerate(self._postings):
+            if len(postings) >= min_taxonomies:
+                rows[self._terms[term_id]] = {"term_id": term_id,
+                                              "taxonomies": [name for name in self._taxonomies if name in postings],
+                                              "items": sum(len(items) for items in postings.values())}
+
+        shared = pd.DataFrame.from_dict(rows, orient="index", columns=["term_id", "taxonomies", "items"])
+        order = shared["taxonomies"].map(len).sort_values(ascending=False, kind="stable").index
+        return shared.loc[order]
+
+    def to_dataframe(self):
+        """Get the postings of the forest, one row per item
+
+        :returns: term_id, term, taxonomy and item_id of every item
+        :rtype: pd.DataFrame
+        """
+
+        rows = [(term_id, self._terms[term_id], name, item.id)
+                for term_id, postings in enumerate(self._postings)
+                for name, items in postings.items() for item in items]
+        return pd.DataFrame(rows, columns=["term_id", "term", "taxonomy", "item_id"])
+
+    def memory_usage(self, deep=True):
+        """Get the bytes used by the shared dictionary and the postings index, the
+        taxonomies being measured by :meth:`SustainabilityTaxonomy.memory_usage`
+
+        :param deep: follow the contents of the dictionary and of the postings
+        :type deep: bool
+        :returns: bytes used by the terms and by the postings, indexed by part
+        :rtype: pd.Series
+        """
+
+        # items are owned by the taxonomies
+        seen = {id(item) for postings in self._postings for items in postings.values() for item in items}
+        seen.update(id(name) for name in self._taxonomies)
+        terms = sizeof([self._terms, self._term_ids, self._normalised], seen, deep)
+        postings = sizeof(self._postings, seen, deep)
+        return pd.Series({"terms": terms, "postings": postings}, name="bytes")
+
+
+def builtin_forest(meta=False):
+    """Load every builtin taxonomy into one forest. Builtin taxonomies whose file
+    is not shipped are skipped.
+
+    :param meta: load the taxonomies with their meta-data
+    :type meta: bool
+    :rtype: TaxonomyForest
+    """
+
+    directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "taxonomies")
+    forest = TaxonomyForest()
+    for name in BUILTIN_TAXONOMIES:
+        if os.path.exists(os.path.join(directory, name + ".xlsx")):
+            forest.add_taxonomy(name, from_file(name, meta=meta))
+    return forest
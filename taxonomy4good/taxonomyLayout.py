@@ -0,0 +1,343 @@
+from .errors import IDNotFoundError
+from .sustainabilityItem import SustainabilityItem
+from .aggregation import get_aggregation
+import numpy as np
+
+
+class TaxonomyLayout:
+    """Flat (columnar) view of a taxonomy or substructure. Items are stored in
+    DFS pre-order, so the subtree of the item at position ``i`` is the contiguous
+    range ``[i, ends[i])``. Parents are stored as positions (-1 for the root) and
+    children as an offset-indexed array (``child_index[child_offsets[i]:child_offsets[i + 1]]``).
+    Leaves are the items whose children are None, as in
+    :meth:`SustainabilityTaxonomy.compute_scores`: an item with an empty list of
+    children is not a leaf (and scores 0).
+
+    The layout is a read-only picture of the structure at the time it was built,
+    it must be rebuilt after the taxonomy is modified.
+    """
+
+    def __init__(self, ids, parents, depths, weights, scores, ends, child_offsets,
+                 child_index, names, levels=None, groupings=None, meta_data=None, items=None, is_leaf=None):
+        self.ids = ids
+        self.parents = parents
+        self.depths = depths
+        self.weights = weights
+        self.scores = scores
+        self.ends = ends
+        self.child_offsets = child_offsets
+        self.child_index = child_index
+        self.names = names
+        self.levels = levels
+        self.groupings = groupings
+        self.meta_data = meta_data
+        self.items = items
+        # boolean mask of the leaves (default: the items having no children)
+        self.is_leaf = np.diff(child_offsets) == 0 if is_leaf is None else is_leaf
+
+        # lazy indexes are built into local variables and published with a single
+        # assignment, so that threads reading a shared (frozen) layout never see
+        # them half built
+        self._id_index = None
+        self._segments = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def position(self, id):
+        """Get the position of the item having the specified id
+
+        :param id: id of the item
+        :type id: int
+        :returns: position of the item in the layout
+        :rtype: int
+        """
+
+        return int(self.positions([id])[0])
+
+    def positions(self, ids):
+        """Get the positions of the items having the specified ids (vectorized)
+
+        :param ids: ids of the items
+        :type ids: list of int | numpy.array
+        :returns: positions of the items in the layout
+        :rtype: numpy.array (int)
+        """
+
+        id_index = self._id_index
+        if id_index is None:
+            # sorted copy of the ids, searched with a binary search
+            id_order = np.argsort(self.ids, kind="stable")
+            id_index = self._id_index = (id_order, self.ids[id_order])
+        id_order, sorted_ids = id_index
+
+        ids = np.asarray(ids, dtype=np.int64).reshape(-1)
+        idx = np.searchsorted(sorted_ids, ids)
+        idx[idx >= len(sorted_ids)] = 0
+        found = sorted_ids[idx] == ids if len(sorted_ids) else np.zeros(len(ids), dtype=bool)
+
+        if not found.all():
+            raise IDNotFoundError(f"{set(ids[~found].tolist())}"
+                                  + " not found in the Taxonomy")
+
+        return id_order[idx]
+
+    def children_positions(self, position):
+        """Get the positions of the children of the item at the specified position"""
+
+        return self.child_index[self.child_offsets[position]:self.child_offsets[position + 1]]
+
+    def child_segments(self):
+        """Get the children grouped by the depth of their parent, from the deepest parents
+        up to the root, and by parent: for every depth, the positions of the children,
+        the positions of their parents and the start of the children of every parent
+        (built on first use)
+
+        :rtype: list of (numpy.array, numpy.array, numpy.array)
+        """
+
+        segments = self._segments
+        if segments is None:
+            # child_index is grouped by parent, a stable sort keeps the groups
+            parent_of = self.parents[self.child_index]
+            order = np.argsort(self.depths[parent_of], kind="stable")
+            children, parent_of = self.child_index[order], parent_of[order]
+            parent_depths = self.depths[parent_of]
+
+            segments = []
+            for depth in range(int(parent_depths.max(initial=-1)), -1, -1):
+                low, high = np.searchsorted(parent_depths, [depth, depth + 1])
+                block = parent_of[low:high]
+                starts = np.flatnonzero(np.concatenate([[True], block[1:] != block[:-1]]))
+                segments.append((children[low:high], block[starts], starts))
+            self._segments = segments
+
+        return segments
+
+    def rollup_scores(self, scores=None, weights=None, aggregation="sum"):
+        """Compute the score of every item (bottom up). With the default aggregation,
+        the rules of :meth:`SustainabilityTaxonomy.compute_scores` are followed: a
+        leaf contributes ``score * weight`` and an item with children takes the sum of
+        the contributions of its children.
+
+        :param scores: scores to use instead of the stored ones (layout order)
+        :type scores: numpy.array
+        :param weights: weights to use instead of the stored ones (layout order)
+        :type weights: numpy.array
+        :param aggregation: name of a registered aggregation (see :mod:`taxonomy4good.aggregation`)
+        :type aggregation: str | Aggregation
+        :returns: score of every item in layout order (leaves keep their raw score)
+        :rtype: numpy.array (float)
+        """
+
+        aggregation = get_aggregation(aggregation)
+        scores = self.scores if scores is None else np.asarray(scores, dtype=np.float64)
+        weights = self.weights if weights is None else np.asarray(weights, dtype=np.float64)
+
+        is_leaf = self.is_leaf
+        # items with an empty list of children are not part of any segment and score 0
+        rolled_up = np.where(is_leaf, scores, 0.0)
+
+        # one segment reduction per level, from the deepest parents up to the root
+        for children, parents, starts in self.child_segments():
+            rolled_up[parents] = aggregation.reduce(rolled_up[children], weights[children],
+                                                    is_leaf[children], starts)
+
+        return rolled_up
+
+    def to_items(self):
+        """Create linked SustainabilityItem objects out of the layout
+
+        :returns: the root item of the rebuilt structure
+        :rtype: SustainabilityItem
+        """
+
+        items = []
+        for pos in range(len(self)):
+            items.append(SustainabilityItem(id=int(self.ids[pos]),
+                                            name=self.names[pos],
+                                            level=_to_python(self.levels[pos]) if self.levels is not None
+                                            else int(self.depths[pos]),
+                                            grouping=self.groupings[pos] if self.groupings is not None else None,
+                                            score=_to_python(self.scores[pos]),
+                                            weight=_to_python(self.weights[pos]),
+                                            meta_data=self.meta_data[pos] if self.meta_data is not None else None))
+
+        # link parents and children (parents always precede their children)
+        for pos in np.flatnonzero(~self.is_leaf).tolist():
+            items[pos].children = []
+        for pos in range(1, len(self)):
+            parent = items[self.parents[pos]]
+            items[pos].parent = parent
+            parent.children.append(items[pos])
+
+        return items[0] if items else None
+
+
+def build_layout(start_root, keep_items=True):
+    """Flatten a taxonomy/substructure into a TaxonomyLayout (DFS pre-order).
+    The traversal is iterative, so deep structures do not hit the recursion limit.
+
+    :param start_root: root item of the structure or substructure to flatten
+    :type start_root: SustainabilityItem
+    :param keep_items: keep a reference to the SustainabilityItem objects in the layout
+    :type keep_items: bool
+    :returns: the flattened structure
+    :rtype: TaxonomyLayout
+    """
+
+    items = []
+    parents = []
+    depths = []
+
+    stack = [(start_root, -1, 0)] if start_root is not None else []
+    while stack:
+        item, parent_pos, depth = stack.pop()
+        position = len(items)
+        items.append(item)
+        parents.append(parent_pos)
+        depths.append(depth)
+
+        # push children in reverse so they are visited in their original order
+        if item.children:
+            for child in reversed(item.children):
+                stack.append((child, position, depth + 1))
+
+    n = len(items)
+    parents = np.array(parents, dtype=np.int64)
+    depths = np.array(depths, dtype=np.int64)
+
+    # subtree sizes, accumulated from the deepest level up
+    sizes = np.ones(n, dtype=np.int64)
+    for depth in range(int(depths.max(initial=0)), 0, -1):
+        at_depth = np.flatnonzero(depths == depth)
+        np.add.at(sizes, parents[at_depth], sizes[at_depth])
+    ends = np.arange(n, dtype=np.int64) + sizes
+
+    # children are grouped by parent, a stable sort keeps their original order
+    child_counts = np.bincount(parents[1:], minlength=n) if n else np.zeros(0, dtype=np.int64)
+    child_offsets = np.concatenate([[0], np.cumsum(child_counts)]).astype(np.int64)
+    child_index = (np.argsort(parents[1:], kind="stable") + 1).astype(np.int64)
+
+    return TaxonomyLayout(ids=np.array([item.id for item in items], dtype=np.int64),
+                          parents=parents,
+                          depths=depths,
+                          weights=np.array([item.weight for item in items], dtype=np.float64),
+                          scores=np.array([item.score for item in items], dtype=np.float64),
+                          ends=ends,
+                          child_offsets=child_offsets,
+                          child_index=child_index,
+                          names=[item.name for item in items],
+                          levels=[item.level for item in items],
+                          groupings=[item.grouping for item in items],
+                          meta_data=[item.meta_data for item in items],
+                          items=np.array(items, dtype=object) if keep_items else None,
+                          is_leaf=np.array([item.children is None for item in items], dtype=bool))
+
+
+def _to_python(value):
+    """Convert numpy scalars back to python numbers (ints when possible)"""
+
+    if value is None:
+        return None
+    if isinstance(value, (np.floating, float)):
+        if np.isnan(value):
+            return None
+        if float(value).is_integer():
+            return int(value)
+        return float(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
+
+
+def to_columns(start_root):
+    """Flatten a taxonomy/substructure into columns (DFS pre-order, parents as
+    positions), keeping the python values of the attributes: scores, weights and
+    ids are numpy arrays when all their values have the same numeric type. Used to
+    pickle taxonomies without recursing through the links between the items.
+
+    :param start_root: root item of the structure or substructure to flatten
+    :type start_root: SustainabilityItem
+    :rtype: dict
+    """
+
+    items = []
+    parents = []
+    stack = [(start_root, -1)] if start_root is not None else []
+    while stack:
+        item, parent_pos = stack.pop()
+        position = len(items)
+        items.append(item)
+        parents.append(parent_pos)
+        if item.children:
+            for child in reversed(item.children):
+                stack.append((child, position))
+
+    return {"ids": _column([item.id for item in items]),
+            "parents": np.array(parents, dtype=np.int64),
+            "names": [item.name for item in items],
+            "levels": _column([item.level for item in items]),
+            "groupings": [item.grouping for item in items],
+            "scores": _column([item.score for item in items]),
+            "weights": _column([item.weight for item in items]),
+            "meta_data": [item.meta_data for item in items],
+            # items having an empty list of children rather than None
+            "empty_children": np.array([pos for pos, item in enumerate(items)
+                                        if item.children is not None and len(item.children) == 0],
+                                       dtype=np.int64)}
+
+
+def from_columns(columns):
+    """Create linked SustainabilityItem objects out of the columns of :func:`to_columns`
+
+    :param columns: flattened structure
+    :type columns: dict
+    :returns: the root item of the rebuilt structure
+    :rtype: SustainabilityItem
+    """
+
+    values = {name: column.tolist() if isinstance(column, np.ndarray) else column
+              for name, column in columns.items()}
+
+    # the attributes are set directly, as pickle does, skipping the fingerprint
+    # bookkeeping of SustainabilityItem.__setattr__ (the items are new)
+    items = []
+    for id, name, level, grouping, score, weight, meta_data in zip(
+            values["ids"], values["names"], values["levels"], values["groupings"],
+            values["scores"], values["weights"], values["meta_data"]):
+        item = SustainabilityItem.__new__(SustainabilityItem)
+        item.__dict__.update(id=id, name=name, level=level, grouping=grouping, parent=None,
+                             score=score, weight=weight, children=None, meta_data=meta_data)
+        items.append(item)
+
+    children = [None] * len(items)
+    for position in values["empty_children"]:
+        children[position] = []
+    for position, parent_pos in enumerate(values["parents"]):
+        if parent_pos >= 0:
+            items[position].__dict__["parent"] = items[parent_pos]
+            if children[parent_pos] is None:
+                children[parent_pos] = []
+            children[parent_pos].append(items[position])
+
+    # the children are wrapped in a ChildList once the fingerprints are computed
+    for item, item_children in zip(items, children):
+        if item_children is not None:
+            item.__dict__["children"] = item_children
+
+    return items[0] if items else None
+
+
+def _column(values):
+    """values as a numpy array if they are all python ints or all floats, otherwise as a list"""
+
+    kinds = {type(value) for value in values}
+    if kinds == {float}:
+        return np.array(values, dtype=np.float64)
+    if kinds == {int}:
+        try:
+            return np.array(values, dtype=np.int64)
+        except OverflowError:
+            pass
+    return list(values)
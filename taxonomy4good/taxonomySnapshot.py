@@ -0,0 +1,377 @@
+from .taxonomyLayout import TaxonomyLayout, build_layout
+from .scenarioEngine import ScenarioEngine
+import numpy as np
+import json
+import mmap
+
+SNAPSHOT_MAGIC = b"T4GSNAP2"
+SNAPSHOT_EXTENSION = "t4g"
+
+# fixed-width structural arrays stored in a snapshot (name, dtype)
+_ARRAYS = [("ids", "<i8"), ("parents", "<i8"), ("depths", "<i8"), ("ends", "<i8"),
+           ("weights", "<f8"), ("scores", "<f8"), ("child_offsets", "<i8"),
+           ("child_index", "<i8"), ("is_leaf", "|b1"), ("id_order", "<i8"), ("sorted_ids", "<i8")]
+
+# offset-indexed string blobs stored in a snapshot
+_BLOBS = ["names", "lower_names", "attributes"]
+
+
+def write_snapshot(taxonomy, filepath):
+    """Save a taxonomy to a snapshot file that can be memory-mapped by
+    :func:`open_snapshot`.
+
+    The file starts with a small JSON header describing where each section is
+    located, followed by fixed-width little-endian arrays (ids, parents, depths,
+    subtree ends, weights, scores, children offsets, leaf mask, sorted id order
+    and sorted ids) and string blobs (names, lower-case names, attributes) indexed by offset arrays. Every
+    section is aligned on 8 bytes.
+
+    :param taxonomy: taxonomy to be saved
+    :type taxonomy: SustainabilityTaxonomy
+    :param filepath: full path of the resulting snapshot file
+    :type filepath: str
+    """
+
+    layout = build_layout(taxonomy.root, keep_items=False)
+    id_order = np.argsort(layout.ids, kind="stable")
+
+    arrays = {"ids": layout.ids, "parents": layout.parents, "depths": layout.depths,
+              "ends": layout.ends, "weights": layout.weights, "scores": layout.scores,
+              "child_offsets": layout.child_offsets, "child_index": layout.child_index,
+              "is_leaf": layout.is_leaf, "id_order": id_order, "sorted_ids": layout.ids[id_order]}
+
+    names = [str(name) if name is not None else "" for name in layout.names]
+    attributes = [json.dumps({"level": level, "grouping": grouping, "meta_data": meta_data},
+                             default=_json_default)
+                  for level, grouping, meta_data
+                  in zip(layout.levels, layout.groupings, layout.meta_data)]
+    blobs = {"names": names,
+             "lower_names": [name.lower() for name in names],
+             "attributes": attributes}
+
+    header = {"count": len(layout),
+              "version_name": taxonomy.version_name,
+              "version_num": taxonomy.version_num,
+              "sections": {}}
+
+    # compute the section offsets first, the header size depends on them
+    sections = []
+    for name, dtype in _ARRAYS:
+        sections.append((name, np.ascontiguousarray(arrays[name], dtype=dtype)))
+    for name in _BLOBS:
+        encoded = [value.encode("utf-8") for value in blobs[name]]
+        offsets = np.concatenate([[0], np.cumsum([len(value) for value in encoded])]).astype("<i8")
+        sections.append((name + "_offsets", offsets))
+        sections.append((name, np.frombuffer(b"".join(encoded), dtype=np.uint8)))
+
+    # the header length is fixed up front, then padded, so offsets stay valid
+    header_size = 4096
+    while True:
+        offset = len(SNAPSHOT_MAGIC) + 8 + header_size
+        for name, array in sections:
+            offset = _align(offset)
+            header["sections"][name] = [offset, array.dtype.str, int(array.size)]
+            offset += array.nbytes
+        encoded_header = json.dumps(header).encode("utf-8")
+        if len(encoded_header) <= header_size:
+            break
+        header_size = _align(len(encoded_header))
+
+    with open(filepath, "wb") as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(np.array([header_size], dtype="<i8").tobytes())
+        f.write(encoded_header.ljust(header_size, b" "))
+        for name, array in sections:
+            f.write(b"\0" * (header["sections"][name][0] - f.tell()))
+            f.write(array.tobytes())
+
+
+def open_snapshot(filepath):
+    """Open a snapshot file created by :meth:`SustainabilityTaxonomy.to_snapshot`
+    without parsing it
+
+    :param filepath: path of the snapshot file
+    :type filepath: str
+    :returns: read-only taxonomy backed by the memory-mapped file
+    :rtype: TaxonomySnapshot
+    """
+
+    return TaxonomySnapshot(filepath)
+
+
+class TaxonomySnapshot:
+    """Read-only taxonomy backed by a memory-mapped snapshot file. Opening a
+    snapshot only reads its header, the arrays are views on the mapped file, so
+    every process opening the same snapshot shares a single copy of it in the
+    page cache.
+
+    Navigation, search and scoring work directly on the mapped buffers. Use
+    :meth:`to_taxonomy` to get a regular (mutable) SustainabilityTaxonomy.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self._file = open(filepath, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            self.close()
+            raise ValueError(f"{filepath} is not a taxonomy snapshot")
+
+        start = len(SNAPSHOT_MAGIC)
+        header_size = int(np.frombuffer(self._mmap, dtype="<i8", count=1, offset=start)[0])
+        header = json.loads(self._mmap[start + 8:start + 8 + header_size].decode("utf-8"))
+
+        self.version_name = header["version_name"]
+        self.version_num = header["version_num"]
+        self._count = header["count"]
+        self._sections = {name: np.frombuffer(self._mmap, dtype=dtype, count=count, offset=offset)
+                          for name, (offset, dtype, count) in header["sections"].items()}
+        self._blob_starts = {name: header["sections"][name][0] for name in _BLOBS}
+
+        s = self._sections
+        self.layout = TaxonomyLayout(ids=s["ids"], parents=s["parents"], depths=s["depths"],
+                                     weights=s["weights"], scores=s["scores"], ends=s["ends"],
+                                     child_offsets=s["child_offsets"], child_index=s["child_index"],
+                                     names=_LazyStrings(self, "names"), is_leaf=s["is_leaf"])
+        self.layout._id_index = (s["id_order"], s["sorted_ids"])
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Release the memory-mapped file"""
+
+        self.layout = None
+        self._sections = {}
+        try:
+            self._mmap.close()
+        except BufferError:
+            # arrays handed out to the caller still reference the mapping,
+            # it will be released once they are garbage collected
+            pass
+        self._file.close()
+
+    def _string(self, blob, position):
+        offsets = self._sections[blob + "_offsets"]
+        start = self._blob_starts[blob]
+        return self._mmap[start + offsets[position]:start + offsets[position + 1]].decode("utf-8")
+
+    def _item(self, position):
+        layout = self.layout
+        attributes = json.loads(self._string("attributes", position))
+        parent = layout.parents[position]
+        children = layout.children_positions(position)
+
+        return {"id": int(layout.ids[position]), "name": self._string("names", position),
+                "level": attributes["level"], "grouping": attributes["grouping"],
+                "parent": int(layout.ids[parent]) if parent >= 0 else None,
+                "weight": _number(layout.weights[position]), "score": _number(layout.scores[position]),
+                "children": None if layout.is_leaf[position] else layout.ids[children].tolist(),
+                "meta_data": attributes["meta_data"]}
+
+    def search_by_id(self, ids):
+        """Search for items by their id
+
+        :param ids: list of ids of the items to look for
+        :type ids: list int
+        :returns: items having the supplied ids (same structure as SustainabilityItem.to_dict)
+        :rtype: list of dict
+        """
+
+        if isinstance(ids, (int, np.integer)):
+            ids = [ids]
+
+        return [self._item(position) for position in self.layout.positions(ids)]
+
+    def get_children_ids(self, id):
+        """Get the ids of the children of the item having the specified id"""
+
+        return self.layout.ids[self.layout.children_positions(self.layout.position(id))]
+
+    def get_parent_id(self, id):
+        """Get the id of the parent of the item having the specified id (None for the root)"""
+
+        parent = self.layout.parents[self.layout.position(id)]
+        return int(self.layout.ids[parent]) if parent >= 0 else None
+
+    def get_subtree_ids(self, id):
+        """Get the ids of all the items under (and including) the item having the specified id"""
+
+        position = self.layout.position(id)
+        return self.layout.ids[position:self.layout.ends[position]]
+
+    def get_terms(self):
+        """Get all terms (names) of the snapshot (DFS pre-order)"""
+
+        return [self._string("names", position) for position in range(self._count)]
+
+    def search_similar_names(self, terms, start_id=None):
+        """Search for names/terms using a case-insensitive partial match. The
+        search runs over the mapped names without decoding the items that do not match.
+
+        :param terms: list of terms/names to search for
+        :type terms: list of str
+        :param start_id: id of the root of the substructure to search (default: whole snapshot)
+        :type start_id: int
+        :returns: names partially matching each of the terms
+        :rtype: list of str
+        """
+
+        if not isinstance(terms, list):
+            terms = [terms]
+
+        positions_found = [self._find(term, start_id) for term in terms]
+        names_found = [[self._string("names", position) for position in positions]
+                       for positions in positions_found]
+
+        if len(names_found) == 1:
+            names_found = names_found[0]
+        return names_found
+
+    def search_ids_by_name(self, terms, start_id=None):
+        """Same as :meth:`search_similar_names` but returns the ids of the matching items"""
+
+        if not isinstance(terms, list):
+            terms = [terms]
+
+        ids_found = [self.layout.ids[self._find(term, start_id)] for term in terms]
+        if len(ids_found) == 1:
+            ids_found = ids_found[0]
+        return ids_found
+
+    def _find(self, term, start_id=None):
+        """positions of the items whose lower-case name contains the lower-case term"""
+
+        offsets = self._sections["lower_names_offsets"]
+        blob_start = self._blob_starts["lower_names"]
+        blob_end = blob_start + offsets[-1]
+        needle = term.lower().encode("utf-8")
+
+        first, last = 0, self._count
+        if start_id is not None:
+            first = self.layout.position(start_id)
+            last = int(self.layout.ends[first])
+
+        positions = []
+        cursor = int(blob_start + offsets[first])
+        end = int(blob_start + offsets[last])
+        while cursor < end:
+            hit = self._mmap.find(needle, cursor, int(min(end, blob_end)))
+            if hit < 0:
+                break
+            position = int(np.searchsorted(offsets, hit - blob_start, side="right")) - 1
+            # make sure the match does not overlap two consecutive names
+            if hit - blob_start + len(needle) <= offsets[position + 1]:
+                positions.append(position)
+                cursor = int(blob_start + offsets[position + 1])
+            else:
+                cursor = hit + 1
+
+        return np.array(positions, dtype=np.int64)
+
+    def compute_scores(self, scores=None, weights=None, aggregation="sum"):
+        """Compute the weighted score of the root of the snapshot. The snapshot is
+        not modified, different scores or weights can be supplied in DFS order.
+
+        :param scores: scores to use instead of the stored ones
+        :type scores: numpy.array
+        :param weights: weights to use instead of the stored ones
+        :type weights: numpy.array
+        :param aggregation: how the scores of children are combined, see
+                            :meth:`SustainabilityTaxonomy.compute_scores`
+        :type aggregation: str | Aggregation
+        :returns: the weighted value/score of the root
+        :rtype: float
+        """
+
+        return float(self.layout.rollup_scores(scores, weights, aggregation)[0])
+
+    def scenario_engine(self):
+        """Create a ScenarioEngine computing the scores of many weight scenarios at once
+
+        :rtype: ScenarioEngine
+        """
+
+        return ScenarioEngine(self.layout)
+
+    def get_level_scores(self, level, scores=None, weights=None, aggregation="sum"):
+        """Compute the weighted values/scores for the specified level
+
+        :param level: taxonomy level
+        :type level: int
+        :param aggregation: how the scores of children are combined, see
+                            :meth:`SustainabilityTaxonomy.compute_scores`
+        :type aggregation: str | Aggregation
+        :returns: names of level items and their respective weighted values
+        :rtype: dict
+        """
+
+        rolled_up = self.layout.rollup_scores(scores, weights, aggregation)
+        positions = np.flatnonzero(self.layout.depths == level)
+
+        return {self._string("names", position): _number(rolled_up[position])
+                for position in positions}
+
+    def to_taxonomy(self):
+        """Rebuild a regular SustainabilityTaxonomy from the snapshot
+
+        :returns: a mutable copy of the snapshot taxonomy
+        :rtype: SustainabilityTaxonomy
+        """
+
+        from .sustainabilityTaxonomy import SustainabilityTaxonomy
+
+        attributes = [json.loads(self._string("attributes", position))
+                      for position in range(self._count)]
+        layout = TaxonomyLayout(ids=self.layout.ids, parents=self.layout.parents,
+                                depths=self.layout.depths, weights=self.layout.weights,
+                                scores=self.layout.scores, ends=self.layout.ends,
+                                child_offsets=self.layout.child_offsets,
+                                child_index=self.layout.child_index,
+                                is_leaf=self.layout.is_leaf,
+                                names=self.get_terms(),
+                                levels=[a["level"] for a in attributes],
+                                groupings=[a["grouping"] for a in attributes],
+                                meta_data=[a["meta_data"] for a in attributes])
+
+        return SustainabilityTaxonomy(layout.to_items(), version_name=self.version_name,
+                                      version_num=self.version_num)
+
+
+class _LazyStrings:
+    """sequence of strings decoded on access from a snapshot blob"""
+
+    def __init__(self, snapshot, blob):
+        self._snapshot = snapshot
+        self._blob = blob
+
+    def __len__(self):
+        return len(self._snapshot)
+
+    def __getitem__(self, position):
+        return self._snapshot._string(self._blob, int(position))
+
+
+def _align(offset, alignment=8):
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def _number(value):
+    value = float(value)
+    if np.isnan(value):
+        return None
+    return int(value) if value.is_integer() else value
+
+
+def _json_default(value):
+    # numpy scalars and other objects stored in meta-data
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
@@ -0,0 +1,83 @@
+from collections import deque
+
+# supported traversal orders
+ORDERS = ["level", "dfs"]
+
+
+def walk(start_root, order="level", max_depth=None):
+    """Iterate over the items of a structure along with their depth below start_root,
+    without building any list of them. Only the frontier of the traversal is held
+    in memory (a level of the tree in level order, a path and its siblings in DFS)
+
+    :param start_root: root item of the structure or substructure
+    :type start_root: SustainabilityItem
+    :param order: "level" (breadth first, the order of get_items) or "dfs" (pre-order)
+    :type order: str
+    :param max_depth: deepest level visited, start_root having depth 0 (default: no limit)
+    :type max_depth: int
+    :rtype: generator of (SustainabilityItem, int)
+    """
+
+    if order not in ORDERS:
+        raise ValueError(f"{order} is not a supported order, use level or dfs")
+    if max_depth is not None and max_depth < 0:
+        raise ValueError("max_depth must be positive")
+    if start_root is None:
+        return
+
+    if order == "level":
+        queue = deque([(start_root, 0)])
+        while queue:
+            item, depth = queue.popleft()
+            yield item, depth
+            if item.children and (max_depth is None or depth < max_depth):
+                queue.extend((child, depth + 1) for child in item.children)
+    else:
+        stack = [(start_root, 0)]
+        while stack:
+            item, depth = stack.pop()
+            yield item, depth
+            if item.children and (max_depth is None or depth < max_depth):
+                stack.extend((child, depth + 1) for child in reversed(item.children))
+
+
+def traverse(start_root, order="level", max_depth=None, predicate=None):
+    """Iterate over the items of a structure without building any list of them
+
+    :param start_root: root item of the structure or substructure
+    :type start_root: SustainabilityItem
+    :param order: "level" (breadth first, the order of get_items) or "dfs" (pre-order)
+    :type order: str
+    :param max_depth: deepest level visited, start_root having depth 0 (default: no limit)
+    :type max_depth: int
+    :param predicate: only yield the items for which predicate(item) is true (the
+                      children of the other items are still visited)
+    :type predicate: callable
+    :rtype: generator of SustainabilityItem
+    """
+
+    if max_depth is None and predicate is None:
+        # plain traversal, without tracking depths
+        if order not in ORDERS:
+            raise ValueError(f"{order} is not a supported order, use level or dfs")
+        if start_root is None:
+            return
+        if order == "level":
+            queue = deque([start_root])
+            while queue:
+                item = queue.popleft()
+                yield item
+                if item.children:
+                    queue.extend(item.children)
+        else:
+            stack = [start_root]
+            while stack:
+                item = stack.pop()
+                yield item
+                if item.children:
+                    stack.extend(reversed(item.children))
+        return
+
+    for item, _ in walk(start_root, order, max_depth):
+        if predicate is None or predicate(item):
+            yield item
@@ -0,0 +1,262 @@
+from .errors import TaxonomyValidationError
+import pandas as pd
+import numpy as np
+import ast
+
+# how loaders handle structural issues: raise, fix them or skip the validation
+VALIDATION_MODES = ["strict", "repair", "off"]
+
+ISSUE_TYPES = ["invalid_id", "duplicate", "orphan", "cycle", "children_mismatch", "invalid_children"]
+
+ISSUE_COLUMNS = ["issue", "id", "row", "detail"]
+
+
+class ValidationReport:
+    """Structural issues found in the items of a taxonomy file by :func:`validate_dataframe`
+
+    - ``invalid_id``: missing or non integer id
+    - ``duplicate``: id used by several rows (or id 0, reserved for the root)
+    - ``orphan``: parent id not found in the file
+    - ``cycle``: items being their own ancestors (reported once per cycle)
+    - ``children_mismatch``: children lists disagreeing with the parent column
+    - ``invalid_children``: children cells that cannot be read as a list of ids
+
+    :param issues: issue, id, row and detail of every issue
+    :type issues: list of dict
+    """
+
+    def __init__(self, issues=None):
+        self.issues = issues if issues is not None else []
+
+    def __len__(self):
+        return len(self.issues)
+
+    def __repr__(self):
+        counts = ", ".join(f"{issue}={count}" for issue, count in self.counts().items() if count)
+        return f"ValidationReport({counts})"
+
+    def is_valid(self):
+        """Check if no issue was found"""
+
+        return len(self.issues) == 0
+
+    def counts(self):
+        """Get the number of issues of every type
+
+        :rtype: dict
+        """
+
+        return {issue: sum(1 for found in self.issues if found["issue"] == issue) for issue in ISSUE_TYPES}
+
+    def by_type(self, issue):
+        """Get the issues of a type
+
+        :param issue: one of ISSUE_TYPES
+        :type issue: str
+        :rtype: list of dict
+        """
+
+        return [found for found in self.issues if found["issue"] == issue]
+
+    def to_dataframe(self):
+        """Convert the report to a DataFrame (one row per issue, rows are positions in the file)
+
+        :rtype: pd.DataFrame
+        """
+
+        return pd.DataFrame(self.issues, columns=ISSUE_COLUMNS)
+
+
+def parse_children(value):
+    """Read the child ids listed in a children cell
+
+    :param value: cell of the children column (None, list or text representation of a list)
+    :type value: str | list | float
+    :returns: the listed ids (raises ValueError or SyntaxError if the text is not a list literal)
+    :rtype: list
+    """
+
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return []
+    if isinstance(value, str):
+        value = ast.literal_eval(value) if value.strip() else []
+    if np.ndim(value) == 0:
+        value = [value]
+    return list(value)
+
+
+def _cell(value):
+    """value of a cell as read from the file (numpy scalars unwrapped)"""
+
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def as_ids(values):
+    """Convert the cells of an id column to numbers
+
+    :param values: cells of the column
+    :type values: list | pd.Series
+    :returns: the ids as floats (NaN where missing or not an integer)
+    :rtype: numpy.array
+    """
+
+    ids = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=np.float64, copy=True)
+    ids[ids != np.round(ids)] = np.nan
+    return ids
+
+
+def _check(items_df):
+    """(report, repaired columns): single pass over the id, parent and children columns"""
+
+    n = len(items_df)
+    issues = []
+    ids = as_ids(items_df["id"]) if n else np.zeros(0)
+    parents = as_ids(items_df["parent"]) if n else np.zeros(0)
+    # parent 0 and missing parents are the root
+    parents[parents == 0] = np.nan
+
+    # unreadable children cells are dropped (rebuilt from the parent column by the repair)
+    children = []
+    unreadable = set()
+    for row, value in enumerate(items_df["children"]):
+        try:
+            children.append(parse_children(value))
+        except (ValueError, SyntaxError):
+            children.append([])
+            unreadable.add(ids[row])
+            issues.append({"issue": "invalid_children", "id": None if np.isnan(ids[row]) else int(ids[row]),
+                           "row": row, "detail": f"{_cell(value)!r} is not a list of ids"})
+
+    # rows kept by the repair: valid ids, first occurrence of every id, id 0 excluded
+    invalid = np.isnan(ids)
+    for row in np.flatnonzero(invalid):
+        value = _cell(items_df["id"].iloc[row])
+        detail = "missing id" if pd.isna(value) else f"{value!r} is not an integer id"
+        issues.append({"issue": "invalid_id", "id": None, "row": int(row), "detail": detail})
+    duplicated = pd.Series(ids).duplicated(keep="first").to_numpy() & ~invalid
+    reserved = ids == 0
+    for row in np.flatnonzero(duplicated | reserved):
+        detail = "id 0 is reserved for the root" if reserved[row] else "id already used by an earlier row"
+        issues.append({"issue": "duplicate", "id": int(ids[row]), "row": int(row), "detail": detail})
+    kept = ~(invalid | duplicated | reserved)
+
+    # position of the parent of every kept row, -1 for the root
+    kept_rows = np.flatnonzero(kept)
+    index = pd.Index(ids[kept_rows])
+    parent_rows = np.full(n, -1, dtype=np.int64)
+    has_parent = kept & ~np.isnan(parents)
+    found = index.get_indexer(parents[has_parent])
+    orphan_rows = np.flatnonzero(has_parent)[found < 0]
+    for row in orphan_rows:
+        issues.append({"issue": "orphan", "id": int(ids[row]), "row": int(row),
+                       "detail": f"parent {int(parents[row])} not found"})
+    parent_rows[np.flatnonzero(has_parent)[found >= 0]] = kept_rows[found[found >= 0]]
+    repaired_parents = np.where(parent_rows >= 0, parents, np.nan)
+
+    # pointer jumping: after ceil(log2(n)) + 1 doublings, the items still having an
+    # ancestor never reach the root, they are on a cycle or under one
+    jump = parent_rows.copy()
+    for _ in range(max(1, int(n).bit_length()) + 1):
+        jump = np.where(jump >= 0, jump[jump], -1)
+    on_cycles = set()
+    for start in np.unique(jump[jump >= 0]):
+        if start in on_cycles:
+            continue
+        cycle = [int(start)]
+        row = parent_rows[start]
+        while row != start:
+            cycle.append(int(row))
+            row = parent_rows[row]
+        on_cycles.update(cycle)
+        # the cycle is broken by attaching its smallest id to the root
+        breaker = min(cycle, key=lambda cycle_row: ids[cycle_row])
+        repaired_parents[breaker] = np.nan
+        issues.append({"issue": "cycle", "id": int(ids[breaker]), "row": int(breaker),
+                       "detail": f"cycle through ids {sorted(int(ids[cycle_row]) for cycle_row in cycle)}"})
+
+    # children lists against the parent column: (parent id, child id) pairs
+    lengths = np.fromiter((len(listed) for listed in children), dtype=np.int64, count=n)
+    listed = pd.DataFrame({"parent": np.repeat(ids, lengths),
+                           "id": as_ids([child for listed in children for child in listed])})
+    listed = listed[np.repeat(kept, lengths)]
+    linked = parent_rows >= 0
+    actual = pd.DataFrame({"parent": parents[linked], "id": ids[linked]})
+    pairs = listed.merge(actual, on=["parent", "id"], how="outer", indicator=True)
+    rows = pd.Series(np.arange(n)[kept], index=ids[kept])
+    for parent, child, side in pairs.loc[pairs["_merge"] != "both"].itertuples(index=False):
+        if side == "right_only" and parent in unreadable:
+            # already reported as invalid_children
+            continue
+        if side == "left_only":
+            detail = f"lists child {child if np.isnan(child) else int(child)} whose parent is different"
+            issue_id = parent
+        else:
+            detail = f"not listed in the children of {int(parent)}"
+            issue_id = child
+        issues.append({"issue": "children_mismatch", "id": int(issue_id), "row": int(rows[issue_id]),
+                       "detail": detail})
+
+    # repaired children: the listed ones having the item as parent, then the others in row order
+    actual_children = {}
+    for row in np.flatnonzero(kept & ~np.isnan(repaired_parents)):
+        actual_children.setdefault(repaired_parents[row], []).append(int(ids[row]))
+    repaired_children = []
+    for row in range(n):
+        expected = actual_children.get(ids[row], [])
+        expected_set = set(expected)
+        ordered = [child for child in children[row] if child in expected_set]
+        ordered_set = set(ordered)
+        ordered += [child for child in expected if child not in ordered_set]
+        repaired_children.append(ordered if ordered else None)
+
+    issues.sort(key=lambda found: (found["row"], ISSUE_TYPES.index(found["issue"])))
+    return ValidationReport(issues), (kept, repaired_parents, repaired_children)
+
+
+def validate_dataframe(items_df):
+    """Check the structure of the items of a taxonomy file (as read by
+    :func:`taxonomy4good.sustainabilityTaxonomy.from_file`) without loading it.
+    Duplicates, orphans and cycles are found with vectorized operations over the id
+    and parent columns (cycles by pointer jumping), and the children lists are
+    compared with the parent column by joining (parent, child) pairs.
+
+    :param items_df: items of the taxonomy, with id, parent and children columns
+    :type items_df: pd.DataFrame
+    :returns: all the issues found
+    :rtype: ValidationReport
+    """
+
+    items_df = items_df.rename(columns=str.lower)
+    return _check(items_df)[0]
+
+
+def prepare_dataframe(items_df, validation="strict"):
+    """Validate the items of a taxonomy file before linking them
+
+    - ``strict``: raise a TaxonomyValidationError listing every issue
+    - ``repair``: drop invalid and duplicated rows, attach orphans and one item of
+      every cycle to the root and rebuild the children lists from the parent column
+    - ``off``: no validation
+
+    :param items_df: items of the taxonomy, columns in lower case
+    :type items_df: pd.DataFrame
+    :param validation: strict, repair or off
+    :type validation: str
+    :returns: the items to link (children as lists of ids) and the issues found
+              (None when the validation is off)
+    :rtype: (pd.DataFrame, ValidationReport)
+    """
+
+    if validation not in VALIDATION_MODES:
+        raise ValueError(f"{validation} is not a validation mode, use one of {VALIDATION_MODES}")
+    if validation == "off":
+        return items_df, None
+
+    report, (kept, parents, children) = _check(items_df)
+    if validation == "strict" and not report.is_valid():
+        raise TaxonomyValidationError(report)
+
+    parents = [None if np.isnan(parent) else int(parent) for parent in parents]
+    items_df = items_df.assign(parent=pd.Series(parents, index=items_df.index, dtype=object),
+                               children=pd.Series(children, index=items_df.index, dtype=object))
+    return items_df[kept], report
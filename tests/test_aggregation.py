@@ -0,0 +1,110 @@
+from taxonomy4good.sustainabilityTaxonomy import SustainabilityTaxonomy, from_file
+from taxonomy4good.sustainabilityItem import SustainabilityItem
+from taxonomy4good.taxonomyLayout import build_layout
+from taxonomy4good.aggregation import register_aggregation, unregister_aggregation, get_aggregation
+import numpy as np
+import unittest
+
+
+def small_taxonomy():
+    """root -> a (weight 2) -> [a1 (score 1, weight 1), a2 (score 3, weight 3)]
+            -> b (score 4, weight 1)"""
+
+    root = SustainabilityItem(0, "root")
+    a = SustainabilityItem(1, "a", weight=2, parent=root)
+    b = SustainabilityItem(2, "b", score=4, weight=1, parent=root)
+    a1 = SustainabilityItem(3, "a1", score=1, weight=1, parent=a)
+    a2 = SustainabilityItem(4, "a2", score=3, weight=3, parent=a)
+    root.children = [a, b]
+    a.children = [a1, a2]
+    return SustainabilityTaxonomy(root)
+
+
+class TestAggregation(unittest.TestCase):
+    def test_builtin_aggregations(self):
+        expected = {
+            # a = 1 + 9 = 10, root = 10 + 4 (weight of a ignored)
+            "sum": (14, 10),
+            # a = 10, root = 2 * 10 + 4
+            "weighted_sum": (24, 10),
+            # a = 10 / 4, root = (2 * 2.5 + 4) / 3
+            "weighted_mean": (3, 2.5),
+            "mean": (3, 2),
+            "max": (4, 3),
+            "min": (1, 1),
+        }
+        for aggregation, (root_score, a_score) in expected.items():
+            taxonomy = small_taxonomy()
+            with self.subTest(aggregation=aggregation):
+                self.assertAlmostEqual(taxonomy.compute_scores(aggregation=aggregation), root_score)
+                self.assertAlmostEqual(taxonomy.get_level_scores(1, aggregation=aggregation)["a"], a_score)
+
+    def test_empty_children(self):
+        # b keeps an empty list of children: not a leaf, it scores 0 whatever its score
+        expected = {"sum": 10, "weighted_sum": 20, "weighted_mean": 5 / 3, "mean": 1, "max": 3, "min": 0}
+        for aggregation, root_score in expected.items():
+            taxonomy = small_taxonomy()
+            taxonomy.search_by_id(2)[0].children = []
+            with self.subTest(aggregation=aggregation):
+                self.assertAlmostEqual(taxonomy.compute_scores(aggregation=aggregation), root_score)
+                self.assertEqual(taxonomy.get_level_scores(1, aggregation=aggregation)["b"], 0)
+
+    def test_sum_matches_recursion(self):
+        taxonomy = from_file("sample.xlsx")
+        rng = np.random.default_rng(0)
+        for item in taxonomy.get_items():
+            item.score = float(rng.integers(0, 10))
+            item.weight = float(rng.integers(1, 4))
+        layout = build_layout(taxonomy.root)
+        rolled_up = layout.rollup_scores()
+        with self.subTest():
+            self.assertAlmostEqual(float(rolled_up[0]), taxonomy.compute_scores())
+        with self.subTest():
+            self.assertAlmostEqual(float(layout.rollup_scores(aggregation="weighted_sum")[0]),
+                                   weighted_sum(taxonomy.root))
+
+    def test_custom_ufunc(self):
+        register_aggregation("product", np.multiply, weighted=True)
+        try:
+            taxonomy = small_taxonomy()
+            with self.subTest():
+                # a = 1 * 9, root = 18 * 4
+                self.assertAlmostEqual(taxonomy.compute_scores(aggregation="product"), 72)
+            with self.subTest():
+                self.assertEqual(get_aggregation("product").name, "product")
+        finally:
+            unregister_aggregation("product")
+        with self.subTest():
+            with self.assertRaises(ValueError):
+                get_aggregation("product")
+
+    def test_invalid_registrations(self):
+        with self.subTest():
+            with self.assertRaises(ValueError):
+                register_aggregation("sum", np.add)
+        with self.subTest():
+            with self.assertRaises(ValueError):
+                register_aggregation("negative", np.negative)
+        with self.subTest():
+            with self.assertRaises(ValueError):
+                small_taxonomy().compute_scores(aggregation="median")
+
+    def test_frozen(self):
+        taxonomy = small_taxonomy().freeze()
+        with self.subTest():
+            self.assertAlmostEqual(taxonomy.compute_scores(aggregation="max"), 4)
+        with self.subTest():
+            # the frozen items keep the scores of the default aggregation
+            self.assertEqual(taxonomy.compute_scores(), 14)
+
+
+def weighted_sum(item):
+    """score of an item with the weighted_sum aggregation, computed recursively"""
+
+    if item.children is None:
+        return item.score
+    return sum(child.weight * weighted_sum(child) for child in item.children)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+from taxonomy4good.sustainabilityTaxonomy import from_file
+from taxonomy4good.sustainabilityItem import SustainabilityItem
+from taxonomy4good.errors import IDNotFoundError
+import numpy as np
+import unittest
+
+
+class TestAncestry(unittest.TestCase):
+    def setUp(self):
+        self.taxonomy = from_file("sample.xlsx")
+
+    def test_is_ancestor(self):
+        with self.subTest():
+            self.assertTrue(self.taxonomy.is_ancestor(1, 3))
+        with self.subTest():
+            self.assertTrue(self.taxonomy.is_ancestor(0, 23))
+        with self.subTest():
+            self.assertFalse(self.taxonomy.is_ancestor(13, 3))
+        with self.subTest():
+            self.assertFalse(self.taxonomy.is_ancestor(3, 3))
+        with self.subTest():
+            result = self.taxonomy.is_ancestor([1, 1, 20, 2], [4, 21, 22, 5])
+            self.assertEqual(result.tolist(), [True, False, True, False])
+
+    def test_depth_and_path(self):
+        with self.subTest():
+            self.assertEqual(self.taxonomy.depth(0), 0)
+        with self.subTest():
+            self.assertEqual(self.taxonomy.depth([1, 14, 15]).tolist(), [1, 2, 3])
+        with self.subTest():
+            self.assertEqual(self.taxonomy.path_to_root(17), [17, 14, 13, 0])
+
+        with self.assertRaises(IDNotFoundError) as context:
+            self.taxonomy.depth(30)
+        self.assertTrue(context.exception)
+
+    def test_lowest_common_ancestor(self):
+        with self.subTest():
+            self.assertEqual(self.taxonomy.lowest_common_ancestor(3, 4), 2)
+        with self.subTest():
+            self.assertEqual(self.taxonomy.lowest_common_ancestor(3, 12), 1)
+        with self.subTest():
+            self.assertEqual(self.taxonomy.lowest_common_ancestor(3, 23), 0)
+        with self.subTest():
+            self.assertEqual(self.taxonomy.lowest_common_ancestor(14, 17), 14)
+        with self.subTest():
+            result = self.taxonomy.lowest_common_ancestor(np.array([11, 19, 7]), np.array([11, 15, 9]))
+            self.assertEqual(result.tolist(), [11, 14, 5])
+
+    def test_lca_against_parent_walk(self):
+        ids = sum(self.taxonomy.get_all_ids(), [])
+
+        def ancestors(item_id):
+            return self.taxonomy.path_to_root(item_id)
+
+        first, second = np.meshgrid(ids, ids)
+        result = self.taxonomy.lowest_common_ancestor(first.ravel(), second.ravel())
+        expected = [next(a for a in ancestors(x) if a in ancestors(y))
+                    for x, y in zip(first.ravel(), second.ravel())]
+        self.assertEqual(result.tolist(), expected)
+
+    def test_rebuilt_after_insertion(self):
+        self.assertEqual(self.taxonomy.depth(20), 2)
+        parent = self.taxonomy.search_by_id(21)[0]
+        self.taxonomy.insert_items(SustainabilityItem(24, "Volunteering", parent=parent))
+
+        with self.subTest():
+            self.assertTrue(self.taxonomy.is_ancestor(20, 24))
+        with self.subTest():
+            self.assertEqual(self.taxonomy.lowest_common_ancestor(24, 22), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+from benchmarks.generator import generate_frame, generate_taxonomy, level_sizes
+from benchmarks.scenarios import run_scenarios
+from benchmarks.results import compare_results
+from benchmarks.loadtest import run_loadtest
+import unittest
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_level_sizes(self):
+        sizes = level_sizes(1000, 3, 10)
+        with self.subTest():
+            self.assertEqual(sum(sizes), 1000)
+        with self.subTest():
+            self.assertEqual(sizes, sorted(sizes))
+
+    def test_generated_frame(self):
+        frame = generate_frame(500, depth=3, fanout=5, skew=1.5, seed=1)
+        with self.subTest():
+            self.assertEqual(frame.shape[0], 500)
+        with self.subTest():
+            # parents always come before their children
+            self.assertTrue((frame["parent"].dropna() < frame["id"][frame["parent"].notna()]).all())
+
+    def test_generated_taxonomy(self):
+        taxonomy = generate_taxonomy(200, depth=3, fanout=4)
+        self.assertEqual(len(taxonomy.items_to_dict()), 201)
+
+    def test_run_and_compare(self):
+        results = run_scenarios(sizes=[100], repeat=1, memory=False,
+                                names=["compute_scores", "to_dataframe"])
+        document = {"results": results}
+        with self.subTest():
+            self.assertEqual([r["scenario"] for r in results], ["compute_scores", "to_dataframe"])
+        with self.subTest():
+            self.assertEqual(compare_results(document, document), [])
+
+    def test_loadtest(self):
+        results = run_loadtest(taxonomy="sample.xlsx", n_requests=200, concurrency=4, cache_sizes=(0, 64))
+        with self.subTest():
+            self.assertEqual([r["cache_size"] for r in results], [0, 64])
+        with self.subTest():
+            self.assertTrue(all(r["throughput"] > 0 for r in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
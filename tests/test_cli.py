@@ -0,0 +1,72 @@
+from taxonomy4good.sustainabilityTaxonomy import from_file
+from taxonomy4good.cli import main, taxonomy_frame, load_taxonomy
+import pandas as pd
+import numpy as np
+import contextlib
+import tempfile
+import unittest
+import io
+import os
+
+
+class TestCLI(unittest.TestCase):
+    def setUp(self):
+        self.taxonomy = from_file("sample.xlsx", meta=True)
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_convert_round_trip(self):
+        for extension in ["csv", "json", "xlsx"]:
+            target = self.path(f"converted.{extension}")
+            with self.subTest(extension=extension):
+                self.assertEqual(main(["convert", "sample.xlsx", target, "--meta"]), 0)
+            converted = load_taxonomy(target, meta=True)
+            with self.subTest(extension=extension):
+                self.assertTrue(converted.diff(self.taxonomy).is_empty())
+            with self.subTest(extension=extension):
+                self.assertEqual(taxonomy_frame(converted).fillna(-1).to_dict("records"),
+                                 taxonomy_frame(self.taxonomy).fillna(-1).to_dict("records"))
+
+    def test_unsupported_extension(self):
+        with contextlib.redirect_stderr(io.StringIO()) as error:
+            self.assertEqual(main(["convert", "sample.xlsx", self.path("taxonomy.txt")]), 1)
+        self.assertIn(".txt", error.getvalue())
+
+    def test_summary(self):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(main(["summary", "sample.xlsx"]), 0)
+        self.assertIn("Items per level: [1, 2, 5, 16]", output.getvalue())
+
+    def test_score_streaming(self):
+        leaves = [3, 4, 6, 7, 8, 9, 11, 12, 15, 16, 17, 18, 19, 21, 22, 23]
+        rng = np.random.default_rng(0)
+        scores = pd.DataFrame(rng.integers(0, 10, size=(7, len(leaves))), columns=[str(leaf) for leaf in leaves])
+        scores.insert(0, "company", [f"company {i}" for i in range(7)])
+        scores.to_csv(self.path("scores.csv"), index=False)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(main(["score", "sample.xlsx", self.path("scores.csv"), self.path("out.csv"),
+                                   "--chunksize", "3"]), 0)
+        result = pd.read_csv(self.path("out.csv"))
+
+        with self.subTest():
+            self.assertEqual(list(result.columns), ["company", "score", "Environment", "Social"])
+        with self.subTest():
+            self.assertEqual(result["company"].tolist(), scores["company"].tolist())
+        for row in range(7):
+            taxonomy = from_file("sample.xlsx")
+            for item in taxonomy.search_by_id(leaves):
+                item.score = scores[str(item.id)][row]
+            with self.subTest(row=row):
+                self.assertAlmostEqual(result["score"][row], taxonomy.compute_scores())
+            with self.subTest(row=row):
+                self.assertAlmostEqual(result["Social"][row], taxonomy.get_level_scores(1)["Social"])
+
+
+if __name__ == '__main__':
+    unittest.main()
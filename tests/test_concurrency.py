@@ -0,0 +1,183 @@
+from taxonomy4good.sustainabilityTaxonomy import SustainabilityTaxonomy, from_file
+from taxonomy4good.sustainabilityItem import SustainabilityItem
+from taxonomy4good.concurrency import ReadWriteLock
+from taxonomy4good.errors import FrozenTaxonomyError
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import threading
+import unittest
+import sys
+import io
+
+
+def large_taxonomy(groups, leaves):
+    """root -> groups -> leaves, the ids of the leaves decreasing in DFS order"""
+
+    root = SustainabilityItem(0, "root")
+    root.children = []
+    next_id = groups * (leaves + 1)
+    for group_id in range(1, groups + 1):
+        group = SustainabilityItem(group_id, f"group {group_id}", level=1, parent=root)
+        group.children = [SustainabilityItem(id, f"leaf {id}", level=2, score=id % 4 + 1, parent=group)
+                          for id in range(next_id, next_id - leaves, -1)]
+        next_id -= leaves
+        root.children.append(group)
+    return SustainabilityTaxonomy(root)
+
+
+class TestConcurrency(unittest.TestCase):
+    def setUp(self):
+        self.taxonomy = from_file("sample.xlsx")
+        for item in self.taxonomy.get_items():
+            if item.children is None:
+                item.score = item.id % 4 + 1
+
+    def test_frozen_is_immutable(self):
+        self.taxonomy.freeze()
+        item = self.taxonomy.search_by_id(3)[0]
+        with self.subTest():
+            with self.assertRaises(FrozenTaxonomyError):
+                item.score = 10
+        with self.subTest():
+            with self.assertRaises(FrozenTaxonomyError):
+                item.parent.children.append(SustainabilityItem(24, "New"))
+        with self.subTest():
+            with self.assertRaises(FrozenTaxonomyError):
+                self.taxonomy.remove_by_id(3)
+        with self.subTest():
+            with self.assertRaises(FrozenTaxonomyError):
+                self.taxonomy.update_item(3, weight=2)
+        with self.subTest():
+            self.assertTrue(self.taxonomy.is_frozen)
+
+    def test_frozen_scores(self):
+        expected_root = self.taxonomy.compute_scores()
+        expected_level = self.taxonomy.get_level_scores(2)
+        fingerprint = self.taxonomy.root.fingerprint
+        self.taxonomy.freeze()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.taxonomy.summary()
+            self.taxonomy.print_hierarchy()
+        with self.subTest():
+            self.assertEqual(self.taxonomy.compute_scores(), expected_root)
+        with self.subTest():
+            self.assertEqual(self.taxonomy.get_level_scores(2), expected_level)
+        with self.subTest():
+            self.assertEqual(self.taxonomy.compute_scores(self.taxonomy.search_by_id(3)[0]), 4)
+        with self.subTest():
+            self.assertEqual(self.taxonomy.root.fingerprint, fingerprint)
+
+    def test_concurrent_frozen_reads(self):
+        expected_root = self.taxonomy.compute_scores()
+        expected_level = self.taxonomy.get_level_scores(1)
+        self.taxonomy.freeze()
+
+        def read(i):
+            item_id = i % 23 + 1
+            results = [self.taxonomy.compute_scores() == expected_root,
+                       self.taxonomy.get_level_scores(1) == expected_level,
+                       self.taxonomy.search_by_id(item_id)[0].id == item_id,
+                       "Donations" in self.taxonomy.search_similar_names("don"),
+                       self.taxonomy.lowest_common_ancestor(3, 4) == 2,
+                       list(self.taxonomy.query({"level": 1})) == [1, 13]]
+            return all(results)
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(read, range(400)))
+        self.assertTrue(all(results))
+
+    def test_lazy_indexes_after_freeze(self):
+        # every thread hits the indexes left to build on first use at the same time,
+        # switching threads as often as possible so that the builds overlap
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, switch_interval)
+        for round in range(5):
+            taxonomy = large_taxonomy(groups=20, leaves=1000)
+            taxonomy.enable_dfs_storage()
+            taxonomy.freeze()
+            barrier = threading.Barrier(8)
+
+            def read(i):
+                leaf = 21 + 997 * i
+                barrier.wait()
+                item = taxonomy.search_by_id(leaf)[0]
+                results = [item.id == leaf,
+                           taxonomy.depth(leaf) == 2,
+                           taxonomy.is_ancestor(item.parent.id, leaf),
+                           taxonomy.lowest_common_ancestor(leaf, item.parent.id) == item.parent.id,
+                           list(taxonomy.query({"level": 1})) == list(range(1, 21))]
+                engine = taxonomy.scenario_engine()
+                results.append(engine.evaluate(engine.base_weights).root_scores[0] == taxonomy.compute_scores())
+                return all(results)
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(read, range(8)))
+            with self.subTest(round=round):
+                self.assertTrue(all(results))
+
+    def test_locked_readers_and_writers(self):
+        self.taxonomy.enable_locking()
+        leaves = [item.id for item in self.taxonomy.get_items() if item.children is None]
+        errors = []
+
+        def write(i):
+            self.taxonomy.update_item(leaves[i % len(leaves)], score=i % 7)
+
+        def read(i):
+            # the root score is always the sum of the level scores, both read under
+            # one lock (writers may run between two locked calls)
+            with self.taxonomy._lock.writing():
+                level_scores = self.taxonomy.get_level_scores(1)
+                root_score = self.taxonomy.compute_scores()
+            if abs(root_score - sum(level_scores.values())) > 1e-9:
+                errors.append(i)
+            self.taxonomy.search_by_id(leaves[i % len(leaves)])
+
+        def work(i):
+            return write(i) if i % 4 == 0 else read(i)
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            list(executor.map(work, range(400)))
+
+        self.assertEqual(errors, [])
+
+    def test_lock_writer_priority_and_upgrade(self):
+        lock = ReadWriteLock()
+        order = []
+        reading = threading.Event()
+        release = threading.Event()
+
+        def reader():
+            with lock.reading():
+                reading.set()
+                release.wait()
+                order.append("first reader")
+
+        def writer():
+            with lock.writing():
+                order.append("writer")
+
+        first = threading.Thread(target=reader)
+        first.start()
+        reading.wait()
+        second = threading.Thread(target=writer)
+        second.start()
+        while not lock._waiting_writers:
+            pass
+        release.set()
+        first.join()
+        second.join()
+
+        with self.subTest():
+            self.assertEqual(order, ["first reader", "writer"])
+        with self.subTest():
+            with lock.reading():
+                with self.assertRaises(RuntimeError):
+                    with lock.writing():
+                        pass
+
+
+if __name__ == '__main__':
+    unittest.main()
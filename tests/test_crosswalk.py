@@ -0,0 +1,75 @@
+from taxonomy4good.sustainabilityTaxonomy import SustainabilityTaxonomy, from_file
+from taxonomy4good.sustainabilityItem import SustainabilityItem
+from taxonomy4good.crosswalk import build_crosswalk, read_crosswalk, normalise_name
+import tempfile
+import unittest
+import os
+
+
+def create_taxonomy(name, terms):
+    root = SustainabilityItem(0, name)
+    root.children = [SustainabilityItem(i, term, level=1, parent=root)
+                     for i, term in enumerate(terms, start=1)]
+    return SustainabilityTaxonomy(root, version_name=name)
+
+
+first = create_taxonomy("first", ["Climate Change", "Clean Water & Sanitation", "Air Quality Management",
+                                  "Donations"])
+second = create_taxonomy("second", ["Climate change", "clean water and sanitation", "Air Quality",
+                                    "Climate Change", "Gender Equality"])
+
+
+class TestCrosswalk(unittest.TestCase):
+    def test_normalise(self):
+        with self.subTest():
+            self.assertEqual(normalise_name("Clean Water & Sanitation"), "clean water and sanitation")
+        with self.subTest():
+            self.assertEqual(normalise_name("Renewable Énergies"), "renewable energy")
+
+    def test_matches(self):
+        crosswalk = build_crosswalk([first, second])
+        methods = {(row.source_id, row.target_id): row.method
+                   for row in crosswalk.to_dataframe().itertuples()}
+
+        with self.subTest():
+            self.assertEqual(methods, {(1, 4): "exact", (1, 1): "normalised",
+                                       (2, 2): "normalised", (3, 3): "token"})
+
+    def test_lookup_both_directions(self):
+        crosswalk = build_crosswalk({"first": first, "second": second})
+
+        with self.subTest():
+            self.assertEqual([match["id"] for match in crosswalk.lookup("first", 1)], [4, 1])
+        with self.subTest():
+            self.assertEqual([match["id"] for match in crosswalk.lookup("second", 3)], [3])
+        with self.subTest():
+            self.assertEqual(crosswalk.lookup("second", 5), [])
+        with self.subTest():
+            self.assertEqual(crosswalk.lookup("first", 1, target_taxonomy="third"), [])
+
+    def test_list_of_files(self):
+        world_bank, lexicon = from_file("world_bank_taxonomy"), from_file("en_master_lexicon")
+        crosswalk = build_crosswalk([world_bank, lexicon])
+        expected = build_crosswalk({"World Bank Taxonomy": world_bank, "Full Sustainability Lexicon": lexicon})
+        with self.subTest():
+            self.assertGreater(len(crosswalk), 0)
+        with self.subTest():
+            self.assertTrue(crosswalk.to_dataframe().equals(expected.to_dataframe()))
+        with self.subTest():
+            with self.assertRaises(ValueError):
+                build_crosswalk([from_file("sample.xlsx"), from_file("sample.xlsx")])
+
+    def test_persistence(self):
+        crosswalk = build_crosswalk([first, second])
+        with tempfile.TemporaryDirectory() as directory:
+            crosswalk.to_csv(os.path.join(directory, "crosswalk"))
+            loaded = read_crosswalk(os.path.join(directory, "crosswalk.csv"))
+
+        with self.subTest():
+            self.assertEqual(len(loaded), len(crosswalk))
+        with self.subTest():
+            self.assertEqual(loaded.lookup("second", 3), crosswalk.lookup("second", 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+from taxonomy4good.sustainabilityTaxonomy import from_file
+from taxonomy4good.sustainabilityItem import SustainabilityItem
+import unittest
+
+
+class TestDFSStorage(unittest.TestCase):
+    def setUp(self):
+        self.taxonomy = from_file("sample.xlsx")
+        self.reference = from_file("sample.xlsx")
+        self.taxonomy.enable_dfs_storage()
+
+    def test_same_items_as_traversal(self):
+        for item_id in [0, 1, 2, 13, 14, 20]:
+            start_root = self.taxonomy.search_by_id(item_id)[0]
+            reference_root = self.reference.search_by_id(item_id)[0]
+            with self.subTest(item_id=item_id):
+                self.assertEqual(sorted(item.id for item in self.taxonomy.get_items(start_root)),
+                                 sorted(item.id for item in self.reference.get_items(reference_root)))
+            with self.subTest(item_id=item_id):
+                self.assertEqual(self.taxonomy.count_items(start_root),
+                                 self.reference.count_items(reference_root))
+
+    def test_pre_order(self):
+        environment = self.taxonomy.search_by_id(1)[0]
+        with self.subTest():
+            self.assertEqual([item.id for item in self.taxonomy.get_items(environment)][:5],
+                             [1, 2, 3, 4, 5])
+        with self.subTest():
+            self.assertEqual(self.taxonomy.get_terms(environment)[:2], ["Environment", "Air quality"])
+
+    def test_scoped_search(self):
+        social = self.taxonomy.search_by_id(13)[0]
+        with self.subTest():
+            self.assertEqual(sorted(self.taxonomy.search_similar_names("o", social)),
+                             sorted(self.reference.search_similar_names("o", self.reference.search_by_id(13)[0])))
+        with self.subTest():
+            found = self.taxonomy.search_items_by_name(["em", "xyz"])
+            self.assertEqual(found[1], [])
+        with self.subTest():
+            self.assertTrue(all(self.taxonomy.is_ancestor(13, item.id)
+                                for item in self.taxonomy.search_items_by_name("a", social)[1:]))
+
+    def test_direct_modification(self):
+        self.assertEqual(self.taxonomy.count_items(), 24)
+        leaf = self.taxonomy.search_by_id(22)[0]
+        leaf.children = [SustainabilityItem(24, "Volunteering", parent=leaf)]
+        leaf.children[0].name = "Volunteer work"
+
+        with self.subTest():
+            self.assertEqual(self.taxonomy.count_items(), 25)
+        with self.subTest():
+            self.assertEqual(self.taxonomy.search_similar_names("volunteer"), ["Volunteer work"])
+
+    def test_disable(self):
+        self.taxonomy.disable_dfs_storage()
+        self.assertEqual([item.id for item in self.taxonomy.get_items()],
+                         [item.id for item in self.reference.get_items()])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+from taxonomy4good.sustainabilityTaxonomy import from_file
+from taxonomy4good.export import write_csv
+from taxonomy4good.traversal import traverse
+import pandas as pd
+import tempfile
+import unittest
+import os
+
+
+class TestStreamingExport(unittest.TestCase):
+    def setUp(self):
+        self.taxonomy = from_file("sample.xlsx", meta=True)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "taxonomy")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_csv(self):
+        self.taxonomy.to_csv(self.path)
+        expected = pd.read_csv(f"{self.path}.csv", index_col=0)
+        self.taxonomy.to_csv(self.path, chunk_size=5)
+        streamed = pd.read_csv(f"{self.path}.csv", index_col=0)
+        with self.subTest():
+            self.assertEqual(list(streamed.columns), list(expected.columns))
+        with self.subTest():
+            self.assertTrue(streamed.drop(columns="parent").fillna(-1).equals(
+                expected.drop(columns="parent").fillna(-1)))
+        with self.subTest():
+            # parents are written as integers instead of floats
+            self.assertEqual(streamed["parent"].fillna(-1).tolist(), expected["parent"].fillna(-1).tolist())
+
+    def test_compression(self):
+        social = self.taxonomy.search_by_id(13)[0]
+        self.taxonomy.to_csv(self.path, start_root=social, compression="gzip")
+        streamed = pd.read_csv(f"{self.path}.csv.gz", index_col=0)
+        self.assertEqual(sorted(streamed["id"]), list(range(13, 24)))
+
+        with self.assertRaises(ValueError):
+            write_csv([], self.path, compression="zip")
+
+    def test_excel(self):
+        self.taxonomy.to_excel(self.path)
+        expected = pd.read_excel(f"{self.path}.xlsx", index_col=0)
+        self.taxonomy.to_excel(self.path, write_only=True)
+        streamed = pd.read_excel(f"{self.path}.xlsx", index_col=0)
+        with self.subTest():
+            self.assertEqual(list(streamed.columns), list(expected.columns))
+        with self.subTest():
+            self.assertTrue(streamed.fillna(-1).equals(expected.fillna(-1)))
+
+    def test_chunks_written_progressively(self):
+        sizes = []
+        path = f"{self.path}.csv"
+
+        def items():
+            for i, item in enumerate(traverse(self.taxonomy.root)):
+                if i in (4, 9):
+                    sizes.append(os.path.getsize(path))
+                yield item
+
+        self.assertEqual(write_csv(items(), path, chunk_size=4), 24)
+        with self.subTest():
+            self.assertGreater(sizes[0], 0)
+        with self.subTest():
+            self.assertGreater(sizes[1], sizes[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+from taxonomy4good.sustainabilityTaxonomy import from_file, from_files
+from taxonomy4good.taxonomySnapshot import TaxonomySnapshot
+import tempfile
+import unittest
+
+
+class TestFromFiles(unittest.TestCase):
+    def setUp(self):
+        self.reference = from_file("sample.xlsx", meta=True)
+
+    def test_parallel_load(self):
+        taxonomies = from_files(["sample.xlsx", "sample.xlsx", "sample.xlsx"], workers=2, meta=True)
+        with self.subTest():
+            self.assertEqual(len(taxonomies), 3)
+        for taxonomy in taxonomies:
+            with self.subTest():
+                self.assertTrue(taxonomy.diff(self.reference).is_empty())
+            with self.subTest():
+                self.assertTrue(taxonomy.to_dataframe().equals(self.reference.to_dataframe()))
+            with self.subTest():
+                self.assertEqual(taxonomy.compute_scores(), self.reference.compute_scores())
+
+    def test_version_names(self):
+        taxonomies = from_files(["sample.xlsx", "sample.xlsx"], workers=1, version_names=["First", "Second"])
+        with self.subTest():
+            self.assertEqual([taxonomy.root.name for taxonomy in taxonomies], ["First", "Second"])
+        with self.assertRaises(ValueError):
+            from_files(["sample.xlsx"], version_names=["First", "Second"])
+
+    def test_snapshots(self):
+        with tempfile.TemporaryDirectory() as directory:
+            snapshots = from_files(["sample.xlsx", "sample.xlsx"], workers=2, snapshot_dir=directory)
+            with self.subTest():
+                self.assertTrue(all(isinstance(snapshot, TaxonomySnapshot) for snapshot in snapshots))
+            with self.subTest():
+                self.assertEqual(sorted(snapshots[1].get_terms()), sorted(self.reference.get_terms()))
+            for snapshot in snapshots:
+                snapshot.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+from taxonomy4good.sustainabilityTaxonomy import SustainabilityTaxonomy, from_file
+from taxonomy4good import instrumentation
+import unittest
+
+test_taxonomy = from_file("sample.xlsx")
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_disabled_by_default(self):
+        events = []
+        instrumentation.add_sink(events.append)
+        try:
+            test_taxonomy.get_items()
+        finally:
+            instrumentation.remove_sink(events.append)
+        self.assertEqual(events, [])
+
+    def test_no_wrapper_when_disabled(self):
+        method = SustainabilityTaxonomy.__dict__["get_items"]
+        with instrumentation.profile():
+            with self.subTest():
+                self.assertIsNot(SustainabilityTaxonomy.__dict__["get_items"], method)
+        with self.subTest():
+            # the instrumentation wrapper is removed again
+            self.assertIs(SustainabilityTaxonomy.__dict__["get_items"], method)
+
+    def test_profile_methods(self):
+        with instrumentation.profile() as collector:
+            test_taxonomy.compute_scores()
+            test_taxonomy.get_items()
+            test_taxonomy.get_items()
+
+        report = collector.report()
+        with self.subTest():
+            # recursive calls are recorded once
+            self.assertEqual(report.loc["SustainabilityTaxonomy.compute_scores", "calls"], 1)
+        with self.subTest():
+            self.assertEqual(report.loc["SustainabilityTaxonomy.compute_scores", "nodes_visited"], 24)
+        with self.subTest():
+            self.assertEqual(report.loc["SustainabilityTaxonomy.get_items", "calls"], 2)
+        with self.subTest():
+            self.assertFalse(instrumentation.is_enabled())
+
+    def test_loader_phases(self):
+        with instrumentation.profile() as collector:
+            from_file("sample.xlsx")
+
+        report = collector.report()
+        for name in ["from_file", "from_file.read", "from_file.normalise", "from_file.link"]:
+            with self.subTest(name):
+                self.assertIn(name, report.index)
+        with self.subTest():
+            self.assertEqual(report.loc["from_file.link", "kind"], "phase")
+        with self.subTest():
+            self.assertEqual(report.loc["from_file", "nodes_visited"], 24)
+
+    def test_custom_sink(self):
+        events = []
+        instrumentation.add_sink(events.append)
+        instrumentation.enable()
+        try:
+            test_taxonomy.get_level_items(1)
+        finally:
+            instrumentation.disable()
+            instrumentation.remove_sink(events.append)
+
+        names = [event.name for event in events]
+        with self.subTest():
+            self.assertEqual(names[-1], "SustainabilityTaxonomy.get_level_items")
+        with self.subTest():
+            self.assertIn("SustainabilityTaxonomy.get_items_each_level", names)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+from taxonomy4good.sustainabilityTaxonomy import from_file
+from taxonomy4good.sustainabilityItem import SustainabilityItem
+from taxonomy4good.journal import TaxonomyJournal, recover_taxonomy
+import tempfile
+import unittest
+import os
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.taxonomy = from_file("sample.xlsx", meta=True)
+        self.journal = TaxonomyJournal(self.directory.name)
+        self.taxonomy.attach_journal(self.journal)
+
+    def tearDown(self):
+        self.journal.close()
+        self.directory.cleanup()
+
+    def edit(self):
+        charity = self.taxonomy.search_by_id(21)[0]
+        volunteering = SustainabilityItem(24, "Volunteering", level=4, parent=charity, score=2)
+        volunteering.children = [SustainabilityItem(25, "Mentoring", level=5, parent=volunteering, score=4)]
+        self.taxonomy.insert_items(volunteering)
+        self.taxonomy.update_item(3, score=5, weight=0.5)
+        self.taxonomy.update_item(25, name="Mentoring programmes")
+        self.taxonomy.remove_by_id([10])
+
+        other = recover_taxonomy_copy(self.taxonomy)
+        other.search_by_id(9)[0].name = "COP 26"
+        self.taxonomy.merge(self.taxonomy.diff(other))
+
+    def test_recover(self):
+        self.edit()
+        self.journal.close()
+
+        recovered = recover_taxonomy(self.directory.name)
+        with self.subTest():
+            self.assertTrue(recovered.diff(self.taxonomy).is_empty())
+        with self.subTest():
+            self.assertEqual(recovered.compute_scores(), self.taxonomy.compute_scores())
+        with self.subTest():
+            self.assertEqual(recovered.version_name, self.taxonomy.version_name)
+        with self.subTest():
+            self.assertEqual(recovered.search_by_id(2)[0].meta_data, self.taxonomy.search_by_id(2)[0].meta_data)
+
+        # modifications of the recovered taxonomy are logged in the same journal
+        recovered.update_item(4, score=1)
+        recovered._journal.close()
+        self.assertEqual(recover_taxonomy(self.directory.name).search_by_id(4)[0].score, 1)
+
+    def test_audit_trail(self):
+        self.edit()
+        entries = list(self.journal.entries())
+        with self.subTest():
+            self.assertEqual([entry["operation"] for entry in entries],
+                             ["insert", "update", "update", "remove", "merge"])
+        with self.subTest():
+            self.assertEqual([record["id"] for record in entries[0]["items"]], [24, 25])
+        with self.subTest():
+            self.assertEqual(list(self.journal.to_dataframe()["sequence"]), [1, 2, 3, 4, 5])
+        with self.subTest():
+            self.assertEqual(TaxonomyJournal(self.directory.name).sequence, 5)
+
+    def test_checkpoints(self):
+        self.journal.checkpoint_every = 2
+        self.edit()
+        checkpoint = self.journal.read_checkpoint()
+        with self.subTest():
+            self.assertEqual(checkpoint["sequence"], 4)
+        with self.subTest():
+            snapshots = [name for name in os.listdir(self.directory.name) if name.endswith(".t4g")]
+            self.assertEqual(snapshots, [checkpoint["snapshot"]])
+        self.journal.close()
+        with self.subTest():
+            self.assertTrue(recover_taxonomy(self.directory.name).diff(self.taxonomy).is_empty())
+
+    def test_detach(self):
+        self.journal.checkpoint_every = 1
+        self.taxonomy.detach_journal()
+        # a detached journal has no taxonomy to checkpoint
+        self.journal.record("update", id=3, attributes={"score": 5})
+        with self.subTest():
+            self.assertEqual(self.journal.read_checkpoint()["sequence"], 0)
+        self.taxonomy.attach_journal(self.journal)
+        self.taxonomy.update_item(3, score=5)
+        with self.subTest():
+            self.assertEqual(self.journal.read_checkpoint()["sequence"], 2)
+
+    def test_history_not_parsed(self):
+        self.taxonomy.update_item(3, score=5)
+        self.taxonomy.update_item(4, score=6)
+        self.journal.checkpoint()
+        self.taxonomy.update_item(5, score=7)
+        self.journal.close()
+
+        # entries logged before the checkpoint are skipped without being parsed
+        with open(self.journal.log_path, "r+b") as f:
+            lines = f.readlines()
+            f.seek(0)
+            f.write(b"".join(b"#" * (len(line) - 1) + b"\n" for line in lines[:2]))
+
+        recovered = recover_taxonomy(self.directory.name)
+        with self.subTest():
+            self.assertEqual(self.journal.read_checkpoint()["offset"], sum(len(line) for line in lines[:2]))
+        with self.subTest():
+            self.assertEqual([recovered.search_by_id(i)[0].score for i in (3, 4, 5)], [5, 6, 7])
+        recovered._journal.close()
+
+    def test_invalid_update(self):
+        with self.assertRaises(ValueError):
+            self.taxonomy.update_item(3, parent=None)
+
+
+def recover_taxonomy_copy(taxonomy):
+    copy = from_file("sample.xlsx", meta=True)
+    copy.merge(copy.diff(taxonomy))
+    return copy
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+from taxonomy4good.sustainabilityTaxonomy import from_file
+from taxonomy4good.memoization import LRUCache
+import unittest
+
+
+class TestMemoization(unittest.TestCase):
+    def setUp(self):
+        self.taxonomy = from_file("sample.xlsx")
+        self.taxonomy.enable_memoization(maxsize=8)
+
+    def test_lru_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        with self.subTest():
+            self.assertIsNone(cache.get("b"))
+        with self.subTest():
+            self.assertEqual(cache.get("a"), 1)
+
+    def test_reuse_dataframe(self):
+        first = self.taxonomy.to_dataframe()
+        second = self.taxonomy.to_dataframe()
+        with self.subTest():
+            self.assertEqual(self.taxonomy.cache_info()["hits"], 1)
+        with self.subTest():
+            self.assertTrue(first.equals(second))
+
+        # changing an item invalidates the cached result
+        self.taxonomy.search_by_id(3)[0].name = "Air pollutants"
+        third = self.taxonomy.to_dataframe()
+        with self.subTest():
+            self.assertIn("Air pollutants", third["name"].tolist())
+
+        # unchanged subtrees are still reused
+        social = self.taxonomy.search_by_id(13)[0]
+        self.taxonomy.taxonomy_to_dict(social)
+        hits = self.taxonomy.cache_info()["hits"]
+        self.taxonomy.taxonomy_to_dict(social)
+        with self.subTest():
+            self.assertEqual(self.taxonomy.cache_info()["hits"], hits + 1)
+
+    def test_reuse_scores(self):
+        ozone_layer = self.taxonomy.search_by_id(4)[0]
+        ozone_layer.score = 10
+        with self.subTest():
+            self.assertEqual(self.taxonomy.compute_scores(), 10)
+
+        hits = self.taxonomy.cache_info()["hits"]
+        with self.subTest():
+            self.assertEqual(self.taxonomy.compute_scores(), 10)
+        with self.subTest():
+            self.assertEqual(self.taxonomy.cache_info()["hits"], hits + 1)
+
+        ozone_layer.weight = 0.5
+        with self.subTest():
+            self.assertEqual(self.taxonomy.compute_scores(), 5)
+
+    def test_disable(self):
+        self.taxonomy.disable_memoization()
+        self.taxonomy.to_dataframe()
+        self.assertIsNone(self.taxonomy.cache_info())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+from taxonomy4good.sustainabilityTaxonomy import SustainabilityTaxonomy, from_file, builtin_memory_usage, \
+    BUILTIN_TAXONOMIES
+from taxonomy4good.sustainabilityItem import SustainabilityItem
+from taxonomy4good.memoryUsage import sizeof, MEMORY_COMPONENTS
+import tracemalloc
+import numpy as np
+import sys
+import unittest
+
+
+class TestMemoryUsage(unittest.TestCase):
+    def setUp(self):
+        self.taxonomy = from_file("sample.xlsx", meta=True)
+
+    def test_components(self):
+        usage = self.taxonomy.memory_usage()
+        shallow = self.taxonomy.memory_usage(deep=False)
+        with self.subTest():
+            self.assertEqual(list(usage.index), MEMORY_COMPONENTS)
+        with self.subTest():
+            self.assertTrue((usage[["nodes", "names", "meta_data", "children"]] > 0).all())
+        with self.subTest():
+            self.assertTrue((usage >= shallow).all())
+
+    def test_caches_and_indexes(self):
+        before = self.taxonomy.memory_usage()
+        self.taxonomy.enable_memoization()
+        self.taxonomy.get_items()
+        self.taxonomy.depth(16)
+        self.taxonomy.related_terms("climate")
+        after = self.taxonomy.memory_usage()
+        with self.subTest():
+            self.assertGreater(after["caches"], before["caches"])
+        with self.subTest():
+            self.assertGreater(after["indexes"], before["indexes"])
+        with self.subTest():
+            # the items referenced by the cache and indexes are not counted again
+            self.assertEqual(after[["names", "meta_data", "children"]].tolist(),
+                             before[["names", "meta_data", "children"]].tolist())
+
+    def test_against_tracemalloc(self):
+        tracemalloc.start()
+        try:
+            start = tracemalloc.get_traced_memory()[0]
+            root = SustainabilityItem(0, "root")
+            root.children = [SustainabilityItem(id, f"item {id}", level=1, parent=root, score=float(id),
+                                                meta_data={"code": f"c{id}"}) for id in range(1, 2001)]
+            allocated = tracemalloc.get_traced_memory()[0] - start
+        finally:
+            tracemalloc.stop()
+        total = SustainabilityTaxonomy(root).memory_usage().sum()
+        self.assertLess(abs(total - allocated) / allocated, 0.25)
+
+    def test_sizeof(self):
+        shared = "x" * 100
+        with self.subTest():
+            self.assertEqual(sizeof([shared, shared], set()), sys.getsizeof([shared, shared]) + sys.getsizeof(shared))
+        with self.subTest():
+            # a view is counted with the array owning its buffer
+            array = np.zeros(1000)
+            self.assertGreaterEqual(sizeof(array[10:20], set()), array.nbytes)
+        with self.subTest():
+            seen = set()
+            sizeof(shared, seen)
+            self.assertEqual(sizeof([shared], seen), sys.getsizeof([shared]))
+
+    def test_builtin_memory_usage(self):
+        footprint = builtin_memory_usage()
+        with self.subTest():
+            self.assertTrue(set(footprint.index) <= set(BUILTIN_TAXONOMIES))
+        with self.subTest():
+            self.assertEqual(footprint.loc["esg_taxonomy", "items"], 90)
+        with self.subTest():
+            self.assertTrue((footprint["total"] == footprint[MEMORY_COMPONENTS].sum(axis=1)).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
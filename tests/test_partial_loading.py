@@ -0,0 +1,105 @@
+from taxonomy4good.sustainabilityTaxonomy import from_file
+from taxonomy4good.partialLoading import select_branch
+from taxonomy4good.errors import IDNotFoundError
+from openpyxl import load_workbook
+import pandas as pd
+import tempfile
+import os
+import unittest
+
+
+def ids(taxonomy):
+    return sorted(item.id for item in taxonomy.get_items())
+
+
+class TestPartialLoading(unittest.TestCase):
+    def setUp(self):
+        self.taxonomy = from_file("sample.xlsx", meta=True)
+
+    def test_select_branch(self):
+        parents = [0, 1, 2, 2, 1, 0, 6]
+        with self.subTest():
+            self.assertEqual(select_branch(range(1, 8), parents, 2).tolist(), [1, 2, 3])
+        with self.subTest():
+            self.assertEqual(select_branch(range(1, 8), parents, max_depth=1).tolist(), [0, 5])
+        with self.subTest():
+            # cycles end the search
+            self.assertEqual(select_branch([1, 2], [2, 1], 1).tolist(), [0, 1])
+
+    def test_subtree_root(self):
+        for subtree_root in [13, 14, 16]:
+            branch = from_file("sample.xlsx", meta=True, subtree_root=subtree_root)
+            head = self.taxonomy.search_by_id(subtree_root)[0]
+            with self.subTest(subtree_root=subtree_root):
+                self.assertEqual(branch.root.children[0].fingerprint, head.fingerprint)
+            with self.subTest(subtree_root=subtree_root):
+                self.assertEqual(ids(branch), sorted([0] + [item.id for item in self.taxonomy.get_items(head)]))
+
+    def test_max_depth(self):
+        top = from_file("sample.xlsx", max_depth=2)
+        with self.subTest():
+            self.assertEqual(ids(top), [0, 1, 2, 5, 10, 13, 14, 20])
+        with self.subTest():
+            # items at max_depth have no children
+            self.assertIsNone(top.search_by_id(14)[0].children)
+        branch = from_file("sample.xlsx", subtree_root=1, max_depth=1)
+        with self.subTest():
+            self.assertEqual(ids(branch), [0, 1, 2, 5, 10])
+
+    def test_json(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sample.json")
+            pd.read_excel("sample.xlsx").to_json(path)
+            taxonomy = from_file(path, filetype="json", meta=True)
+            branch = from_file(path, filetype="json", meta=True, subtree_root=20)
+        with self.subTest():
+            self.assertEqual(ids(branch), [0, 20, 21, 22, 23])
+        with self.subTest():
+            self.assertEqual(branch.root.children[0].fingerprint, taxonomy.search_by_id(20)[0].fingerprint)
+
+    def test_excel_conversion(self):
+        items_df = pd.read_excel("sample.xlsx")
+        # numbers stored as text, a column without header and a duplicated header
+        items_df["Code"] = [str(100 + i) for i in range(len(items_df))]
+        items_df[""] = "x"
+        items_df["Code "] = None
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sample.xlsx")
+            items_df.to_excel(path, index=False)
+            workbook = load_workbook(path)
+            workbook.active["P1"] = "Code"
+            workbook.save(path)
+            taxonomy = from_file(path, meta=True)
+            branch = from_file(path, meta=True, subtree_root=13)
+        with self.subTest():
+            self.assertEqual(branch.root.children[0].fingerprint, taxonomy.search_by_id(13)[0].fingerprint)
+        with self.subTest():
+            self.assertEqual(branch.search_by_id(14)[0].meta_data["code"], 113)
+
+    def test_unordered_rows(self):
+        # children listed before their parent, in a file read in one pass
+        items_df = pd.read_excel("sample.xlsx").iloc[::-1]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sample.xlsx")
+            items_df.to_excel(path, index=False)
+            for subtree_root, max_depth in [(13, None), (1, 1), (None, 2)]:
+                branch = from_file(path, subtree_root=subtree_root, max_depth=max_depth)
+                expected = from_file("sample.xlsx", subtree_root=subtree_root, max_depth=max_depth)
+                with self.subTest(subtree_root=subtree_root, max_depth=max_depth):
+                    self.assertEqual(ids(branch), ids(expected))
+
+    def test_builtin(self):
+        taxonomy = from_file("eu_taxonomy")
+        branch = from_file("eu_taxonomy", subtree_root=9)
+        with self.subTest():
+            self.assertEqual(branch.root.children[0].fingerprint, taxonomy.search_by_id(9)[0].fingerprint)
+        with self.subTest():
+            self.assertEqual(branch.version_name, taxonomy.version_name)
+
+    def test_unknown_id(self):
+        with self.assertRaises(IDNotFoundError):
+            from_file("sample.xlsx", subtree_root=99)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+from taxonomy4good.sustainabilityTaxonomy import SustainabilityTaxonomy, from_file
+from taxonomy4good.sustainabilityItem import SustainabilityItem
+from taxonomy4good.taxonomyLayout import to_columns, from_columns
+from taxonomy4good.errors import FrozenTaxonomyError
+import pickle
+import copy
+import unittest
+
+
+def roundtrip(value):
+    return pickle.loads(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class TestPickle(unittest.TestCase):
+    def setUp(self):
+        self.taxonomy = from_file("sample.xlsx", meta=True)
+
+    def test_roundtrip(self):
+        restored = roundtrip(self.taxonomy)
+        with self.subTest():
+            self.assertEqual(restored.root.fingerprint, self.taxonomy.root.fingerprint)
+        with self.subTest():
+            self.assertEqual([item.id for item in restored.get_items()],
+                             [item.id for item in self.taxonomy.get_items()])
+        with self.subTest():
+            # parents and children are linked both ways
+            item = restored.search_by_id(16)[0]
+            self.assertIs(item.parent, restored.search_by_id(14)[0])
+            self.assertIn(item, item.parent.children)
+        with self.subTest():
+            self.assertEqual(restored.compute_scores(), self.taxonomy.compute_scores())
+
+    def test_deepcopy(self):
+        copied = copy.deepcopy(self.taxonomy)
+        copied.update_item(16, name="Recalls")
+        with self.subTest():
+            self.assertEqual(self.taxonomy.search_by_id(16)[0].name, "Product Recall")
+        with self.subTest():
+            self.assertNotEqual(copied.root.fingerprint, self.taxonomy.root.fingerprint)
+
+    def test_state(self):
+        self.taxonomy.enable_memoization(maxsize=16)
+        self.taxonomy.enable_locking()
+        self.taxonomy.freeze()
+        restored = roundtrip(self.taxonomy)
+        with self.subTest():
+            self.assertTrue(restored.is_frozen)
+        with self.subTest():
+            self.assertEqual(restored._memo.maxsize, 16)
+        with self.subTest():
+            self.assertIsNotNone(restored._lock)
+        with self.subTest():
+            with self.assertRaises(FrozenTaxonomyError):
+                restored.search_by_id(16)[0].name = "Recalls"
+
+    def test_values(self):
+        root = SustainabilityItem(0, "root", children=[])
+        leaf = SustainabilityItem(1, "leaf", score=1.5, weight=2, parent=root, children=[])
+        other = SustainabilityItem(2, "other", score=3, parent=root)
+        root.children = [leaf, other]
+        restored = from_columns(to_columns(root))
+        with self.subTest():
+            self.assertEqual(restored.children[0].children, [])
+        with self.subTest():
+            self.assertIsNone(restored.children[1].children)
+        with self.subTest():
+            self.assertEqual([type(child.score) for child in restored.children], [float, int])
+        with self.subTest():
+            self.assertEqual(type(restored.children[0].weight), int)
+
+    def test_deep_taxonomy(self):
+        root = SustainabilityItem(0, "root")
+        item = root
+        for id in range(1, 50000):
+            child = SustainabilityItem(id, f"item {id}", level=id, parent=item)
+            item.children = [child]
+            item = child
+        restored = roundtrip(SustainabilityTaxonomy(root))
+        with self.subTest():
+            self.assertEqual(restored.count_items(), 50000)
+        with self.subTest():
+            self.assertEqual(restored.search_by_id(49999)[0].parent.id, 49998)
+
+
+if __name__ == '__main__':
+    unittest.main()
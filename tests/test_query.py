@@ -0,0 +1,66 @@
+from taxonomy4good.sustainabilityTaxonomy import from_file
+from taxonomy4good.errors import InvalidQueryError
+import unittest
+
+
+class TestQuery(unittest.TestCase):
+    def setUp(self):
+        self.taxonomy = from_file("sample.xlsx", meta=True)
+        for item in self.taxonomy.get_items():
+            if item.id in (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12):
+                item.grouping = "Environmental"
+            elif item.id != 0:
+                item.grouping = "Social"
+        self.taxonomy.search_by_id(7)[0].weight = 0.5
+        self.taxonomy.search_by_id(16)[0].weight = 2
+
+    def test_equality(self):
+        with self.subTest():
+            self.assertEqual(self.taxonomy.query({"grouping": "Social", "level": 2}).tolist(), [14, 20])
+        with self.subTest():
+            self.assertEqual(self.taxonomy.query({"meta.mst id": 1}).tolist(), [2, 12])
+        with self.subTest():
+            self.assertEqual(self.taxonomy.query([("grouping", "==", None)]).tolist(), [0])
+        with self.subTest():
+            self.assertEqual(len(self.taxonomy.query({"grouping": ("!=", "Social")})), 13)
+
+    def test_membership_and_ranges(self):
+        with self.subTest():
+            self.assertEqual(self.taxonomy.query({"meta.master lexicon": {None}}).tolist(), [0, 2])
+        with self.subTest():
+            self.assertEqual(self.taxonomy.query({"weight": ("<", 1)}).tolist(), [7])
+        with self.subTest():
+            self.assertEqual(self.taxonomy.query({"weight": (">=", 1), "id": [7, 16, 22]}).tolist(), [16, 22])
+        with self.subTest():
+            self.assertEqual(self.taxonomy.query({"name": (">", "Social")}).tolist(), [0, 6, 8, 20])
+
+    def test_subtree(self):
+        climate = self.taxonomy.search_by_id(5)[0]
+        with self.subTest():
+            self.assertEqual(self.taxonomy.query({"level": 3}, start_root=climate).tolist(), [6, 7, 8, 9])
+        with self.subTest():
+            self.assertEqual(self.taxonomy.query(start_root=climate).tolist(), [5, 6, 7, 8, 9])
+        with self.subTest():
+            frame = self.taxonomy.query({"weight": ("<", 1)}, start_root=climate, output="dataframe")
+            self.assertEqual(frame[["id", "name", "parent"]].values.tolist(), [[7, "Climate Change", 5]])
+
+    def test_rebuilt_after_update(self):
+        self.assertEqual(self.taxonomy.query({"grouping": "Governance"}).tolist(), [])
+        self.taxonomy.search_by_id(23)[0].grouping = "Governance"
+        self.assertEqual(self.taxonomy.query({"grouping": "Governance"}, output="items")[0].name,
+                         "Community Outreach")
+
+    def test_invalid(self):
+        with self.subTest():
+            with self.assertRaises(InvalidQueryError):
+                self.taxonomy.query({"sector": "Energy"})
+        with self.subTest():
+            with self.assertRaises(InvalidQueryError):
+                self.taxonomy.query([("level", "~", 2)])
+        with self.subTest():
+            with self.assertRaises(InvalidQueryError):
+                self.taxonomy.query({"level": (">", "two")})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+from taxonomy4good.sustainabilityTaxonomy import from_file
+from taxonomy4good.sustainabilityItem import SustainabilityItem
+from taxonomy4good.errors import IDNotFoundError
+import numpy as np
+import unittest
+
+
+def brute_force(taxonomy, level=None, subtree=None, by="score"):
+    """(value, item) of the ranked items, sorted by decreasing value then DFS order"""
+
+    start = taxonomy.root if subtree is None else taxonomy.search_by_id(subtree)[0]
+    items = [(item, depth) for item, depth in _dfs(start)][1:]
+    depth_of_start = len(taxonomy.path_to_root(start.id)) - 1
+    ranked = []
+    for order, (item, depth) in enumerate(items):
+        if level is not None and depth + depth_of_start != level:
+            continue
+        value = item.score * item.weight if by == "weighted" else item.score
+        ranked.append((-value, order, item.id))
+    return [(item_id, -value) for value, _, item_id in sorted(ranked)]
+
+
+def _dfs(start):
+    stack = [(start, 0)]
+    while stack:
+        item, depth = stack.pop()
+        yield item, depth
+        for child in reversed(item.children or []):
+            stack.append((child, depth + 1))
+
+
+def ids_and_values(ranked):
+    return [(item.id, value) for item, value in ranked]
+
+
+class TestRanking(unittest.TestCase):
+    def setUp(self):
+        self.taxonomy = from_file("sample.xlsx")
+        self.rng = np.random.default_rng(0)
+        for item in self.taxonomy.get_items():
+            item.score = float(self.rng.integers(0, 10))
+            item.weight = float(self.rng.integers(1, 4))
+
+    def check(self, **query):
+        expected = brute_force(self.taxonomy, **query)
+        with self.subTest(**query):
+            self.assertEqual(ids_and_values(self.taxonomy.top_k(5, **query)), expected[:5])
+        with self.subTest(largest=False, **query):
+            worst = ids_and_values(self.taxonomy.top_k(5, largest=False, **query))
+            self.assertEqual([value for _, value in worst], sorted(value for _, value in expected)[:5])
+        with self.subTest(range=True, **query):
+            in_range = ids_and_values(self.taxonomy.score_range(3, 6, **query))
+            self.assertEqual(in_range, [(item_id, value) for item_id, value in expected if 3 <= value <= 6])
+
+    def test_queries(self):
+        for query in [{}, {"level": 2}, {"level": 3, "by": "weighted"}, {"subtree": 13},
+                      {"subtree": 5, "by": "weighted"}, {"subtree": 1, "level": 2}]:
+            self.check(**query)
+
+    def test_score_changes(self):
+        self.taxonomy.top_k(3)
+        index = self.taxonomy._score_index()
+        items = list(self.taxonomy.get_items())
+        for _ in range(5):
+            for item in self.rng.choice(items, size=4, replace=False):
+                if self.rng.random() < 0.5:
+                    self.taxonomy.update_item(item.id, score=float(self.rng.integers(0, 10)))
+                else:
+                    item.weight = float(self.rng.integers(1, 4))
+            self.check()
+            self.check(level=2, by="weighted")
+        self.taxonomy.compute_scores()
+        self.check(level=1)
+        with self.subTest():
+            # the index was updated rather than rebuilt
+            self.assertIs(self.taxonomy._score_index(), index)
+
+    def test_structure_changes(self):
+        self.taxonomy.top_k(3)
+        parent = self.taxonomy.search_by_id(20)[0]
+        self.taxonomy.insert_items(SustainabilityItem(24, "Volunteering", level=3, score=50, parent=parent))
+        with self.subTest():
+            self.assertEqual(self.taxonomy.top_k(1)[0][0].id, 24)
+        # children modified directly
+        parent.children.pop()
+        with self.subTest():
+            self.assertNotIn(24, [item.id for item, _ in self.taxonomy.top_k(30)])
+        self.check(level=2)
+
+    def test_edge_cases(self):
+        self.taxonomy.update_item(7, score=None)
+        with self.subTest():
+            # items without score are not ranked
+            self.assertNotIn(7, [item.id for item, _ in self.taxonomy.top_k(30)])
+        with self.subTest():
+            self.assertNotIn(7, [item.id for item, _ in self.taxonomy.score_range()])
+        with self.subTest():
+            self.assertEqual(self.taxonomy.top_k(5, level=9), [])
+        with self.subTest():
+            self.assertEqual(self.taxonomy.top_k(5, subtree=3), [])
+        with self.subTest():
+            with self.assertRaises(ValueError):
+                self.taxonomy.top_k(5, by="weight")
+        with self.subTest():
+            with self.assertRaises(IDNotFoundError):
+                self.taxonomy.top_k(5, subtree=99)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+from taxonomy4good.sustainabilityTaxonomy import from_file
+import numpy as np
+import pandas as pd
+import unittest
+
+
+class TestScenarioEngine(unittest.TestCase):
+    def setUp(self):
+        self.taxonomy = from_file("sample.xlsx")
+        for item in self.taxonomy.get_items():
+            item.score = item.id % 5 + 1
+        self.engine = self.taxonomy.scenario_engine()
+
+    def scores_with_weights(self, weights):
+        """legacy scores after setting the weights on the items"""
+
+        taxonomy = from_file("sample.xlsx")
+        for item in taxonomy.get_items():
+            item.score = item.id % 5 + 1
+        for item_id, weight in zip(self.engine.ids, weights):
+            taxonomy.search_by_id(int(item_id))[0].weight = weight
+        root_score = taxonomy.compute_scores()
+        return root_score, taxonomy.get_level_scores(2)
+
+    def test_matches_compute_scores(self):
+        rng = np.random.default_rng(1)
+        weights = rng.uniform(0, 2, size=(3, len(self.engine.ids)))
+        result = self.engine.evaluate(weights, level=2)
+
+        for k in range(3):
+            root_score, level_scores = self.scores_with_weights(weights[k])
+            with self.subTest(scenario=k):
+                self.assertAlmostEqual(result.root_scores[k], root_score)
+            with self.subTest(scenario=k):
+                self.assertEqual(dict(zip(result.level_names, result.level_scores[k].round(10))),
+                                 {name: round(score, 10) for name, score in level_scores.items()})
+
+    def test_tree_not_modified(self):
+        before = self.taxonomy.to_dataframe()
+        self.engine.evaluate(np.zeros((2, len(self.engine.ids))))
+        self.assertTrue(before.equals(self.taxonomy.to_dataframe()))
+
+    def test_dataframe_scenarios(self):
+        # only leaf weights change the scores
+        scenarios = pd.DataFrame({3: [1.0, 0.0, 1.0], 13: [1.0, 1.0, 5.0]})
+        result = self.engine.evaluate(scenarios)
+        base = self.taxonomy.compute_scores()
+        with self.subTest():
+            self.assertEqual(result.root_scores.tolist(), [base, base - 4, base])
+        with self.subTest():
+            self.assertEqual(result.level_ids.tolist(), [1, 13])
+
+    def test_empty_children(self):
+        # item 10 keeps an empty list of children: not a leaf, it scores 0
+        self.taxonomy.remove_by_id([11, 12])
+        self.taxonomy.update_item(10, score=5)
+        engine = self.taxonomy.scenario_engine()
+        result = engine.evaluate(engine.base_weights, level=2)
+        with self.subTest():
+            self.assertAlmostEqual(result.root_scores[0], self.taxonomy.compute_scores())
+        with self.subTest():
+            self.assertEqual(result.level_scores[0][result.level_ids.tolist().index(10)], 0)
+
+    def test_chunks_and_monte_carlo(self):
+        weights = np.random.default_rng(0).uniform(0, 1, size=(10, len(self.engine.ids)))
+        chunks = list(self.engine.iter_evaluate(weights, chunk_size=4))
+        with self.subTest():
+            self.assertEqual([len(chunk) for chunk in chunks], [4, 4, 2])
+        with self.subTest():
+            combined = chunks[0].concatenate(chunks)
+            self.assertTrue(np.allclose(combined.root_scores, self.engine.evaluate(weights).root_scores))
+
+        first = self.engine.monte_carlo(500, scale=0.2, seed=3, chunk_size=128)
+        second = self.engine.monte_carlo(500, scale=0.2, seed=3, chunk_size=500)
+        summary = first.summary()
+        with self.subTest():
+            self.assertEqual(len(first), 500)
+        with self.subTest():
+            self.assertEqual(list(summary.columns), ["id", "name", "mean", "std", "p5", "p50", "p95"])
+        with self.subTest():
+            self.assertEqual(summary["id"].tolist(), [0, 1, 13])
+        with self.subTest():
+            self.assertAlmostEqual(summary["mean"][0], self.taxonomy.compute_scores(), delta=1.0)
+        with self.subTest():
+            self.assertEqual(len(second), 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
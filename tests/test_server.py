@@ -0,0 +1,134 @@
+from taxonomy4good.server import TaxonomyServer
+from taxonomy4good.sustainabilityTaxonomy import from_file
+import asyncio
+import json
+import unittest
+
+
+def call(server, method, path, payload=None):
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    status, response = asyncio.run(server.handle(method, path, body))
+    return status, json.loads(response)
+
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        self.server = TaxonomyServer({"sample": "sample.xlsx"}, builtin=False)
+
+    def test_lookup(self):
+        status, items = call(self.server, "POST", "/sample/lookup", {"ids": [16, 99, 14]})
+        with self.subTest():
+            self.assertEqual(status, 200)
+        with self.subTest():
+            self.assertEqual([item["id"] if item else None for item in items], [16, None, 14])
+        with self.subTest():
+            self.assertEqual(items[2]["children"], [15, 16, 17, 18, 19])
+
+    def test_search_and_levels(self):
+        _, (found, ) = call(self.server, "POST", "/sample/search", {"terms": ["product"]})
+        with self.subTest():
+            self.assertEqual([item["id"] for item in found], [14, 16, 18])
+        _, (related, ) = call(self.server, "POST", "/sample/search",
+                              {"terms": ["climate change impacts"], "mode": "fuzzy", "k": 2})
+        with self.subTest():
+            self.assertEqual([item["id"] for item in related], [7, 5])
+        _, levels = call(self.server, "POST", "/sample/levels", {"levels": [1, 9]})
+        with self.subTest():
+            self.assertEqual([item["id"] for item in levels["1"]], [1, 13])
+        with self.subTest():
+            self.assertEqual(levels["9"], [])
+
+    def test_score(self):
+        _, scores = call(self.server, "POST", "/sample/score", {"scores": [{"3": 1, "4": 2}, {"22": 5}]})
+        expected = from_file("sample.xlsx").scenario_engine().evaluate_scores(
+            [[0] * 3 + [1, 2] + [0] * 19, [0] * 22 + [5, 0]])
+        with self.subTest():
+            self.assertEqual(scores["root"], expected.root_scores.tolist())
+        with self.subTest():
+            self.assertEqual(scores["scores"], expected.level_scores.tolist())
+
+    def test_errors(self):
+        with self.subTest():
+            self.assertEqual(call(self.server, "POST", "/eu_taxonomy/lookup", {"ids": [1]})[0], 404)
+        with self.subTest():
+            self.assertEqual(call(self.server, "POST", "/sample/unknown", {})[0], 404)
+        with self.subTest():
+            self.assertEqual(call(self.server, "GET", "/sample/lookup")[0], 405)
+        with self.subTest():
+            self.assertEqual(call(self.server, "POST", "/sample/lookup", {"id": 1})[0], 400)
+        with self.subTest():
+            self.assertEqual(call(self.server, "POST", "/sample/score", {"scores": [{"99": 1}]})[0], 400)
+        with self.subTest():
+            self.assertEqual(call(self.server, "POST", "/sample/score", {"scores": [[1, 2]]})[0], 400)
+
+    def test_prepared(self):
+        # indexes are built when the taxonomy is added, not by concurrent first requests
+        layouts = [self.server.taxonomy("sample")._layout(), self.server._engines["sample"].layout]
+        for layout in layouts:
+            with self.subTest():
+                self.assertIsNotNone(layout._id_index)
+
+    def test_cache_and_coalescing(self):
+        server = TaxonomyServer({"sample": "sample.xlsx"}, builtin=False, cache_size=0)
+        body = json.dumps({"terms": ["climate", "product"], "mode": "fuzzy"}).encode("utf-8")
+
+        async def concurrent_requests():
+            return await asyncio.gather(*[server.handle("POST", "/sample/search", body) for _ in range(20)])
+
+        responses = asyncio.run(concurrent_requests())
+        with self.subTest():
+            self.assertEqual(len({response for _, response in responses}), 1)
+        with self.subTest():
+            self.assertGreater(server.coalesced, 0)
+
+        call(self.server, "POST", "/sample/lookup", {"ids": [1]})
+        call(self.server, "POST", "/sample/lookup", {"ids": [1]})
+        with self.subTest():
+            self.assertEqual(call(self.server, "GET", "/stats")[1]["cache"]["hits"], 1)
+
+    def test_builtin(self):
+        server = TaxonomyServer()
+        with self.subTest():
+            self.assertIn("eu_taxonomy", call(server, "GET", "/taxonomies")[1])
+        call(server, "POST", "/eu_taxonomy/levels", {"levels": [1]})
+        taxonomy = server.taxonomy("eu_taxonomy")
+        call(server, "POST", "/eu_taxonomy/lookup", {"ids": [1]})
+        with self.subTest():
+            # loaded once
+            self.assertIs(server.taxonomy("eu_taxonomy"), taxonomy)
+        with self.subTest():
+            self.assertTrue(taxonomy.is_frozen)
+
+    def test_http(self):
+        async def request():
+            listener = await self.server.start("127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            responses = []
+            for ids in ([16], [14, 16]):
+                body = json.dumps({"ids": ids}).encode("utf-8")
+                writer.write(b"POST /sample/lookup HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(body) + body)
+                status = (await reader.readline()).split()[1]
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line == b"\r\n":
+                        break
+                    name, _, value = line.decode().partition(":")
+                    headers[name.lower()] = value.strip()
+                responses.append((status, json.loads(await reader.readexactly(int(headers["content-length"])))))
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+            return responses
+
+        responses = asyncio.run(request())
+        with self.subTest():
+            self.assertEqual([status for status, _ in responses], [b"200", b"200"])
+        with self.subTest():
+            # both requests were answered on the same connection
+            self.assertEqual([item["id"] for item in responses[1][1]], [14, 16])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+from taxonomy4good.sustainabilityTaxonomy import from_file
+from taxonomy4good.sustainabilityItem import SustainabilityItem
+from taxonomy4good.similarity import TfidfIndex
+from taxonomy4good.errors import IDNotFoundError
+import numpy as np
+import unittest
+
+
+def brute_force(index, items, text):
+    """cosine similarities computed with dense vectors"""
+
+    n = len(items)
+    df = {}
+    for item in items:
+        for feature in index._analyse(index._text(item)):
+            df[feature] = df.get(feature, 0) + 1
+
+    def vector(features):
+        v = {f: c * (np.log((1 + n) / (1 + df.get(f, 0))) + 1) for f, c in features.items()}
+        norm = np.sqrt(sum(w ** 2 for w in v.values()))
+        return {f: w / norm for f, w in v.items()}
+
+    query = vector(index._analyse(text))
+    return {item.id: sum(w * query.get(f, 0) for f, w in vector(index._analyse(index._text(item))).items())
+            for item in items}
+
+
+class TestSimilarity(unittest.TestCase):
+    def setUp(self):
+        self.taxonomy = from_file("sample.xlsx")
+
+    def test_related_terms(self):
+        related = self.taxonomy.related_terms("climate change impacts", k=3)
+        with self.subTest():
+            self.assertEqual([item.id for item, _ in related[:2]], [7, 5])
+        with self.subTest():
+            similarities = [similarity for _, similarity in related]
+            self.assertEqual(similarities, sorted(similarities, reverse=True))
+        with self.subTest():
+            # the root is not indexed
+            self.assertNotIn(0, [item.id for item, _ in self.taxonomy.related_terms("standard taxonomy")])
+        with self.subTest():
+            self.assertEqual(self.taxonomy.related_terms("zzzz"), [])
+
+    def test_matches_brute_force(self):
+        items = list(self.taxonomy.get_items())[1:]
+        index = TfidfIndex(items)
+        for term in ["product safety", "air", "stakeholder charity donations"]:
+            expected = brute_force(index, items, term)
+            with self.subTest(term=term):
+                for item, similarity in index.query_terms([term], k=len(items))[0]:
+                    self.assertAlmostEqual(similarity, expected[item.id])
+
+    def test_batch(self):
+        terms = ["product recall", "ozone", "flood"]
+        batch = self.taxonomy.related_terms(terms, k=4)
+        with self.subTest():
+            self.assertEqual(len(batch), 3)
+        for term, related in zip(terms, batch):
+            with self.subTest(term=term):
+                self.assertEqual(related, self.taxonomy.related_terms(term, k=4))
+
+    def test_related_items(self):
+        related = self.taxonomy.related_items(18, k=3)
+        with self.subTest():
+            self.assertNotIn(18, [item.id for item, _ in related])
+        with self.subTest():
+            # Product Safety: Product Quality and Safety, Product Recall
+            self.assertEqual({item.id for item, _ in related[:2]}, {14, 16})
+        with self.subTest():
+            with self.assertRaises(IDNotFoundError):
+                self.taxonomy.related_items([19, 99])
+
+    def test_incremental_updates(self):
+        index = self.taxonomy._similarity_index(None)
+        parent = self.taxonomy.search_by_id(5)[0]
+        self.taxonomy.insert_items(SustainabilityItem(24, "Climate adaptation", level=3, parent=parent))
+        self.taxonomy.remove_by_id(20)
+        self.taxonomy.update_item(3, name="Carbon emissions")
+
+        with self.subTest():
+            # the index was updated rather than rebuilt
+            self.assertIs(self.taxonomy._similarity_index(None), index)
+        fresh = TfidfIndex(list(self.taxonomy.get_items())[1:])
+        for term in ["climate", "charity", "emissions", "quality"]:
+            with self.subTest(term=term):
+                self.assertEqual(sorted((item.id, round(similarity, 10)) for item, similarity in
+                                        self.taxonomy.related_terms(term, k=30)),
+                                 sorted((item.id, round(similarity, 10)) for item, similarity in
+                                        fresh.query_terms([term], k=30)[0]))
+
+    def test_meta_fields(self):
+        taxonomy = from_file("sample.xlsx", meta=True)
+        taxonomy.update_item(22, meta_data={"master lexicon": "philanthropy"})
+        with self.subTest():
+            self.assertEqual(taxonomy.related_terms("philanthropy"), [])
+        with self.subTest():
+            related = taxonomy.related_terms("philanthropy", meta_fields=["master lexicon"])
+            self.assertEqual(related[0][0].id, 22)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 import pytest
-from taxonomy4good.sustainabilityItem import SustainabilityItem
+from taxonomy4good.sustainabilityItem import SustainabilityItem, ChildList
 
 root = SustainabilityItem(0, "root")
 item1 = SustainabilityItem(1, "item1", level=1, parent=root)
@@ -45,6 +45,49 @@ class TestItems(unittest.TestCase):
         with self.subTest():
             self.assertEqual(item1.weight, 0.10)
 
+    def test_fingerprint(self):
+        parent = SustainabilityItem(10, "parent")
+        child1 = SustainabilityItem(11, "child1", parent=parent)
+        child2 = SustainabilityItem(12, "child2", parent=parent)
+        parent.children = [child1, child2]
+        fingerprint = parent.fingerprint
+
+        with self.subTest():
+            # same content, same fingerprint
+            copy = SustainabilityItem(10, "parent")
+            copy.children = [SustainabilityItem(11, "child1", parent=copy),
+                             SustainabilityItem(12, "child2", parent=copy)]
+            self.assertEqual(copy.fingerprint, fingerprint)
+
+        child2.weight = 0.5
+        with self.subTest():
+            self.assertNotEqual(parent.fingerprint, fingerprint)
+
+        child2.weight = 1
+        with self.subTest():
+            self.assertEqual(parent.fingerprint, fingerprint)
+
+        parent.children.append(SustainabilityItem(13, "child3", parent=parent))
+        with self.subTest():
+            self.assertNotEqual(parent.fingerprint, fingerprint)
+
+        parent.children.pop()
+        with self.subTest():
+            self.assertEqual(parent.fingerprint, fingerprint)
+
+    def test_fingerprint_bookkeeping(self):
+        parent = SustainabilityItem(10, "parent")
+        parent.children = [SustainabilityItem(11, "child1", parent=parent)]
+        with self.subTest():
+            # nothing to keep up to date before the fingerprint is computed
+            self.assertNotIsInstance(parent.children, ChildList)
+        fingerprint = parent.fingerprint
+        with self.subTest():
+            self.assertIsInstance(parent.children, ChildList)
+        parent.children[0].name = "child"
+        with self.subTest():
+            self.assertNotEqual(parent.fingerprint, fingerprint)
+
 
 if __name__ == '__main__':
     unittest.main()
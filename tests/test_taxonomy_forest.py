@@ -0,0 +1,89 @@
+from taxonomy4good.taxonomyForest import TaxonomyForest, builtin_forest
+from taxonomy4good.sustainabilityTaxonomy import from_file
+from taxonomy4good.errors import FrozenTaxonomyError
+import unittest
+
+
+class TestTaxonomyForest(unittest.TestCase):
+    def setUp(self):
+        self.first = from_file("sample.xlsx")
+        self.second = from_file("sample.xlsx")
+        self.fingerprint = self.first.root.fingerprint
+        self.forest = TaxonomyForest({"first": self.first, "second": self.second})
+
+    def test_interning(self):
+        first, second = self.first.search_by_id(16)[0], self.second.search_by_id(16)[0]
+        with self.subTest():
+            # one string for both taxonomies
+            self.assertIs(first.name, second.name)
+        with self.subTest():
+            self.assertEqual(len(self.forest.terms()), len({item.name for item in self.first.get_items()[1:]}))
+        with self.subTest():
+            self.assertEqual(self.forest.term(self.forest.term_id(first.name)), first.name)
+        with self.subTest():
+            self.assertEqual(self.first.root.fingerprint, self.fingerprint)
+        with self.subTest():
+            with self.assertRaises(FrozenTaxonomyError):
+                self.first.update_item(16, name="Products")
+
+    def test_lookup(self):
+        name = self.first.search_by_id(14)[0].name
+        found = self.forest.lookup(name)
+        with self.subTest():
+            self.assertEqual([(taxonomy, item.id) for taxonomy, item in found], [("first", 14), ("second", 14)])
+        with self.subTest():
+            self.assertIs(found[1][1], self.second.search_by_id(14)[0])
+        with self.subTest():
+            self.assertEqual([item.id for _, item in self.forest.lookup(name, taxonomy="second")], [14])
+        with self.subTest():
+            self.assertEqual(self.forest.taxonomies_with(name), ["first", "second"])
+        with self.subTest():
+            self.assertTrue(self.forest.contains(name, taxonomy="first"))
+        with self.subTest():
+            self.assertFalse(self.forest.contains(name, taxonomy="third"))
+        with self.subTest():
+            self.assertEqual(self.forest.lookup("unknown term"), [])
+
+    def test_normalised(self):
+        name = self.first.search_by_id(14)[0].name
+        variant = name.upper() + "s"
+        with self.subTest():
+            self.assertFalse(self.forest.contains(variant))
+        with self.subTest():
+            self.assertTrue(self.forest.contains(variant, normalised=True))
+        with self.subTest():
+            self.assertEqual([item.id for _, item in self.forest.lookup(variant, normalised=True)], [14, 14])
+
+    def test_tables(self):
+        postings = self.forest.to_dataframe()
+        with self.subTest():
+            self.assertEqual(len(postings), 2 * (self.first.count_items() - 1))
+        shared = self.forest.shared_terms()
+        with self.subTest():
+            self.assertEqual(len(shared), len(self.forest.terms()))
+        with self.subTest():
+            self.assertTrue((shared["taxonomies"].map(len) == 2).all())
+        with self.subTest():
+            self.assertTrue((self.forest.memory_usage() > 0).all())
+
+    def test_errors(self):
+        with self.subTest():
+            with self.assertRaises(ValueError):
+                self.forest.add_taxonomy("first", from_file("sample.xlsx"))
+        with self.subTest():
+            with self.assertRaises(KeyError):
+                self.forest.taxonomy("third")
+
+    def test_builtin(self):
+        forest = builtin_forest()
+        term = forest.shared_terms().index[0]
+        expected = [(name, item.id) for name in forest.names()
+                    for item in forest.taxonomy(name).get_items()[1:] if item.name == term]
+        with self.subTest():
+            self.assertIn("en_master_lexicon", forest)
+        with self.subTest():
+            self.assertEqual(sorted((name, item.id) for name, item in forest.lookup(term)), sorted(expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+from taxonomy4good.sustainabilityTaxonomy import from_file
+from taxonomy4good.sustainabilityItem import SustainabilityItem
+import unittest
+
+
+def load_versions():
+    old = from_file("sample.xlsx")
+    new = from_file("sample.xlsx")
+
+    air_quality, social, donations = new.search_by_id([2, 13, 22])
+
+    # add an item under "Air quality" and a new branch under "Social"
+    new.insert_items(SustainabilityItem(24, "Particulate matter", level=3, parent=air_quality))
+    governance = SustainabilityItem(25, "Governance", level=2, parent=social)
+    new.insert_items(governance)
+
+    # move "Donations" under the new branch
+    donations.parent.children.remove(donations)
+    donations.parent = governance
+    governance.children = [donations]
+
+    # rename and reweight
+    new.search_by_id(9)[0].name = "COP 26"
+    new.search_by_id(17)[0].weight = 0.5
+
+    # remove "Ecosystem Impacts" and its children
+    new.remove_by_id(10)
+    return old, new
+
+
+class TestDiff(unittest.TestCase):
+    def test_identical(self):
+        old = from_file("sample.xlsx")
+        new = from_file("sample.xlsx")
+        self.assertTrue(old.diff(new).is_empty())
+
+    def test_changes(self):
+        old, new = load_versions()
+        diff = old.diff(new)
+
+        with self.subTest():
+            self.assertEqual(sorted(r["id"] for r in diff.added), [24, 25])
+        with self.subTest():
+            self.assertEqual(sorted(r["id"] for r in diff.removed), [10, 11, 12])
+        with self.subTest():
+            self.assertEqual(diff.moved, [{"id": 22, "name": "Donations", "old_parent": 20, "new_parent": 25,
+                                           "old_level": 3, "new_level": 3}])
+        with self.subTest():
+            self.assertEqual(diff.renamed, [{"id": 9, "old_name": "COP26", "new_name": "COP 26"}])
+        with self.subTest():
+            self.assertEqual([(r["id"], r["new_weight"]) for r in diff.reweighted], [(17, 0.5)])
+        with self.subTest():
+            self.assertEqual(diff.to_dataframe().shape[0], 8)
+
+    def test_merge(self):
+        old, new = load_versions()
+        old.merge(old.diff(new))
+
+        with self.subTest():
+            self.assertTrue(old.diff(new).is_empty())
+        with self.subTest():
+            self.assertEqual(sorted(r["id"] for r in old.items_to_dict()),
+                             sorted(r["id"] for r in new.items_to_dict()))
+
+
+    def test_moves_change_levels(self):
+        old, new = from_file("sample.xlsx"), from_file("sample.xlsx")
+        environment, air_quality, product_recall, stewardship = new.search_by_id([1, 2, 16, 14])
+        # one level up, and a subtree one level down
+        for item, parent in [(product_recall, environment), (stewardship, air_quality)]:
+            item.parent.children.remove(item)
+            item.parent = parent
+            parent.children.append(item)
+        for item in new.get_items(stewardship):
+            item.level += 1
+        product_recall.level = 2
+        new.invalidate_indexes()
+
+        diff = old.diff(new)
+        with self.subTest():
+            self.assertEqual(sorted((r["id"], r["new_level"]) for r in diff.moved), [(14, 3), (16, 2)])
+        with self.subTest():
+            self.assertEqual(sorted(r["id"] for r in diff.relevelled), [15, 17, 18, 19])
+        old.merge(diff)
+        with self.subTest():
+            self.assertEqual(old.root.fingerprint, new.root.fingerprint)
+
+    def test_attributes_and_order(self):
+        old, new = from_file("sample.xlsx", meta=True), from_file("sample.xlsx", meta=True)
+        new.root.name = "new version"
+        new.update_item(3, grouping="Air", score=7)
+        new.update_item(4, meta_data={"source": "new"})
+        new.search_by_id(5)[0].children.reverse()
+        new.remove_by_id([11, 12])
+
+        diff = old.diff(new)
+        with self.subTest():
+            # the name of the root is the version name of the taxonomy
+            self.assertEqual(diff.renamed, [])
+        with self.subTest():
+            self.assertEqual([(r["id"], r["new_grouping"]) for r in diff.regrouped], [(3, "Air")])
+        with self.subTest():
+            self.assertEqual([(r["id"], r["new_score"]) for r in diff.rescored], [(3, 7)])
+        with self.subTest():
+            self.assertEqual([(r["id"], r["new_meta_data"]) for r in diff.reannotated], [(4, {"source": "new"})])
+        with self.subTest():
+            self.assertEqual([(r["id"], r["new_children"]) for r in diff.reordered], [(5, [9, 8, 7, 6])])
+        old.merge(diff)
+        with self.subTest():
+            self.assertTrue(old.diff(new).is_empty())
+        with self.subTest():
+            self.assertEqual(old.search_by_id(1)[0].fingerprint, new.search_by_id(1)[0].fingerprint)
+        with self.subTest():
+            # item 10 keeps an empty list of children
+            self.assertEqual(old.search_by_id(10)[0].children, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
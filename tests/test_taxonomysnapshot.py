@@ -0,0 +1,109 @@
+from taxonomy4good.sustainabilityTaxonomy import from_file
+from taxonomy4good.taxonomySnapshot import open_snapshot
+from taxonomy4good.errors import IDNotFoundError
+import tempfile
+import unittest
+import os
+
+test_taxonomy = from_file("sample.xlsx", meta=True)
+
+
+class TestSnapshot(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        test_taxonomy.to_snapshot(os.path.join(cls.directory.name, "sample"))
+        cls.snapshot = open_snapshot(os.path.join(cls.directory.name, "sample.t4g"))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.snapshot.close()
+        cls.directory.cleanup()
+
+    def test_size(self):
+        self.assertEqual(len(self.snapshot), 24)
+
+    def test_mapped_id_index(self):
+        layout = self.snapshot.layout
+        id_order, sorted_ids = layout._id_index
+        for array in (id_order, sorted_ids):
+            with self.subTest():
+                # read-only views on the mapped file, not copies made when opening
+                self.assertFalse(array.flags.owndata or array.flags.writeable)
+        with self.subTest():
+            self.assertEqual(sorted_ids.tolist(), list(range(24)))
+
+    def test_search_byid(self):
+        items = self.snapshot.search_by_id([1, 13, 20])
+        with self.subTest():
+            self.assertEqual([item["name"] for item in items],
+                             ["Environment", "Social", "Stakeholder relations"])
+        with self.subTest():
+            self.assertEqual(items[0]["children"], [2, 5, 10])
+        with self.subTest():
+            self.assertEqual(items[2]["parent"], 13)
+
+        with self.assertRaises(IDNotFoundError) as context:
+            self.snapshot.search_by_id(30)
+        self.assertTrue(context.exception)
+
+    def test_navigation(self):
+        with self.subTest():
+            self.assertEqual(list(self.snapshot.get_children_ids(20)), [21, 22, 23])
+        with self.subTest():
+            self.assertEqual(self.snapshot.get_parent_id(2), 1)
+        with self.subTest():
+            self.assertEqual(self.snapshot.get_parent_id(0), None)
+        with self.subTest():
+            self.assertEqual(sorted(self.snapshot.get_subtree_ids(13)), [*range(13, 24)])
+
+    def test_similar_names(self):
+        with self.subTest():
+            self.assertEqual(len(self.snapshot.search_similar_names("climate")), 3)
+        with self.subTest():
+            self.assertEqual(len(self.snapshot.search_similar_names(["climate", "impact"])), 2)
+        with self.subTest():
+            self.assertEqual(self.snapshot.search_similar_names("product", start_id=1), [])
+
+    def test_scores(self):
+        scores = self.snapshot.layout.scores.copy()
+        weights = self.snapshot.layout.weights.copy()
+        for id, score, weight in [(4, 10, 0.1), (3, 5, 0.3), (17, 20, 0.5)]:
+            position = self.snapshot.layout.position(id)
+            scores[position] = score
+            weights[position] = weight
+
+        with self.subTest():
+            self.assertAlmostEqual(self.snapshot.compute_scores(scores, weights), 12.5)
+        with self.subTest():
+            self.assertEqual(self.snapshot.get_level_scores(1, scores, weights),
+                             {"Environment": 2.5, "Social": 10})
+
+    def test_to_taxonomy(self):
+        taxonomy = self.snapshot.to_taxonomy()
+        with self.subTest():
+            self.assertEqual(taxonomy.to_dataframe().shape[0], 24)
+        with self.subTest():
+            self.assertEqual(taxonomy.search_by_id(1)[0].meta_data,
+                             test_taxonomy.search_by_id(1)[0].meta_data)
+
+    def test_empty_children(self):
+        taxonomy = from_file("sample.xlsx")
+        for item in taxonomy.get_items():
+            item.score = item.id % 5 + 1
+        # item 10 keeps an empty list of children: not a leaf, it scores 0
+        taxonomy.remove_by_id([11, 12])
+        taxonomy.update_item(10, score=5)
+        path = os.path.join(self.directory.name, "empty_children")
+        taxonomy.to_snapshot(path)
+        with open_snapshot(path + ".t4g") as snapshot:
+            with self.subTest():
+                self.assertEqual(snapshot.search_by_id(10)[0]["children"], [])
+            with self.subTest():
+                self.assertAlmostEqual(snapshot.compute_scores(), taxonomy.compute_scores())
+            with self.subTest():
+                self.assertEqual(snapshot.to_taxonomy().search_by_id(10)[0].children, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
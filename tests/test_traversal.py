@@ -0,0 +1,83 @@
+from taxonomy4good.sustainabilityTaxonomy import from_file
+from taxonomy4good.sustainabilityItem import SustainabilityItem
+from taxonomy4good.traversal import traverse, walk
+import itertools
+import unittest
+
+
+class TestTraversal(unittest.TestCase):
+    def setUp(self):
+        self.taxonomy = from_file("sample.xlsx")
+
+    def test_traverse_orders(self):
+        environment = self.taxonomy.search_by_id(1)[0]
+        with self.subTest():
+            self.assertEqual([item.id for item in traverse(environment)][:5], [1, 2, 5, 10, 3])
+        with self.subTest():
+            self.assertEqual([item.id for item in traverse(environment, order="dfs")][:5], [1, 2, 3, 4, 5])
+        with self.subTest():
+            with self.assertRaises(ValueError):
+                list(traverse(environment, order="post"))
+
+    def test_walk_depths(self):
+        depths = {item.id: depth for item, depth in walk(self.taxonomy.root, order="dfs")}
+        with self.subTest():
+            self.assertEqual(depths[0], 0)
+        with self.subTest():
+            self.assertEqual(depths[13], 1)
+        with self.subTest():
+            self.assertEqual(depths[21], 3)
+
+    def test_iter_items_matches_lists(self):
+        with self.subTest():
+            self.assertEqual(list(self.taxonomy.iter_items()), list(self.taxonomy.get_items()))
+        with self.subTest():
+            self.assertEqual(list(self.taxonomy.iter_terms()), self.taxonomy.get_terms())
+        with self.subTest():
+            self.assertEqual(list(self.taxonomy.iter_ids()),
+                             [id for ids in self.taxonomy.get_all_ids() for id in ids])
+        with self.subTest():
+            self.assertEqual(list(self.taxonomy.iter_ids(order="dfs"))[:4], [0, 1, 2, 3])
+
+    def test_max_depth_and_predicate(self):
+        with self.subTest():
+            self.assertEqual(list(self.taxonomy.iter_ids(max_depth=1)), [0, 1, 13])
+        with self.subTest():
+            social = self.taxonomy.search_by_id(13)[0]
+            self.assertEqual(list(self.taxonomy.iter_ids(social, max_depth=1)), [13, 14, 20])
+        with self.subTest():
+            leaves = self.taxonomy.iter_ids(predicate=lambda item: item.children is None)
+            self.assertEqual(len(list(leaves)), 16)
+        with self.subTest():
+            with self.assertRaises(ValueError):
+                list(self.taxonomy.iter_items(max_depth=-1))
+
+    def test_lazy(self):
+        visited = []
+        first = next(self.taxonomy.iter_items(predicate=lambda item: visited.append(item.id) or item.id == 2))
+        with self.subTest():
+            self.assertEqual(first.id, 2)
+        with self.subTest():
+            # the traversal stopped at the first match
+            self.assertEqual(visited, [0, 1, 13, 2])
+        with self.subTest():
+            self.assertEqual(len(list(itertools.islice(self.taxonomy.iter_items(), 3))), 3)
+
+    def test_level_uses_deepest_branch(self):
+        # the last child of the root is a leaf, the deepest branch is the first one
+        self.taxonomy.insert_items(SustainabilityItem(24, "Other", level=1, parent=self.taxonomy.root))
+        with self.subTest():
+            self.assertEqual(self.taxonomy.level(), 4)
+        with self.subTest():
+            self.assertEqual([len(items) for items in self.taxonomy.get_items_each_level()], [1, 3, 5, 16])
+
+    def test_search_by_id_order(self):
+        with self.subTest():
+            self.assertEqual([item.id for item in self.taxonomy.search_by_id([20, 3, 13])], [20, 3, 13])
+        with self.subTest():
+            with self.assertRaises(Exception):
+                self.taxonomy.search_by_id([3, 99])
+
+
+if __name__ == '__main__':
+    unittest.main()
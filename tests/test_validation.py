@@ -0,0 +1,98 @@
+from taxonomy4good.sustainabilityTaxonomy import from_file, from_dataframe
+from taxonomy4good.validation import validate_dataframe, prepare_dataframe
+from taxonomy4good.errors import TaxonomyValidationError
+import pandas as pd
+import unittest
+
+
+def broken_frame():
+    items_df = pd.read_excel("sample.xlsx")
+    # duplicated id
+    items_df = pd.concat([items_df, items_df.iloc[[2]]], ignore_index=True)
+    # orphan: parent 99 does not exist
+    items_df.loc[items_df["id"] == 23, "parent"] = 99
+    # cycle between 11 and 12, below Ecosystem Impacts
+    items_df.loc[items_df["id"] == 11, ["parent", "children"]] = [12, "[12]"]
+    items_df.loc[items_df["id"] == 12, ["parent", "children"]] = [11, "[11]"]
+    return items_df
+
+
+class TestValidation(unittest.TestCase):
+    def test_valid_file(self):
+        with self.subTest():
+            self.assertTrue(validate_dataframe(pd.read_excel("sample.xlsx")).is_valid())
+        with self.subTest():
+            self.assertEqual(repr(validate_dataframe(pd.read_excel("sample.xlsx"))), "ValidationReport()")
+
+    def test_report(self):
+        report = validate_dataframe(broken_frame())
+        counts = report.counts()
+        with self.subTest():
+            self.assertEqual(counts["duplicate"], 1)
+        with self.subTest():
+            self.assertEqual([issue["id"] for issue in report.by_type("orphan")], [23])
+        with self.subTest():
+            cycles = report.by_type("cycle")
+            self.assertEqual(len(cycles), 1)
+            self.assertIn("[11, 12]", cycles[0]["detail"])
+        with self.subTest():
+            # 10 lists 11 and 12 whose parents changed, 20 lists 23
+            self.assertEqual(sorted(issue["id"] for issue in report.by_type("children_mismatch")),
+                             [10, 10, 20])
+        with self.subTest():
+            self.assertEqual(list(report.to_dataframe().columns), ["issue", "id", "row", "detail"])
+
+    def test_strict(self):
+        with self.assertRaises(TaxonomyValidationError) as context:
+            from_dataframe(broken_frame())
+        with self.subTest():
+            self.assertEqual(len(context.exception.report), len(validate_dataframe(broken_frame())))
+        with self.subTest():
+            self.assertIn("orphan=1", str(context.exception))
+
+    def test_repair(self):
+        taxonomy = from_dataframe(broken_frame(), validation="repair")
+        with self.subTest():
+            self.assertEqual(taxonomy.count_items(), 24)
+        with self.subTest():
+            # orphans and the smallest id of cycles are attached to the root
+            self.assertEqual([item.id for item in taxonomy.root.children], [1, 11, 13, 23])
+        with self.subTest():
+            self.assertEqual([item.id for item in taxonomy.search_by_id(11)[0].children], [12])
+        with self.subTest():
+            self.assertIsNone(taxonomy.search_by_id(10)[0].children)
+        with self.subTest():
+            self.assertEqual([item.id for item in taxonomy.search_by_id(20)[0].children], [21, 22])
+
+    def test_unreadable_cells(self):
+        items_df = pd.read_excel("sample.xlsx")
+        items_df.loc[items_df["id"] == 14, "children"] = "[15, x]"
+        items_df.loc[items_df["id"] == 5, "children"] = "[6,"
+        items_df.loc[items_df["id"] == 23, "id"] = None
+        report = validate_dataframe(items_df)
+        with self.subTest():
+            self.assertEqual([issue["id"] for issue in report.by_type("invalid_children")], [5, 14])
+        with self.subTest():
+            # the children of unreadable cells are not reported again as mismatches
+            self.assertEqual([issue["id"] for issue in report.by_type("children_mismatch")], [20])
+        with self.subTest():
+            self.assertEqual(report.by_type("invalid_id")[0]["detail"], "missing id")
+        with self.subTest():
+            with self.assertRaises(TaxonomyValidationError):
+                from_dataframe(items_df.copy())
+        taxonomy = from_dataframe(items_df, validation="repair")
+        with self.subTest():
+            self.assertEqual([item.id for item in taxonomy.search_by_id(14)[0].children], [15, 16, 17, 18, 19])
+
+    def test_ids_not_matching_rows(self):
+        items_df = pd.read_excel("sample.xlsx").sample(frac=1, random_state=0)
+        taxonomy = from_dataframe(items_df)
+        with self.subTest():
+            self.assertEqual(taxonomy.root.fingerprint, from_file("sample.xlsx").root.fingerprint)
+        with self.subTest():
+            with self.assertRaises(ValueError):
+                prepare_dataframe(items_df, validation="lenient")
+
+
+if __name__ == '__main__':
+    unittest.main()